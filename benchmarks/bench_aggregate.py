@@ -0,0 +1,69 @@
+"""Measures StatsAggregate updates, merging of partial aggregates and incremental
+updates against re-aggregating the whole history.
+
+Usage:
+    python -m benchmarks.bench_aggregate --size 100000 --units 500 --parts 8
+"""
+
+import pickle
+import random
+import time
+
+from benchmarks.corpus import generate_corpus
+from benchmarks.suite import bench_args
+from tennis_match_lib.aggregate import StatsAggregate
+from tennis_match_lib.errors import GameValueError
+from tennis_match_lib.parser import Parser
+from tennis_match_lib.rules import MatchRules
+from tennis_match_lib.score_format import ScoreFormat
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+
+def main(argv=None):
+    args = bench_args(__doc__, argv, size=100_000, units=500, parts=8)
+
+    score_format = ScoreFormat.default()
+    rules = MatchRules.pro_tour()
+    parser = Parser(score_format, rules)
+    rng = random.Random(0)
+    matches = []
+    for score in generate_corpus(rules, score_format, args.size):
+        try:
+            parse_result = parser.parse(score)
+        except GameValueError:
+            continue
+        unit_one, unit_two = rng.sample(range(args.units), 2)
+        matches.append((unit_one, unit_two, parse_result))
+
+    whole, elapsed = timed(StatsAggregate().add_batch, matches)
+    print(f'add_batch  {len(matches) / elapsed:>11,.0f} matches/s')
+
+    size = -(-len(matches) // args.parts)
+    # partial aggregates are pickled as if they were sent back by worker processes
+    parts = [
+        pickle.dumps(StatsAggregate().add_batch(matches[i : i + size]))
+        for i in range(0, len(matches), size)
+    ]
+    merged, elapsed = timed(lambda: StatsAggregate.merged(pickle.loads(p) for p in parts))
+    assert merged == whole
+    print(
+        f'merge      {len(parts)} parts of {args.units} units in {elapsed * 1000:.1f} ms '
+        f'({sum(map(len, parts)) / len(parts) / 1024:.0f} KiB pickled per part)'
+    )
+
+    new = matches[: len(matches) // 100]
+    _, incremental = timed(whole.add_batch, new)
+    _, rescan = timed(StatsAggregate().add_batch, matches + new)
+    print(
+        f'update     {len(new)} new matches in {incremental * 1000:.1f} ms, '
+        f're-aggregating the history takes {rescan * 1000:.1f} ms'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""Measures event loop lag and throughput of validating a bursty feed inline on the
+loop against the asyncio pipeline with thread and process executors.
+
+Usage:
+    python -m benchmarks.bench_aio_pipeline --scores 100000 --workers 2
+"""
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import random
+import time
+
+from benchmarks.suite import bench_args
+from tennis_match_lib.aio import ScorePipeline
+from tennis_match_lib.parser import Parser
+from tennis_match_lib.rules import MatchRules
+from tennis_match_lib.score_format import ScoreFormat
+from tennis_match_lib.validator import Validator
+
+
+SCORES = ('6:4 6:3', '6:7(5) 7:6(3) 6:1', '4:6 7:5 6:0', '6:6', '6:4 2:6 x', '7:6(2) 6:7(4)')
+
+
+async def fake_feed(scores, burst, pause):
+    """Yields scores in bursts separated by pauses, like a live feed."""
+    for i, score in enumerate(scores, 1):
+        yield score
+        if i % burst == 0:
+            await asyncio.sleep(pause)
+
+
+async def monitor_lag(lags, interval=0.001):
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        lags.append(loop.time() - started - interval)
+
+
+async def consume_inline(feed, score_format, rules):
+    validator = Validator(score_format, rules)
+    parser = Parser(score_format, rules)
+    count = 0
+    async for score in feed:
+        if validator.validate(score).is_valid():
+            parser.parse(score)
+        count += 1
+    return count
+
+
+async def consume_pipeline(feed, score_format, rules, executor, batch_size):
+    pipeline = ScorePipeline(score_format, rules, executor=executor, batch_size=batch_size)
+    count = 0
+    async for _ in pipeline.process(feed):
+        count += 1
+    return count
+
+
+async def measure(consumer):
+    lags = []
+    monitor = asyncio.ensure_future(monitor_lag(lags))
+    started = time.perf_counter()
+    count = await consumer
+    elapsed = time.perf_counter() - started
+    monitor.cancel()
+    lags.sort()
+    lags = lags or [0.0]
+    return count / elapsed, lags[len(lags) * 99 // 100], lags[-1]
+
+
+def main(argv=None):
+    args = bench_args(
+        __doc__, argv, scores=100_000, burst=5000, pause=0.005, batch_size=256, workers=2
+    )
+
+    rng = random.Random(0)
+    scores = [rng.choice(SCORES) for _ in range(args.scores)]
+    score_format = ScoreFormat.default()
+    rules = MatchRules.pro_tour()
+
+    def feed():
+        return fake_feed(scores, args.burst, args.pause)
+
+    with ThreadPoolExecutor(args.workers) as threads, ProcessPoolExecutor(args.workers) as procs:
+        runs = (
+            ('inline', lambda: consume_inline(feed(), score_format, rules)),
+            (
+                'threads',
+                lambda: consume_pipeline(feed(), score_format, rules, threads, args.batch_size),
+            ),
+            (
+                'processes',
+                lambda: consume_pipeline(feed(), score_format, rules, procs, args.batch_size),
+            ),
+        )
+        for name, consumer in runs:
+            throughput, lag_p99, lag_max = asyncio.run(measure(consumer()))
+            print(
+                f'{name:<10} {throughput:>10,.0f} scores/s '
+                f'loop lag p99={lag_p99 * 1000:.2f}ms max={lag_max * 1000:.2f}ms'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Compares aggregate scans of a match archive with re-parsing the raw scores.
+
+Usage:
+    python -m benchmarks.bench_archive --size 100000
+"""
+
+import os
+import tempfile
+import time
+
+from benchmarks.corpus import generate_corpus
+from benchmarks.suite import bench_args
+from tennis_match_lib.archive import Archive, write_archive
+from tennis_match_lib.errors import GameValueError
+from tennis_match_lib.parser import Parser
+from tennis_match_lib.rules import MatchRules
+from tennis_match_lib.score_format import ScoreFormat
+
+
+def parse_aggregates(parser, corpus):
+    games_diff = sets = tiebreaks = 0
+    for score in corpus:
+        try:
+            parse_result = parser.parse(score)
+        except GameValueError:
+            continue
+        games_diff += parse_result.stats_info.unit_one_games_diff
+        sets += len(parse_result.sets)
+        tiebreaks += sum(1 for s in parse_result.sets if s.tiebreak is not None)
+    return games_diff, tiebreaks / sets
+
+
+def archive_aggregates(archive, rows=None):
+    return archive.games_diff_total(rows), archive.tiebreak_frequency(rows)
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+
+def main(argv=None):
+    args = bench_args(__doc__, argv, size=100_000)
+
+    score_format = ScoreFormat.default()
+    rules = MatchRules.pro_tour()
+    corpus = generate_corpus(rules, score_format, args.size)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'matches.tma')
+        rows, write_elapsed = timed(write_archive, path, corpus, score_format, rules)
+        print(
+            f'write   {rows / write_elapsed:>11,.0f} matches/s '
+            f'{os.path.getsize(path) / rows:.1f} bytes/match'
+        )
+        expected, elapsed = timed(parse_aggregates, Parser(score_format, rules), corpus)
+        print(f'parse   {rows / elapsed:>11,.0f} matches/s')
+        with Archive.open(path) as archive:
+            result, elapsed = timed(archive_aggregates, archive)
+            assert result == expected
+            print(f'scan    {rows / elapsed:>11,.0f} matches/s')
+            selected, select_elapsed = timed(archive.select, rules, 3, 2)
+            _, elapsed = timed(archive_aggregates, archive, selected)
+            print(
+                f'select  {len(selected):>11,} matches in {select_elapsed * 1000:.1f} ms, '
+                f'scan {len(selected) / elapsed:>11,.0f} matches/s'
+            )
+
+
+if __name__ == '__main__':
+    main()
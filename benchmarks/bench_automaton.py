@@ -0,0 +1,53 @@
+"""Compares the single pass of ScoreAutomaton with separate format check and parsing.
+
+Usage:
+    python -m benchmarks.bench_automaton --size 20000
+"""
+
+from benchmarks.corpus import RULES, generate_corpus
+from benchmarks.suite import bench_args, best_time
+from tennis_match_lib import common
+from tennis_match_lib.automaton import ScoreAutomaton
+from tennis_match_lib.score_format import ScoreFormat
+from tennis_match_lib.validator import Validator
+
+
+def main(argv=None):
+    args = bench_args(__doc__, argv, size=20_000, repeat=5, mix='realistic')
+
+    score_format = ScoreFormat.default()
+    for name, rules_factory in RULES.items():
+        rules = rules_factory()
+        corpus = generate_corpus(rules, score_format, args.size, args.mix)
+        automaton = ScoreAutomaton(score_format, rules)
+        scan = automaton.scan
+        check_rules = automaton._check_rules  # pylint: disable=protected-access
+        fullmatch = Validator(score_format, rules).re_pattern.fullmatch
+        plan = rules.compile()
+
+        def separate(scores, fullmatch=fullmatch, check_rules=check_rules, plan=plan):
+            # scans by the regular expression, by count and by the parser, then
+            # the same checks of rules as of the automaton
+            for score in scores:
+                if fullmatch(score) is None:
+                    continue
+                if score.count(score_format.set_sep) + 1 > plan.sets:
+                    continue
+                sets = common.try_parse_score(score, score_format.set_sep, score_format.game_sep)
+                if sets is not None:
+                    check_rules(sets)
+
+        def single(scores, scan=scan):
+            for score in scores:
+                scan(score)
+
+        times = [best_time(function, corpus, args.repeat) for function in (separate, single)]
+        print(
+            f'{name:<12} {len(corpus) / times[0]:>10,.0f} scores/s separate, '
+            f'{len(corpus) / times[1]:>10,.0f} scores/s single pass, '
+            f'{times[0] / times[1]:.2f}x'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""Compares generated validation checks with the interpreted ones of Validator.
+
+Usage:
+    python -m benchmarks.bench_codegen --size 20000
+"""
+
+from benchmarks.corpus import RULES, generate_corpus
+from benchmarks.suite import bench_args, best_time
+from tennis_match_lib.codegen import GeneratedValidator
+from tennis_match_lib.score_format import ScoreFormat
+from tennis_match_lib.validator import Validator
+
+
+def main(argv=None):
+    args = bench_args(__doc__, argv, size=20_000, repeat=5, mix='realistic')
+
+    score_format = ScoreFormat.default()
+    for name, rules_factory in RULES.items():
+        rules = rules_factory()
+        corpus = generate_corpus(rules, score_format, args.size, args.mix)
+        print(f'{name} rules, {args.mix} corpus')
+        interpreted = Validator(score_format, rules)
+        generated = GeneratedValidator(score_format, rules)
+        for mode in ('validate_many', 'is_valid'):
+            times = []
+            for validator in (interpreted, generated):
+                if mode == 'validate_many':
+                    function = validator.validate_many
+                else:
+                    is_valid = validator.is_valid
+
+                    def function(scores, is_valid=is_valid):
+                        for score in scores:
+                            is_valid(score)
+
+                times.append(best_time(function, corpus, args.repeat))
+            print(
+                f'  {mode:<14} {len(corpus) / times[0]:>10,.0f} scores/s interpreted, '
+                f'{len(corpus) / times[1]:>10,.0f} scores/s generated, '
+                f'{times[0] / times[1]:.2f}x'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Compares exception-free parsing and lazy error messages with the raising paths.
+
+* parse: ``Parser.parse`` in ``try``/``except GameValueError``;
+* try_parse: ``Parser.try_parse``, returns ``ScoreError`` for invalid scores;
+* validate + messages: ``Validator.validate`` with every error message rendered,
+  as when results held message strings;
+* validate: ``Validator.validate``, messages are not rendered.
+
+Usage:
+    python -m benchmarks.bench_errors --size 20000 --mix invalid_30
+"""
+
+from benchmarks.corpus import generate_corpus
+from benchmarks.suite import bench_args, best_time, each
+from tennis_match_lib.errors import GameValueError, ScoreError
+from tennis_match_lib.parser import Parser
+from tennis_match_lib.rules import MatchRules
+from tennis_match_lib.score_format import ScoreFormat
+from tennis_match_lib.validator import Validator
+
+
+def main(argv=None):
+    args = bench_args(__doc__, argv, size=20_000, repeat=5, mix='invalid_30')
+
+    score_format = ScoreFormat.default()
+    rules = MatchRules.pro_tour()
+    corpus = generate_corpus(rules, score_format, args.size, args.mix)
+    parser = Parser(score_format, rules)
+    validator = Validator(score_format, rules)
+
+    def parse(score):
+        try:
+            return parser.parse(score)
+        except GameValueError:
+            return None
+
+    def validate_with_messages(score):
+        result = validator.validate(score)
+        if not result.is_valid():
+            return [str(error) for error in result.value]
+        return result
+
+    unparsable = sum(isinstance(parser.try_parse(score), ScoreError) for score in corpus)
+    invalid = sum(not validator.is_valid(score) for score in corpus)
+    print(
+        f'{args.mix} corpus, {invalid / len(corpus):.0%} invalid, '
+        f'{unparsable / len(corpus):.0%} unparsable'
+    )
+    for name, baseline_function, function in (
+        ('parse', parse, parser.try_parse),
+        ('validate', validate_with_messages, validator.validate),
+    ):
+        baseline = best_time(each(baseline_function), corpus, args.repeat)
+        current = best_time(each(function), corpus, args.repeat)
+        print(
+            f'  {name:<10} {len(corpus) / baseline:>10,.0f} scores/s raising or rendering, '
+            f'{len(corpus) / current:>10,.0f} scores/s structured, {baseline / current:.2f}x'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""Measures the overhead of validation instrumentation, disabled and enabled.
+
+The baseline is the validation chain without the collector check, so the
+"disabled" row shows what validators without a collector pay for the feature.
+
+Usage:
+    python -m benchmarks.bench_instrumentation --size 5000 --repeat 7
+"""
+
+import time
+
+from benchmarks.corpus import generate_corpus
+from benchmarks.suite import bench_args
+from tennis_match_lib import validation
+from tennis_match_lib.instrumentation import InMemoryCollector
+from tennis_match_lib.rules import MatchRules
+from tennis_match_lib.score_format import ScoreFormat
+from tennis_match_lib.validator import Validator
+
+
+def baseline_validate(validator):
+    # pylint: disable=protected-access
+    def validate(score):
+        return (
+            validation.validate_into(str, validator._validate_by_regexp(score))
+            .and_then(validator._validate_number_of_sets)
+            .and_then(validator._parse_score)
+            .and_then(validator._validate_number_of_won_sets)
+            .and_then(validator._validate_games_have_too_small_numbers)
+            .and_then(validator._validate_games_equality)
+            .and_then(validator._unwrap_score)
+        )
+
+    return validate
+
+
+def main(argv=None):
+    args = bench_args(__doc__, argv, size=5000, repeat=7)
+
+    score_format = ScoreFormat.default()
+    rules = MatchRules.pro_tour()
+    corpus = generate_corpus(rules, score_format, args.size)
+    variants = {
+        'baseline': baseline_validate(Validator(score_format, rules)),
+        'disabled': Validator(score_format, rules).validate,
+        'enabled': Validator(score_format, rules, collector=InMemoryCollector()).validate,
+    }
+    best = dict.fromkeys(variants, float('inf'))
+    # variants are interleaved so that noise of the machine hits all of them
+    for _ in range(args.repeat):
+        for name, validate in variants.items():
+            started = time.perf_counter()
+            for score in corpus:
+                validate(score)
+            best[name] = min(best[name], time.perf_counter() - started)
+    for name, elapsed in best.items():
+        print(
+            f'{name:<9} {len(corpus) / elapsed:>10,.0f} scores/s '
+            f'overhead {elapsed / best["baseline"] - 1:+7.2%}'
+        )
+
+
+if __name__ == '__main__':
+    main()
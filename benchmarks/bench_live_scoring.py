@@ -0,0 +1,79 @@
+"""Measures update cost of live scores against re-parsing and re-validating the whole
+score after every game.
+
+Usage:
+    python -m benchmarks.bench_live_scoring --matches 2000
+"""
+
+import random
+import time
+
+from benchmarks.suite import bench_args
+from tennis_match_lib.match_score import TennisMatchScore, Unit
+from tennis_match_lib.parser import Parser
+from tennis_match_lib.rules import MatchRules
+from tennis_match_lib.score_format import ScoreFormat
+from tennis_match_lib.validator import Validator
+
+
+def _point_streams(matches, seed):
+    # the winner of every point of every match, matches are played until they end
+    rng = random.Random(seed)
+    streams = []
+    for _ in range(matches):
+        match = TennisMatchScore(None, None)
+        points = []
+        while not match.is_finished():
+            unit = Unit.ONE if rng.random() < 0.5 else Unit.TWO
+            match.point_won(unit)
+            points.append(unit)
+        streams.append(points)
+    return streams
+
+
+def run_live(streams):
+    # points of all matches are interleaved as if the matches were played at once
+    matches = [TennisMatchScore(None, None) for _ in streams]
+    updates = 0
+    for step in range(max(len(points) for points in streams)):
+        for match, points in zip(matches, streams):
+            if step < len(points):
+                match.point_won(points[step])
+                match.score  # pylint: disable=pointless-statement
+                updates += 1
+    return updates
+
+
+def run_reparse(streams):
+    score_format = ScoreFormat.default()
+    rules = MatchRules.pro_tour()
+    parser = Parser(score_format, rules)
+    validator = Validator(score_format, rules)
+    updates = 0
+    for points in streams:
+        match = TennisMatchScore(None, None)
+        for unit in points:
+            match.point_won(unit)
+            if match.points == (0, 0) and match.score:
+                validator.validate(match.score)
+                parser.parse(match.score)
+                updates += 1
+    return updates
+
+
+def main(argv=None):
+    args = bench_args(__doc__, argv, matches=2000, seed=0)
+
+    streams = _point_streams(args.matches, args.seed)
+    for name, function, unit in (
+        ('live', run_live, 'point'),
+        ('reparse', run_reparse, 'game'),
+    ):
+        started = time.perf_counter()
+        updates = function(streams)
+        elapsed = time.perf_counter() - started
+        print(f'{name:<8} {updates:>9} updates {elapsed / updates * 1e6:>7.2f} us/{unit}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Compares reverse_score and format conversion with the former split/regex version.
+
+Usage:
+    python -m benchmarks.bench_normalize --size 20000 --repeat 5
+"""
+
+import re
+import time
+
+from benchmarks.corpus import generate_corpus
+from benchmarks.suite import bench_args
+from tennis_match_lib import common
+from tennis_match_lib.rules import MatchRules
+from tennis_match_lib.score_format import ScoreFormat
+
+
+TIEBREAK_SCORE_PATTERN = re.compile(r'([(]\d+[)])')
+
+
+def legacy_reverse_score(score, set_separator=' ', game_separator=':'):
+    def _reverse(score):
+        a, b = score.split(game_separator)
+        return f'{b}{game_separator}{a}'
+
+    split = score.split(set_separator)
+    tiebreaks = []
+    for _set in split:
+        if '(' in _set:
+            tiebreaks.append(_set[3:])
+        else:
+            tiebreaks.append('')
+    tbless_score = TIEBREAK_SCORE_PATTERN.sub('', score).split(set_separator)
+    return set_separator.join([f'{_reverse(s)}{t}' for s, t in zip(tbless_score, tiebreaks)])
+
+
+def is_well_formed(score):
+    try:
+        common.parse_score(score, ' ', '-')
+    except ValueError:
+        return False
+    return True
+
+
+def main(argv=None):
+    args = bench_args(__doc__, argv, size=20_000, repeat=5)
+
+    score_format = ScoreFormat(' ', '-')
+    # the former version is undefined for malformed scores, so only well formed ones are used
+    corpus = [
+        score
+        for score in generate_corpus(
+            MatchRules.pro_tour(), score_format, args.size, mix='tiebreak_heavy'
+        )
+        if is_well_formed(score)
+    ]
+    variants = {
+        'legacy reverse_score': lambda score: legacy_reverse_score(score, ' ', '-'),
+        'reverse_score': lambda score: common.reverse_score(score, ' ', '-'),
+        'convert to :': lambda score: common.normalize_score(score, ' ', '-', ' ', ':'),
+        'score_key': lambda score: common.score_key(score, ' ', '-'),
+    }
+    best = dict.fromkeys(variants, float('inf'))
+    for _ in range(args.repeat):
+        for name, function in variants.items():
+            started = time.perf_counter()
+            for score in corpus:
+                function(score)
+            best[name] = min(best[name], time.perf_counter() - started)
+    for name, elapsed in best.items():
+        print(
+            f'{name:<21} {len(corpus) / elapsed:>11,.0f} scores/s '
+            f'{best["legacy reverse_score"] / elapsed:5.2f}x'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Measures scaling of parallel.parse_parallel with the number of worker processes.
+
+Usage:
+    python -m benchmarks.bench_parse_parallel --scores 2000000 --workers 1 2 4 8 16 32
+"""
+
+import os
+import time
+
+from benchmarks.suite import bench_args
+from tennis_match_lib.parallel import DEFAULT_CHUNKSIZE, parse_parallel
+from tennis_match_lib.rules import MatchRules
+from tennis_match_lib.score_format import ScoreFormat
+
+
+SAMPLE_SCORES = (
+    '6:4 6:2',
+    '6:0 6:7(8) 7:5',
+    '6:7(0) 7:6(10) 6:7(20)',
+    '6:4 3:6 6:3',
+    '6:F 2:6',
+)
+
+
+def main(argv=None):
+    args = bench_args(
+        __doc__,
+        argv,
+        scores=500_000,
+        workers=[1, 2, 4, os.cpu_count()],
+        chunksize=DEFAULT_CHUNKSIZE,
+    )
+
+    scores = [SAMPLE_SCORES[i % len(SAMPLE_SCORES)] for i in range(args.scores)]
+    score_format = ScoreFormat.default()
+    rules = MatchRules.pro_tour()
+    baseline = None
+    for workers in args.workers:
+        started = time.perf_counter()
+        results = parse_parallel(
+            scores, score_format, rules, workers=workers, chunksize=args.chunksize
+        )
+        elapsed = time.perf_counter() - started
+        baseline = baseline or elapsed
+        print(
+            f'workers={workers:<3} {len(results) / elapsed:>12,.0f} scores/s '
+            f'speedup={baseline / elapsed:.2f}x efficiency={baseline / elapsed / workers:.0%}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""Compares common.parse_score against the previous split/regex implementation.
+
+Usage:
+    python -m benchmarks.bench_parse_score --number 200000
+"""
+
+import re
+import timeit
+
+from benchmarks.suite import bench_args
+from tennis_match_lib import common
+from tennis_match_lib.structs import SetScore
+
+
+TIEBREAK_SCORE_PATTERN = re.compile(r'([(]\d+[)])')
+
+SAMPLE_SCORES = (
+    '6:4 6:2',
+    '6:0 6:7(8) 7:5',
+    '6:7(0) 7:6(10) 6:7(20)',
+    '6:3 4:6 7:6(5) 3:6 7:5',
+)
+
+
+def legacy_parse_score(score, set_separator=' ', game_separator=':'):
+    return [legacy_parse_set(s, game_separator) for s in score.split(set_separator)]
+
+
+def legacy_parse_set(set_score, game_separator=':'):
+    tb_score = None
+    score = set_score
+    if TIEBREAK_SCORE_PATTERN.search(set_score):
+        tb_score = int(set_score[4:-1])
+        score = TIEBREAK_SCORE_PATTERN.sub('', set_score)
+    unit_one_games, unit_two_games = [int(game) for game in score.split(game_separator)]
+    return SetScore(
+        unit_one_games=unit_one_games, unit_two_games=unit_two_games, tiebreak=tb_score
+    )
+
+
+def main(argv=None):
+    args = bench_args(__doc__, argv, number=200_000)
+
+    for score in SAMPLE_SCORES:
+        assert common.parse_score(score) == legacy_parse_score(score)
+        legacy = timeit.timeit(lambda: legacy_parse_score(score), number=args.number)
+        current = timeit.timeit(lambda: common.parse_score(score), number=args.number)
+        print(
+            f'{score!r:<28} legacy={args.number / legacy:>10,.0f}/s '
+            f'scanner={args.number / current:>10,.0f}/s speedup={legacy / current:.2f}x'
+        )
+
+
+if __name__ == '__main__':
+    main()
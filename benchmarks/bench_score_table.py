@@ -0,0 +1,80 @@
+"""Compares worker processes sharing a score table with ones warming caches of their own.
+
+Every worker parses the whole corpus and reports the growth of its resident set
+size (Linux only) and its parse time.
+
+Usage:
+    python -m benchmarks.bench_score_table --size 50000 --workers 4
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import gc
+import os
+import tempfile
+import time
+
+from benchmarks.corpus import RULES, generate_corpus
+from benchmarks.suite import bench_args
+from tennis_match_lib.cache import CachedParser
+from tennis_match_lib.parser import Parser
+from tennis_match_lib.score_format import ScoreFormat
+from tennis_match_lib.score_table import ScoreTable, TableParser, write_table
+
+
+def main(argv=None):
+    args = bench_args(__doc__, argv, size=50_000, workers=4, rules='pro_tour', mix='realistic')
+
+    score_format = ScoreFormat.default()
+    rules = RULES[args.rules]()
+    corpus = generate_corpus(rules, score_format, args.size, args.mix)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'scores.tmt')
+        started = time.perf_counter()
+        entries = write_table(path, corpus, score_format, rules)
+        print(
+            f'table of {entries:,} scores, {os.path.getsize(path) / 2**20:.1f} MiB, '
+            f'built in {time.perf_counter() - started:.2f} s'
+        )
+        for name, table_path in (
+            ('no cache', None),
+            ('private caches', None),
+            ('shared table', path),
+        ):
+            with ProcessPoolExecutor(max_workers=args.workers) as executor:
+                futures = [
+                    executor.submit(_run_worker, corpus, score_format, rules, name, table_path)
+                    for _ in range(args.workers)
+                ]
+                results = [future.result() for future in futures]
+            rss = sum(growth for growth, _ in results) / len(results)
+            elapsed = sum(elapsed for _, elapsed in results) / len(results)
+            print(
+                f'{name:<15} {rss / 2**20:>8.1f} MiB RSS growth per worker, '
+                f'{len(corpus) / elapsed:>10,.0f} scores/s per worker'
+            )
+
+
+def _run_worker(corpus, score_format, rules, name, table_path):
+    if name == 'no cache':
+        parser = Parser(score_format, rules)
+    elif table_path is None:
+        parser = CachedParser(score_format, rules, maxsize=len(corpus))
+    else:
+        parser = TableParser(score_format, rules, ScoreTable.open(table_path))
+    gc.collect()
+    before = _rss()
+    started = time.perf_counter()
+    for score in corpus:
+        parser.try_parse(score)
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    return _rss() - before, elapsed
+
+
+def _rss():
+    with open('/proc/self/statm') as statm:
+        return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+if __name__ == '__main__':
+    main()
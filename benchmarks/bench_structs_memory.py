@@ -0,0 +1,79 @@
+"""Compares memory held by matches stored as plain dataclasses, slotted structs and
+PackedMatch.
+
+Usage:
+    python -m benchmarks.bench_structs_memory --matches 100000
+"""
+
+from dataclasses import dataclass
+import tracemalloc
+
+from benchmarks.suite import bench_args
+from tennis_match_lib.structs import BasicMatchStatsInfo, PackedMatch, SetScore
+
+
+SETS = ((6, 3, None), (4, 6, None), (7, 6, 5), (6, 7, 3), (7, 5, None))
+STATS_INFO = (1, -1, 3, -3)
+
+
+@dataclass
+class LegacySetScore:
+
+    unit_one_games: int
+    unit_two_games: int
+    tiebreak: int = None
+
+
+@dataclass
+class LegacyBasicMatchStatsInfo:
+
+    unit_one_sets_diff: int
+    unit_two_sets_diff: int
+    unit_one_games_diff: int
+    unit_two_games_diff: int
+
+
+def _legacy(matches):
+    return [
+        ([LegacySetScore(*s) for s in SETS], LegacyBasicMatchStatsInfo(*STATS_INFO))
+        for _ in range(matches)
+    ]
+
+
+def _slotted(matches):
+    return [
+        ([SetScore(*s) for s in SETS], BasicMatchStatsInfo(*STATS_INFO)) for _ in range(matches)
+    ]
+
+
+def _packed(matches):
+    sets = [SetScore(*s) for s in SETS]
+    return [
+        (PackedMatch.from_sets(sets), BasicMatchStatsInfo(*STATS_INFO)) for _ in range(matches)
+    ]
+
+
+def measure(factory, matches):
+    tracemalloc.start()
+    data = factory(matches)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del data
+    return current
+
+
+def main(argv=None):
+    args = bench_args(__doc__, argv, matches=100_000)
+
+    baseline = None
+    for name, factory in (('dataclass', _legacy), ('slotted', _slotted), ('packed', _packed)):
+        used = measure(factory, args.matches)
+        baseline = baseline or used
+        print(
+            f'{name:<10} {used / args.matches:>8.1f} bytes/match '
+            f'({used / baseline:.0%} of dataclass)'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""Compares validation modes on valid-heavy and invalid-heavy corpora.
+
+* validate: ``Validator.validate``, stops at the first error;
+* is_valid: fail-fast boolean mode, checks in the order of their cost;
+* is_valid adaptive: the same, reordered by observed rejections;
+* validate_all: collect-all mode reporting every violated rule.
+
+Usage:
+    python -m benchmarks.bench_validation_modes --size 20000
+"""
+
+from benchmarks.corpus import generate_corpus
+from benchmarks.suite import bench_args, best_time, each
+from tennis_match_lib.rules import MatchRules
+from tennis_match_lib.score_format import ScoreFormat
+from tennis_match_lib.validator import Validator
+
+
+class StaticOrderValidator(Validator):
+
+    FAIL_FAST_REORDER_INTERVAL = 0
+
+
+def main(argv=None):
+    args = bench_args(__doc__, argv, size=20_000, repeat=5)
+
+    score_format = ScoreFormat.default()
+    rules = MatchRules.pro_tour()
+    for mix in ('realistic', 'invalid_heavy'):
+        corpus = generate_corpus(rules, score_format, args.size, mix)
+        validator = Validator(score_format, rules)
+        static = StaticOrderValidator(score_format, rules)
+        modes = (
+            ('validate', lambda score: validator.validate(score).is_valid()),
+            ('is_valid', static.is_valid),
+            ('is_valid adaptive', validator.is_valid),
+            ('validate_all', validator.validate_all),
+        )
+        invalid = sum(not validator.is_valid(score) for score in corpus) / len(corpus)
+        print(f'{mix} corpus, {invalid:.0%} invalid')
+        baseline = None
+        for name, function in modes:
+            best = best_time(each(function), corpus, args.repeat)
+            baseline = baseline or best
+            print(
+                f'  {name:<18} {len(corpus) / best:>10,.0f} scores/s '
+                f'{baseline / best:>5.2f}x of validate'
+            )
+        print(f'  adaptive order: {", ".join(validator.fail_fast_order())}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Measures throughput of a single Validator shared by a pool of threads.
+
+Usage:
+    python -m benchmarks.bench_validator_threads --scores 200000 --threads 1 2 4 8
+
+On a regular CPython build the GIL keeps the throughput roughly flat; on a
+free-threaded build it is expected to grow with the number of threads.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import sys
+import time
+
+from benchmarks.suite import bench_args
+from tennis_match_lib.rules import MatchRules
+from tennis_match_lib.score_format import ScoreFormat
+from tennis_match_lib.validator import Validator
+
+
+SAMPLE_SCORES = (
+    '6:4 6:2',
+    '6:0 6:7(8) 7:5',
+    '6:7(0) 7:6(11) 6:7(10)',
+    '4:5 6:7(8)',
+    '3:6 6:6 6:2',
+    'just invalid',
+)
+
+
+def _validate_chunk(validator, chunk):
+    return sum(1 for score in chunk if validator.validate(score).is_valid())
+
+
+def run(validator, scores, threads, chunksize):
+    chunks = [scores[i : i + chunksize] for i in range(0, len(scores), chunksize)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        valid = sum(executor.map(lambda chunk: _validate_chunk(validator, chunk), chunks))
+    elapsed = time.perf_counter() - started
+    return valid, elapsed
+
+
+def main(argv=None):
+    args = bench_args(__doc__, argv, scores=200_000, threads=[1, 2, 4, 8], chunksize=1_000)
+
+    scores = [SAMPLE_SCORES[i % len(SAMPLE_SCORES)] for i in range(args.scores)]
+    validator = Validator(ScoreFormat.default(), MatchRules.pro_tour())
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f'python {sys.version.split()[0]}, GIL enabled: {gil}')
+    baseline = None
+    for threads in args.threads:
+        valid, elapsed = run(validator, scores, threads, args.chunksize)
+        throughput = len(scores) / elapsed
+        baseline = baseline or throughput
+        print(
+            f'threads={threads:<3} valid={valid:<8} {throughput:>12,.0f} scores/s '
+            f'speedup={throughput / baseline:.2f}x'
+        )
+
+
+if __name__ == '__main__':
+    main()
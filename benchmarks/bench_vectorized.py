@@ -0,0 +1,59 @@
+"""Compares vectorized.parse_scores/calculate_stats_info against Parser.parse row by row.
+
+Usage:
+    python -m benchmarks.bench_vectorized --scores 1000000
+"""
+
+import time
+
+import numpy as np
+
+from benchmarks.suite import bench_args
+from tennis_match_lib import vectorized
+from tennis_match_lib.errors import GameValueError
+from tennis_match_lib.parser import Parser
+from tennis_match_lib.rules import MatchRules
+from tennis_match_lib.score_format import ScoreFormat
+
+
+SAMPLE_SCORES = (
+    '6:4 6:2',
+    '6:0 6:7(8) 7:5',
+    '6:7(0) 7:6(10) 6:7(20)',
+    '6:4 3:6 6:3',
+    '6:F 2:6',
+)
+
+
+def _parse_scalar(parser, scores):
+    results = []
+    for score in scores:
+        try:
+            results.append(parser.parse(score))
+        except GameValueError:
+            results.append(None)
+    return results
+
+
+def main(argv=None):
+    args = bench_args(__doc__, argv, scores=1_000_000)
+
+    score_format = ScoreFormat.default()
+    rules = MatchRules.pro_tour()
+    scores = np.array([SAMPLE_SCORES[i % len(SAMPLE_SCORES)] for i in range(args.scores)])
+
+    started = time.perf_counter()
+    _parse_scalar(Parser(score_format, rules), scores.tolist())
+    scalar = time.perf_counter() - started
+
+    started = time.perf_counter()
+    parsed = vectorized.parse_scores(scores, score_format, rules)
+    vectorized.calculate_stats_info(parsed, rules)
+    vector = time.perf_counter() - started
+
+    print(f'scalar     {args.scores / scalar:>14,.0f} scores/s')
+    print(f'vectorized {args.scores / vector:>14,.0f} scores/s speedup={scalar / vector:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
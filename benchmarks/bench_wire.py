@@ -0,0 +1,95 @@
+"""Compares JSON and the binary wire format for shipping parsed matches.
+
+Usage:
+    python -m benchmarks.bench_wire --size 50000
+"""
+
+import json
+import time
+
+from benchmarks.corpus import generate_corpus
+from benchmarks.suite import bench_args
+from tennis_match_lib.errors import GameValueError
+from tennis_match_lib.parser import Parser, ParseResult
+from tennis_match_lib.rules import MatchRules
+from tennis_match_lib.score_format import ScoreFormat
+from tennis_match_lib.structs import BasicMatchStatsInfo, SetScore
+from tennis_match_lib.wire import WireReader, encode_many
+
+
+def json_encode(parse_results):
+    return json.dumps(
+        [
+            {
+                'sets': [[s.unit_one_games, s.unit_two_games, s.tiebreak] for s in sets],
+                'stats_info': [
+                    stats_info.unit_one_sets_diff,
+                    stats_info.unit_two_sets_diff,
+                    stats_info.unit_one_games_diff,
+                    stats_info.unit_two_games_diff,
+                ],
+            }
+            for sets, stats_info, _ in parse_results
+        ]
+    ).encode()
+
+
+def json_decode(data):
+    return [
+        ParseResult(
+            sets=[SetScore(*s) for s in match['sets']],
+            stats_info=BasicMatchStatsInfo(*match['stats_info']),
+        )
+        for match in json.loads(data)
+    ]
+
+
+def json_games_diff(data):
+    return sum(match['stats_info'][2] for match in json.loads(data))
+
+
+def wire_decode(data):
+    return [record.to_parse_result() for record in WireReader(data)]
+
+
+def wire_games_diff(data):
+    return sum(games_diff for _, games_diff in WireReader(data).iter_stats())
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+
+def main(argv=None):
+    args = bench_args(__doc__, argv, size=50_000)
+
+    score_format = ScoreFormat.default()
+    rules = MatchRules.pro_tour()
+    parser = Parser(score_format, rules)
+    parse_results = []
+    for score in generate_corpus(rules, score_format, args.size):
+        try:
+            parse_results.append(parser.parse(score))
+        except GameValueError:
+            pass
+    for name, encode, decode, games_diff in (
+        ('json', json_encode, json_decode, json_games_diff),
+        ('wire', encode_many, wire_decode, wire_games_diff),
+    ):
+        data, encode_elapsed = timed(encode, parse_results)
+        decoded, decode_elapsed = timed(decode, data)
+        assert decoded == parse_results
+        _, scan_elapsed = timed(games_diff, data)
+        count = len(parse_results)
+        print(
+            f'{name:<5} {len(data) / count:>6.1f} bytes/match '
+            f'encode {count / encode_elapsed:>10,.0f}/s '
+            f'decode {count / decode_elapsed:>10,.0f}/s '
+            f'games diff scan {count / scan_elapsed:>11,.0f}/s'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""Synthetic corpus of tennis match scores for benchmarks.
+
+Matches are simulated game by game with ``TennisMatchScore``: units alternate on
+serve and hold it with a per-match probability, which gives realistic match lengths
+and tiebreak rates. A share of the scores is then corrupted with the typical errors
+of hand-entered data.
+
+Usage:
+    python -m benchmarks.corpus --rules club --mix tiebreak_heavy --size 20
+"""
+
+import argparse
+import random
+
+from tennis_match_lib.match_score import TennisMatchScore, Unit
+from tennis_match_lib.rules import MatchRules
+from tennis_match_lib.score_format import ScoreFormat
+
+
+RULES = {
+    'pro_tour': MatchRules.pro_tour,
+    'club': MatchRules.club,
+    'club_short': MatchRules.club_short,
+    'grand_slam': MatchRules.grand_slam,
+    'fast4': MatchRules.fast4,
+}
+SCORE_FORMATS = {
+    'colon': ScoreFormat(set_sep=' ', game_sep=':'),
+    'dash': ScoreFormat(set_sep=' ', game_sep='-'),
+    'slash': ScoreFormat(set_sep=' ', game_sep='/'),
+}
+# serve hold probability range and share of invalid scores
+MIXES = {
+    'realistic': ((0.6, 0.9), 0.05),
+    'tiebreak_heavy': ((0.88, 0.97), 0.05),
+    'invalid_heavy': ((0.6, 0.9), 0.5),
+    'invalid_30': ((0.6, 0.9), 0.3),
+}
+# most tiebreaks end 7:x, some go past 6:6
+TIEBREAK_LOSER_POINTS = (0, 1, 2, 3, 3, 4, 4, 5, 5, 5, 6, 7, 8, 10)
+
+
+def generate_corpus(rules, score_format, size, mix='realistic', seed=0):
+    """Generates scores of simulated matches.
+
+    Args:
+        rules (tennis_match_lib.rules.MatchRules): Match rules.
+        score_format (tennis_match_lib.score_format.ScoreFormat): Score format.
+        size (int): Number of scores.
+        mix (str): One of ``MIXES``.
+        seed (int): Random seed, the same seed gives the same corpus.
+
+    Returns:
+        list: Scores.
+    """
+    (min_hold, max_hold), invalid_share = MIXES[mix]
+    rng = random.Random(seed)
+    scores = []
+    for _ in range(size):
+        holds = (rng.uniform(min_hold, max_hold), rng.uniform(min_hold, max_hold))
+        score = simulate_match(rules, score_format, holds, rng)
+        if rng.random() < invalid_share:
+            score = corrupt(score, score_format, rng)
+        scores.append(score)
+    return scores
+
+
+def simulate_match(rules, score_format, holds, rng):
+    """Plays a match game by game and returns its final score.
+
+    Args:
+        rules (tennis_match_lib.rules.MatchRules): Match rules.
+        score_format (tennis_match_lib.score_format.ScoreFormat): Score format.
+        holds (tuple): Probability of every unit to hold the serve.
+        rng (random.Random): Random generator.
+
+    Returns:
+        str: Score.
+    """
+    match = TennisMatchScore(None, None, rules=rules, score_format=score_format)
+    server = 0
+    while not match.is_finished():
+        if match.in_tiebreak:
+            winner = Unit.ONE if rng.random() < 0.5 + (holds[0] - holds[1]) else Unit.TWO
+            match.tiebreak_won(winner, rng.choice(TIEBREAK_LOSER_POINTS))
+        else:
+            held = rng.random() < holds[server]
+            match.game_won(Unit.ONE if held == (server == 0) else Unit.TWO)
+        server = 1 - server
+    return match.score
+
+
+def corrupt(score, score_format, rng):
+    """Returns the score broken in one of the ways hand-entered scores are."""
+    set_sep = score_format.set_sep
+    game_sep = score_format.game_sep
+    sets = score.split(set_sep)
+    kind = rng.randrange(7)
+    if kind == 0:
+        # wrong game separator
+        wrong = ':' if game_sep != ':' else '-'
+        return score.replace(game_sep, wrong)
+    if kind == 1:
+        # extra set
+        return set_sep.join(sets + [f'6{game_sep}4'])
+    if kind == 2:
+        # typo in games
+        position = rng.randrange(len(sets))
+        sets[position] = sets[position].replace(game_sep, f'{game_sep}1', 1)
+        return set_sep.join(sets)
+    if kind == 3:
+        # equal games
+        sets[-1] = f'6{game_sep}6'
+        return set_sep.join(sets)
+    if kind == 4:
+        # truncated
+        return score[: rng.randrange(1, len(score))]
+    if kind == 5:
+        # garbage character
+        position = rng.randrange(len(score) + 1)
+        return score[:position] + rng.choice('x?;,.') + score[position:]
+    # unfinished match
+    return set_sep.join(sets[:1])
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--rules', choices=sorted(RULES), default='pro_tour')
+    arg_parser.add_argument('--format', choices=sorted(SCORE_FORMATS), default='colon')
+    arg_parser.add_argument('--mix', choices=sorted(MIXES), default='realistic')
+    arg_parser.add_argument('--size', type=int, default=20)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    args = arg_parser.parse_args(argv)
+    for score in generate_corpus(
+        RULES[args.rules](), SCORE_FORMATS[args.format], args.size, args.mix, args.seed
+    ):
+        print(score)
+
+
+if __name__ == '__main__':
+    main()
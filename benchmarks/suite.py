@@ -0,0 +1,300 @@
+"""Benchmark suite of score parsing and validation with JSON baselines.
+
+Every case runs a target (``common.parse_score``, ``common.reverse_score``,
+``Parser.parse`` or ``Validator.validate``) over a synthetic corpus of the given
+rules, score format and mix, and reports:
+
+* ops/s: calls per second, best of the repeats;
+* blocks/call, bytes/call: memory blocks and bytes left allocated per call, i.e.
+  held by the results;
+* peak: peak traced memory of a pass over the corpus with results discarded.
+
+Usage:
+    python -m benchmarks.suite run --output baseline.json
+    python -m benchmarks.suite run --filter validate --output current.json
+    python -m benchmarks.suite compare baseline.json current.json --threshold 0.1
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from benchmarks.corpus import MIXES, RULES, SCORE_FORMATS, generate_corpus
+from tennis_match_lib import common
+from tennis_match_lib.errors import GameValueError
+from tennis_match_lib.parser import Parser
+from tennis_match_lib.validator import Validator
+
+
+BASELINE_FORMAT_VERSION = 1
+DEFAULT_RULES = 'pro_tour'
+DEFAULT_FORMAT = 'colon'
+DEFAULT_MIX = 'realistic'
+
+_CHOICES = {'mix': MIXES, 'rules': RULES}
+
+
+def _target_parse_score(score_format, _):
+    set_sep, game_sep = score_format.set_sep, score_format.game_sep
+
+    def parse_score(score):
+        try:
+            return common.parse_score(score, set_sep, game_sep)
+        except ValueError:
+            return None
+
+    return parse_score
+
+
+def _target_reverse_score(score_format, _):
+    set_sep, game_sep = score_format.set_sep, score_format.game_sep
+
+    def reverse_score(score):
+        try:
+            return common.reverse_score(score, set_sep, game_sep)
+        except ValueError:
+            return None
+
+    return reverse_score
+
+
+def _target_parser(score_format, rules):
+    parser = Parser(score_format, rules)
+
+    def parse(score):
+        try:
+            return parser.parse(score)
+        except GameValueError:
+            return None
+
+    return parse
+
+
+def _target_validator(score_format, rules):
+    return Validator(score_format, rules).validate
+
+
+TARGETS = {
+    'parse_score': _target_parse_score,
+    'reverse_score': _target_reverse_score,
+    'parser': _target_parser,
+    'validator': _target_validator,
+}
+
+
+def iter_cases():
+    """Yields name, rules, score format and mix of every case.
+
+    Each dimension is varied on its own with the other ones at their defaults,
+    which covers every rules factory, separator and mix without the full product.
+    """
+    variants = [(rules, DEFAULT_FORMAT, DEFAULT_MIX) for rules in RULES]
+    variants += [
+        (DEFAULT_RULES, score_format, DEFAULT_MIX)
+        for score_format in SCORE_FORMATS
+        if score_format != DEFAULT_FORMAT
+    ]
+    variants += [(DEFAULT_RULES, DEFAULT_FORMAT, mix) for mix in MIXES if mix != DEFAULT_MIX]
+    for target in TARGETS:
+        for rules, score_format, mix in variants:
+            yield f'{target}/{rules}/{score_format}/{mix}', target, rules, score_format, mix
+
+
+def bench_args(doc, argv, **options):
+    """Parses command line arguments of a benchmark script.
+
+    Args:
+        doc (str): Docstring of the script, its first line describes the script.
+        argv (list): Command line arguments, ``sys.argv[1:]`` if None.
+        **options: Defaults of the options by their names, underscores are dashes
+            in option names. ``mix`` and ``rules`` choose from ``MIXES`` and
+            ``RULES``, a list of defaults takes one or more values of their type.
+
+    Returns:
+        argparse.Namespace: Arguments.
+    """
+    arg_parser = argparse.ArgumentParser(description=doc.splitlines()[0])
+    for name, default in options.items():
+        option = f'--{name.replace("_", "-")}'
+        if name in _CHOICES:
+            arg_parser.add_argument(option, choices=sorted(_CHOICES[name]), default=default)
+        elif isinstance(default, list):
+            arg_parser.add_argument(option, type=type(default[0]), nargs='+', default=default)
+        else:
+            arg_parser.add_argument(option, type=type(default), default=default)
+    return arg_parser.parse_args(argv)
+
+
+def best_time(function, corpus, repeat):
+    """Returns the best time of the function over the corpus.
+
+    Args:
+        function (callable): Function of the corpus, see ``each``.
+        corpus (list): Scores.
+        repeat (int): Number of timed passes.
+
+    Returns:
+        float: Seconds of the fastest pass.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(corpus)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def each(function):
+    """Returns a function calling the function of a score with every score of a list."""
+
+    def call_each(scores):
+        for score in scores:
+            function(score)
+
+    return call_each
+
+
+def run_case(function, corpus, repeat):
+    """Measures the function over the corpus.
+
+    Args:
+        function (callable): Function of a score.
+        corpus (list): Scores.
+        repeat (int): Number of timed passes.
+
+    Returns:
+        dict: ``ops_per_sec``, ``blocks_per_call``, ``bytes_per_call`` and
+        ``peak_bytes``.
+    """
+    best = best_time(each(function), corpus, repeat)
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        results = [function(score) for score in corpus]
+        after = tracemalloc.take_snapshot()
+        del results
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        for score in corpus:
+            function(score)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # the list holding the results is not an allocation of the function
+    stats = [
+        stat
+        for stat in after.compare_to(before, 'filename')
+        if stat.traceback[0].filename != __file__
+    ]
+    return {
+        'ops_per_sec': len(corpus) / best,
+        'blocks_per_call': sum(stat.count_diff for stat in stats) / len(corpus),
+        'bytes_per_call': sum(stat.size_diff for stat in stats) / len(corpus),
+        'peak_bytes': peak - baseline,
+    }
+
+
+def run(args):
+    results = {}
+    for name, target, rules, score_format, mix in iter_cases():
+        if args.filter and args.filter not in name:
+            continue
+        rules, score_format = RULES[rules](), SCORE_FORMATS[score_format]
+        corpus = generate_corpus(rules, score_format, args.size, mix, args.seed)
+        results[name] = run_case(TARGETS[target](score_format, rules), corpus, args.repeat)
+        print(_format_result(name, results[name]))
+    if args.output:
+        baseline = {
+            'version': BASELINE_FORMAT_VERSION,
+            'meta': _meta(args),
+            'results': results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as baseline_file:
+            json.dump(baseline, baseline_file, indent=2, sort_keys=True)
+    return 0
+
+
+def compare(args):
+    baseline, current = _load(args.baseline), _load(args.current)
+    regressions = 0
+    for name in sorted(set(baseline['results']) & set(current['results'])):
+        old, new = baseline['results'][name], current['results'][name]
+        speed = new['ops_per_sec'] / old['ops_per_sec']
+        blocks = new['blocks_per_call'] - old['blocks_per_call']
+        regressed = speed < 1 - args.threshold or blocks > args.threshold
+        regressions += regressed
+        print(
+            f'{name:<44} {old["ops_per_sec"]:>10,.0f} -> {new["ops_per_sec"]:>10,.0f} ops/s '
+            f'({speed - 1:+7.1%}) blocks/call {blocks:+6.2f}'
+            f'{"  REGRESSION" if regressed else ""}'
+        )
+    for name in sorted(set(baseline['results']) ^ set(current['results'])):
+        print(f'{name:<44} only in {"baseline" if name in baseline["results"] else "current"}')
+    print(f'{regressions} regression(s) at threshold {args.threshold:.0%}')
+    return 1 if regressions else 0
+
+
+def _format_result(name, result):
+    return (
+        f'{name:<44} {result["ops_per_sec"]:>10,.0f} ops/s '
+        f'{result["blocks_per_call"]:>6.2f} blocks/call '
+        f'{result["bytes_per_call"]:>8.1f} bytes/call '
+        f'peak {result["peak_bytes"] / 1024:>8.1f} KiB'
+    )
+
+
+def _meta(args):
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'size': args.size,
+        'seed': args.seed,
+        'repeat': args.repeat,
+    }
+
+
+def _load(path):
+    with open(path, encoding='utf-8') as baseline_file:
+        baseline = json.load(baseline_file)
+    if baseline.get('version') != BASELINE_FORMAT_VERSION:
+        raise ValueError(f'Unsupported baseline version: {baseline.get("version")}')
+    return baseline
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = arg_parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run', help='run the suite')
+    run_parser.add_argument('--size', type=int, default=5000, help='scores per corpus')
+    run_parser.add_argument('--repeat', type=int, default=5, help='timed passes per case')
+    run_parser.add_argument('--seed', type=int, default=0)
+    run_parser.add_argument('--filter', help='run only cases containing the substring')
+    run_parser.add_argument('-o', '--output', help='JSON file to save the results to')
+    run_parser.set_defaults(handler=run)
+    compare_parser = commands.add_parser('compare', help='compare two saved runs')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument(
+        '--threshold', type=float, default=0.1, help='tolerated relative slowdown'
+    )
+    compare_parser.set_defaults(handler=compare)
+    args = arg_parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
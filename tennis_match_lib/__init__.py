@@ -1 +1,66 @@
+"""Parses and validates tennis match scores.
+
+Submodules and the main classes are imported on first access, so ``import
+tennis_match_lib`` costs nothing and ``tennis_match_lib.Validator`` loads only what
+the validator needs.
+"""
+
 __version__ = '0.1.0'
+
+_SUBMODULES = frozenset(
+    [
+        'aggregate',
+        'aio',
+        'archive',
+        'automaton',
+        'cache',
+        'cli',
+        'codegen',
+        'common',
+        'constants',
+        'errors',
+        'instrumentation',
+        'match_score',
+        'parallel',
+        'parser',
+        'rules',
+        'score_format',
+        'score_table',
+        'structs',
+        'universe',
+        'validation',
+        'validator',
+        'vectorized',
+        'wire',
+    ]
+)
+_EXPORTS = {
+    'GameValueError': 'errors',
+    'MatchRules': 'rules',
+    'Parser': 'parser',
+    'ScoreError': 'errors',
+    'ScoreFormat': 'score_format',
+    'SetScore': 'structs',
+    'TennisMatchScore': 'match_score',
+    'Validator': 'validator',
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    # __import__ sets the imported submodule as attribute of the package, importlib
+    # is not used as it is not imported at interpreter startup
+    if name in _SUBMODULES:
+        __import__(f'{__name__}.{name}')
+        return globals()[name]
+    if name in _EXPORTS:
+        module = _EXPORTS[name]
+        __import__(f'{__name__}.{module}')
+        value = globals()[name] = getattr(globals()[module], name)
+        return value
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+    return sorted(set(globals()) | _SUBMODULES | set(_EXPORTS))
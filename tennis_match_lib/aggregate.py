@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+"""Aggregate module provides mergeable per-unit totals of parsed matches.
+
+``StatsAggregate`` is updated match by match, so new matches are added to existing
+totals without scanning the history again. Aggregates of disjoint batches, e.g.
+computed by worker processes, are combined with ``merge``; the result is the same
+as if all the matches were added to a single aggregate.
+
+A set is won by the unit with more games, a match by the unit with more won sets.
+The deciding set is the last set of a match if both units had won the same number
+of sets before it. Matches ended by retirement, default or walkover are won by unit
+one, as feeds list the winner first; their last set counts only if it was finished
+under the rules given to the aggregate, or not at all without rules. Matches in
+progress have no winner yet.
+"""
+
+from collections import Counter, namedtuple
+
+from tennis_match_lib.rules import is_set_complete
+from tennis_match_lib.structs import MatchOutcome
+
+
+UnitStats = namedtuple(
+    'UnitStats',
+    [
+        'matches',
+        'matches_won',
+        'matches_lost',
+        'sets_won',
+        'sets_lost',
+        'games_diff',
+        'tiebreaks_won',
+        'tiebreaks_lost',
+        'deciding_sets_won',
+        'deciding_sets_lost',
+    ],
+)
+UnitStats.__doc__ = """Totals of a unit over its matches.
+
+Attributes:
+    matches (int): Number of matches.
+    matches_won (int): Number of won matches.
+    matches_lost (int): Number of lost matches.
+    sets_won (int): Number of won sets.
+    sets_lost (int): Number of lost sets.
+    games_diff (int): Games won minus games lost.
+    tiebreaks_won (int): Number of won sets with tiebreak points.
+    tiebreaks_lost (int): Number of lost sets with tiebreak points.
+    deciding_sets_won (int): Number of won deciding sets.
+    deciding_sets_lost (int): Number of lost deciding sets.
+"""
+
+(
+    _MATCHES,
+    _MATCHES_WON,
+    _MATCHES_LOST,
+    _SETS_WON,
+    _SETS_LOST,
+    _GAMES_DIFF,
+    _TIEBREAKS_WON,
+    _TIEBREAKS_LOST,
+    _DECIDING_SETS_WON,
+    _DECIDING_SETS_LOST,
+) = range(len(UnitStats._fields))
+
+
+class StatsAggregate:
+    """Per-unit totals and head-to-head records of parsed matches.
+
+    Units are identified by any hashable values, e.g. player ids. Aggregates are
+    picklable, so they can be sent back from worker processes.
+
+    Args:
+        rules (tennis_match_lib.rules.MatchRules): Rules to tell if the last set of
+            a match which was not completed was finished.
+    """
+
+    def __init__(self, rules=None):
+        self._plan = None if rules is None else rules.compile()
+        self._totals = {}
+        self._wins = Counter()
+
+    def add(self, unit_one, unit_two, parse_result):
+        """Adds a match.
+
+        Args:
+            unit_one: Identifier of unit one.
+            unit_two: Identifier of unit two.
+            parse_result (tennis_match_lib.parser.ParseResult): Parse result of the
+                match score, only ``sets``, ``stats_info`` and ``outcome`` are used, so
+                records of ``tennis_match_lib.wire`` can be added as well.
+        """
+        one = self._unit_totals(unit_one)
+        two = self._unit_totals(unit_two)
+        won = lost = tiebreaks_won = tiebreaks_lost = 0
+        last = 0
+        sets = parse_result.sets
+        outcome = parse_result.outcome
+        if outcome != MatchOutcome.COMPLETED and sets:
+            position = len(sets) - 1
+            if self._plan is None or not is_set_complete(self._plan, position, sets[-1]):
+                sets = sets[:position]
+        for s in sets:
+            if s.unit_one_games > s.unit_two_games:
+                won += 1
+                last = 1
+                if s.tiebreak is not None:
+                    tiebreaks_won += 1
+            elif s.unit_one_games < s.unit_two_games:
+                lost += 1
+                last = -1
+                if s.tiebreak is not None:
+                    tiebreaks_lost += 1
+            else:
+                last = 0
+        games_diff = parse_result.stats_info.unit_one_games_diff
+
+        one[_MATCHES] += 1
+        one[_SETS_WON] += won
+        one[_SETS_LOST] += lost
+        one[_GAMES_DIFF] += games_diff
+        one[_TIEBREAKS_WON] += tiebreaks_won
+        one[_TIEBREAKS_LOST] += tiebreaks_lost
+        two[_MATCHES] += 1
+        two[_SETS_WON] += lost
+        two[_SETS_LOST] += won
+        two[_GAMES_DIFF] -= games_diff
+        two[_TIEBREAKS_WON] += tiebreaks_lost
+        two[_TIEBREAKS_LOST] += tiebreaks_won
+
+        if outcome == MatchOutcome.COMPLETED:
+            if won == lost:
+                return
+            unit_one_won = won > lost
+        elif outcome == MatchOutcome.IN_PROGRESS:
+            return
+        else:
+            unit_one_won = True
+        winner, loser = (one, two) if unit_one_won else (two, one)
+        winner[_MATCHES_WON] += 1
+        loser[_MATCHES_LOST] += 1
+        self._wins[(unit_one, unit_two) if unit_one_won else (unit_two, unit_one)] += 1
+        if outcome == MatchOutcome.COMPLETED and last and won - lost == last and won + lost > 1:
+            winner[_DECIDING_SETS_WON] += 1
+            loser[_DECIDING_SETS_LOST] += 1
+
+    def add_batch(self, matches):
+        """Adds matches.
+
+        Args:
+            matches (iterable): ``(unit_one, unit_two, parse_result)`` tuples.
+
+        Returns:
+            StatsAggregate: The aggregate itself.
+        """
+        add = self.add
+        for unit_one, unit_two, parse_result in matches:
+            add(unit_one, unit_two, parse_result)
+        return self
+
+    def merge(self, other):
+        """Adds totals of another aggregate of other matches.
+
+        Args:
+            other (StatsAggregate): Aggregate.
+
+        Returns:
+            StatsAggregate: The aggregate itself.
+        """
+        for unit, other_totals in other._totals.items():
+            totals = self._unit_totals(unit)
+            for i, value in enumerate(other_totals):
+                totals[i] += value
+        self._wins.update(other._wins)
+        return self
+
+    @classmethod
+    def merged(cls, aggregates, rules=None):
+        """Returns a new aggregate with totals of all the given ones."""
+        result = cls(rules)
+        for aggregate in aggregates:
+            result.merge(aggregate)
+        return result
+
+    def units(self):
+        """Returns identifiers of all units in order of their first match."""
+        return list(self._totals)
+
+    def unit_stats(self, unit):
+        """Returns totals of the unit.
+
+        Args:
+            unit: Unit identifier.
+
+        Returns:
+            UnitStats: Totals, zeros if the unit has no matches.
+        """
+        totals = self._totals.get(unit)
+        return UnitStats(*totals) if totals else UnitStats(*[0] * len(UnitStats._fields))
+
+    def table(self):
+        """Returns totals of every unit.
+
+        Returns:
+            dict: ``UnitStats`` by unit identifier.
+        """
+        return {unit: UnitStats(*totals) for unit, totals in self._totals.items()}
+
+    def head_to_head(self, unit, opponent):
+        """Returns the number of matches won by the unit and by the opponent against
+        each other.
+
+        Returns:
+            tuple: ``(won, lost)`` from the perspective of the unit.
+        """
+        return self._wins[unit, opponent], self._wins[opponent, unit]
+
+    def head_to_head_matrix(self, units=None):
+        """Returns the head-to-head matrix of the units.
+
+        Args:
+            units (list): Unit identifiers, all units by default.
+
+        Returns:
+            list: Row per unit with numbers of matches it won against every unit,
+            in order of ``units``.
+        """
+        if units is None:
+            units = self.units()
+        wins = self._wins
+        return [[wins[unit, opponent] for opponent in units] for unit in units]
+
+    def _unit_totals(self, unit):
+        totals = self._totals.get(unit)
+        if totals is None:
+            totals = self._totals[unit] = [0] * len(UnitStats._fields)
+        return totals
+
+    def __len__(self):
+        return len(self._totals)
+
+    def __eq__(self, other):
+        if isinstance(other, StatsAggregate):
+            return (self._totals, +self._wins) == (other._totals, +other._wins)
+        return NotImplemented
+
+    def __repr__(self):
+        matches = sum(totals[_MATCHES] for totals in self._totals.values()) // 2
+        return f'StatsAggregate(units={len(self._totals)}, matches={matches})'
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""Aio module provides asyncio pipeline to validate and parse streams of scores.
+
+Raw scores are pulled from an async iterator and grouped into micro-batches, every
+batch is validated and parsed in an executor, so the event loop is never blocked
+by CPU work. The number of batches in flight is bounded: when the consumer falls
+behind, the pipeline stops pulling scores from the source.
+"""
+
+import asyncio
+from collections import namedtuple
+import functools
+
+from tennis_match_lib.errors import ScoreError
+from tennis_match_lib.parser import Parser
+from tennis_match_lib.validator import Validator
+
+
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_BATCH_TIMEOUT = 0.01
+DEFAULT_MAX_PENDING = 4
+
+StreamResult = namedtuple('StreamResult', ['score', 'validation', 'parse_result'])
+StreamResult.__doc__ = """Result of a score processed by ``ScorePipeline``.
+
+Attributes:
+    score (str): Raw score.
+    validation (tennis_match_lib.validation.Valid | tennis_match_lib.validation.Invalid):
+        Validation result.
+    parse_result (tennis_match_lib.parser.ParseResult): Parse result, None if the
+        score is invalid.
+"""
+
+_END = object()
+_workers = {}
+
+
+class ScorePipeline:
+    """Asyncio pipeline validating and parsing scores in micro-batches.
+
+    Args:
+        score_format (tennis_match_lib.score_format.ScoreFormat): Score format.
+        rules (tennis_match_lib.rules.MatchRules): Match rules.
+        executor (concurrent.futures.Executor): Thread or process pool doing the
+            CPU work, default executor of the event loop if omitted.
+        batch_size (int): Maximum number of scores in a batch.
+        batch_timeout (float): Seconds to wait for a batch to fill up before it is
+            sent incomplete, so slow feeds are not delayed.
+        max_pending (int): Maximum number of batches sent to the executor and not
+            yet consumed.
+    """
+
+    def __init__(
+        self,
+        score_format,
+        rules,
+        executor=None,
+        batch_size=DEFAULT_BATCH_SIZE,
+        batch_timeout=DEFAULT_BATCH_TIMEOUT,
+        max_pending=DEFAULT_MAX_PENDING,
+    ):
+        if batch_size < 1:
+            raise ValueError(f'Invalid batch size: {batch_size}')
+        if max_pending < 1:
+            raise ValueError(f'Invalid number of pending batches: {max_pending}')
+        self.score_format = score_format
+        self.rules = rules
+        self.executor = executor
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
+        self.max_pending = max_pending
+
+    async def process(self, scores):
+        """Validates and parses the scores, keeping their order.
+
+        Args:
+            scores (AsyncIterable): Raw scores.
+
+        Yields:
+            StreamResult: Result of every score.
+        """
+        queue = asyncio.Queue()
+        slots = asyncio.Semaphore(self.max_pending)
+        producer = asyncio.ensure_future(self._produce(scores, queue, slots))
+        try:
+            while True:
+                item = await queue.get()
+                if item is _END:
+                    break
+                for result in await item:
+                    yield result
+                slots.release()
+            await producer
+        finally:
+            producer.cancel()
+            # batches still running in the executor are not awaited by anyone
+            while not queue.empty():
+                item = queue.get_nowait()
+                if item is not _END:
+                    item.cancel()
+
+    async def _produce(self, scores, queue, slots):
+        loop = asyncio.get_running_loop()
+        process_batch = functools.partial(_process_batch, self.score_format, self.rules)
+        try:
+            async for batch in self._batches(scores):
+                # stops pulling the source while max_pending batches are not consumed
+                await slots.acquire()
+                queue.put_nowait(loop.run_in_executor(self.executor, process_batch, batch))
+        except Exception as ex:  # pylint: disable=broad-except
+            failed = loop.create_future()
+            failed.set_exception(ex)
+            queue.put_nowait(failed)
+        queue.put_nowait(_END)
+
+    async def _batches(self, scores):
+        loop = asyncio.get_running_loop()
+        iterator = scores.__aiter__()
+        next_score = asyncio.ensure_future(iterator.__anext__())
+        batch = []
+        deadline = None
+        try:
+            while True:
+                timeout = None if deadline is None else max(0.0, deadline - loop.time())
+                done, _ = await asyncio.wait({next_score}, timeout=timeout)
+                if not done:
+                    # the source is slow, the incomplete batch is sent as is
+                    yield batch
+                    batch = []
+                    deadline = None
+                    continue
+                try:
+                    score = next_score.result()
+                except StopAsyncIteration:
+                    break
+                batch.append(score)
+                if deadline is None:
+                    deadline = loop.time() + self.batch_timeout
+                if len(batch) >= self.batch_size:
+                    yield batch
+                    batch = []
+                    deadline = None
+                next_score = asyncio.ensure_future(iterator.__anext__())
+            if batch:
+                yield batch
+        finally:
+            next_score.cancel()
+
+
+def process_stream(scores, score_format, rules, **kwargs):
+    """Shortcut for ``ScorePipeline(score_format, rules, **kwargs).process(scores)``."""
+    return ScorePipeline(score_format, rules, **kwargs).process(scores)
+
+
+def _process_batch(score_format, rules, scores):
+    # validators and parsers are created once per worker process and shared by threads
+    key = (score_format, rules)
+    worker = _workers.get(key)
+    if worker is None:
+        worker = _workers.setdefault(
+            key, (Validator(score_format, rules), Parser(score_format, rules))
+        )
+    validator, parser = worker
+    results = []
+    for score in scores:
+        validation_result = validator.validate(score)
+        parse_result = None
+        if validation_result.is_valid():
+            parse_result = parser.try_parse(score)
+            if isinstance(parse_result, ScoreError):
+                parse_result = None
+        results.append(StreamResult(score, validation_result, parse_result))
+    return results
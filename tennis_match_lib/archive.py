@@ -0,0 +1,377 @@
+# -*- coding: utf-8 -*-
+"""Archive module provides memory-mapped on-disk storage of parsed matches.
+
+An archive is written once from parsed and validated scores and then read through
+``mmap``. Per match values are stored column by column in fixed-width arrays, full
+sets are stored as a wire stream (see ``tennis_match_lib.wire``)::
+
+    magic         b'TMA1'
+    header size   uint32
+    header        JSON: rows, rules, byte order, positions of columns and indexes
+    columns       8-byte aligned arrays, one item per match
+    indexes       sorted row numbers of every rules, set count, winner and outcome
+    matches       wire stream
+
+Columns are exposed as ``memoryview`` objects over the mapped file, so scans like
+``sum(archive.column('games_diff'))`` run in C without Python objects per row.
+"""
+
+import io
+import json
+import mmap
+import struct
+import sys
+from array import array
+
+from tennis_match_lib.errors import ScoreError
+from tennis_match_lib.parser import Parser
+from tennis_match_lib.rules import MatchRules
+from tennis_match_lib.validator import Validator
+from tennis_match_lib.wire import WireReader, WireWriter
+
+
+MAGIC = b'TMA1'
+ARCHIVE_FORMAT_VERSION = 2
+
+# name and array typecode of every column
+COLUMNS = (
+    ('rules', 'B'),
+    ('set_count', 'B'),
+    ('winner', 'B'),
+    ('valid', 'B'),
+    ('tiebreaks', 'B'),
+    ('outcome', 'B'),
+    ('sets_diff', 'b'),
+    ('games_diff', 'h'),
+    ('games', 'H'),
+)
+INDEXED_COLUMNS = ('rules', 'set_count', 'winner', 'outcome')
+# smallest and largest value of every column typecode
+_RANGES = {'B': (0, 0xFF), 'b': (-0x80, 0x7F), 'H': (0, 0xFFFF), 'h': (-0x8000, 0x7FFF)}
+
+_HEADER_SIZE = struct.Struct('<I')
+_ALIGNMENT = 8
+
+
+def write_archive(path, scores, score_format, rules):
+    """Parses and validates the scores and writes them into an archive.
+
+    Scores which can't be parsed or whose values do not fit the archive are
+    skipped, invalid ones are stored with ``valid`` set to 0.
+
+    Args:
+        path (str): Archive file path.
+        scores (iterable): Tennis match scores.
+        score_format (tennis_match_lib.score_format.ScoreFormat): Score format.
+        rules (tennis_match_lib.rules.MatchRules): Match rules.
+
+    Returns:
+        int: Number of stored matches.
+    """
+    parser = Parser(score_format, rules)
+    validator = Validator(score_format, rules)
+    with ArchiveWriter(path) as writer:
+        for score in scores:
+            parse_result = parser.try_parse(score)
+            if isinstance(parse_result, ScoreError):
+                continue
+            writer.add(parse_result, rules, validator.is_valid(score))
+        return writer.rows
+
+
+class ArchiveWriter:
+    """Collects parsed matches and writes them into an archive on ``close``.
+
+    Columns take 11 bytes per match and are kept in memory until the archive is
+    written, like the wire records of the matches, which are encoded by ``add``.
+
+    Args:
+        path (str): Archive file path.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._columns = {name: array(typecode) for name, typecode in COLUMNS}
+        self._rules = {}
+        self._matches = io.BytesIO()
+        self._writer = WireWriter(self._matches)
+        self._rows = 0
+        self._closed = False
+
+    @property
+    def rules(self):
+        return list(self._rules)
+
+    @property
+    def rows(self):
+        return self._rows
+
+    def add(self, parse_result, rules, valid=True):
+        """Adds a parsed match.
+
+        A match with a value which does not fit its column or the wire record,
+        e.g. a tiebreak of more than 255 points, is skipped.
+
+        Args:
+            parse_result (tennis_match_lib.parser.ParseResult): Parse result.
+            rules (tennis_match_lib.rules.MatchRules): Rules of the match.
+            valid (bool): Validation result of the score.
+
+        Returns:
+            bool: True if the match is added, False if it is skipped.
+        """
+        sets, stats_info, outcome = parse_result
+        sets_diff = stats_info.unit_one_sets_diff
+        row = (
+            self._rules.get(rules, len(self._rules)),
+            len(sets),
+            1 if sets_diff > 0 else 2 if sets_diff < 0 else 0,
+            int(bool(valid)),
+            sum(1 for s in sets if s.tiebreak is not None),
+            outcome,
+            sets_diff,
+            stats_info.unit_one_games_diff,
+            sum(s.unit_one_games + s.unit_two_games for s in sets),
+        )
+        for (_, typecode), value in zip(COLUMNS, row):
+            low, high = _RANGES[typecode]
+            if not low <= value <= high:
+                return False
+        try:
+            self._writer.write(parse_result)
+        except ValueError:
+            return False
+        self._rules.setdefault(rules, len(self._rules))
+        for (name, _), value in zip(COLUMNS, row):
+            self._columns[name].append(value)
+        self._rows += 1
+        return True
+
+    def close(self):
+        """Writes the archive."""
+        if self._closed:
+            return
+        self._closed = True
+        sections = [(name, self._columns[name]) for name, _ in COLUMNS]
+        for column in INDEXED_COLUMNS:
+            postings = {}
+            for row, value in enumerate(self._columns[column]):
+                postings.setdefault(value, array('I')).append(row)
+            sections += [(f'{column}={value}', postings[value]) for value in sorted(postings)]
+        self._writer.close()
+        matches = self._matches.getvalue()
+
+        layout = {}
+        position = 0
+        for name, values in sections:
+            size = len(values) * values.itemsize
+            layout[name] = [values.typecode, position, size]
+            position += size + -size % _ALIGNMENT
+        layout['matches'] = ['B', position, len(matches)]
+        header = json.dumps(
+            {
+                'version': ARCHIVE_FORMAT_VERSION,
+                'rows': self.rows,
+                'byteorder': sys.byteorder,
+                'rules': [rules.to_dict() for rules in self._rules],
+                'sections': layout,
+            }
+        ).encode()
+        header += b' ' * (-(len(MAGIC) + _HEADER_SIZE.size + len(header)) % _ALIGNMENT)
+
+        with open(self.path, 'wb') as archive_file:
+            archive_file.write(MAGIC)
+            archive_file.write(_HEADER_SIZE.pack(len(header)))
+            archive_file.write(header)
+            for _, values in sections:
+                size = len(values) * values.itemsize
+                archive_file.write(values.tobytes())
+                archive_file.write(b'\0' * (-size % _ALIGNMENT))
+            archive_file.write(matches)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        if exc_type is None:
+            self.close()
+
+
+class Archive:
+    """Read-only memory-mapped archive, use ``Archive.open``.
+
+    Args:
+        buffer: Object supporting the buffer protocol with the archive, e.g. ``mmap``.
+
+    Raises:
+        ValueError: If the buffer is not an archive or was written on a machine with
+            other byte order.
+    """
+
+    def __init__(self, buffer):
+        self._mmap = None
+        self._view = memoryview(buffer).cast('B')
+        self._views = []
+        try:
+            header, data_start = self._read_header(self._view)
+            self.rules = [MatchRules.from_dict(rules) for rules in header['rules']]
+            self._rows = header['rows']
+            self._sections = {}
+            for name, (typecode, position, size) in header['sections'].items():
+                start = data_start + position
+                section = self._view[start : start + size].cast(typecode)
+                self._views.append(section)
+                self._sections[name] = section
+            self._matches = WireReader(self._sections['matches'])
+        except (KeyError, ValueError, TypeError) as ex:
+            self.close()
+            raise ValueError(f'Invalid archive: {ex}') from ex
+
+    @classmethod
+    def open(cls, path):
+        """Maps the archive file into memory, use the archive with ``with``.
+
+        Args:
+            path (str): Archive file path.
+
+        Returns:
+            Archive: Archive.
+        """
+        with open(path, 'rb') as archive_file:
+            mapped = mmap.mmap(archive_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            archive = cls(mapped)
+        except ValueError:
+            mapped.close()
+            raise
+        archive._mmap = mapped
+        return archive
+
+    def close(self):
+        """Releases the mapped file, columns and matches can't be used afterwards."""
+        if getattr(self, '_matches', None) is not None:
+            self._matches.close()
+            self._matches = None
+        for view in self._views:
+            view.release()
+        self._views = []
+        self._view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._rows
+
+    def match(self, row):
+        """Returns the match of the row.
+
+        Args:
+            row (int): Row number.
+
+        Returns:
+            tennis_match_lib.wire.WireRecord: Lazy view of the match.
+        """
+        return self._matches[row]
+
+    def column(self, name):
+        """Returns the column as ``memoryview`` over the mapped file.
+
+        Args:
+            name (str): Column name, one of ``COLUMNS``.
+
+        Returns:
+            memoryview: Values of every row.
+        """
+        if name not in dict(COLUMNS):
+            raise KeyError(f'Unknown column: {name}')
+        return self._sections[name]
+
+    def select(self, rules=None, set_count=None, winner=None, outcome=None):
+        """Returns row numbers of the matches meeting every given condition.
+
+        The rows are taken from the smallest of the indexes of the conditions and
+        checked against the columns of the other ones.
+
+        Args:
+            rules (tennis_match_lib.rules.MatchRules): Match rules.
+            set_count (int): Number of sets.
+            winner (int): 1 or 2 for the unit which won more sets, 0 for a draw.
+            outcome (tennis_match_lib.structs.MatchOutcome): Match outcome.
+
+        Returns:
+            memoryview | array: Sorted row numbers.
+        """
+        conditions = []
+        if rules is not None:
+            conditions.append(('rules', self.rules.index(rules) if rules in self.rules else -1))
+        if set_count is not None:
+            conditions.append(('set_count', set_count))
+        if winner is not None:
+            conditions.append(('winner', winner))
+        if outcome is not None:
+            conditions.append(('outcome', int(outcome)))
+        if not conditions:
+            return array('I', range(self._rows))
+        postings = [
+            (self._sections.get(f'{column}={value}', ()), column, value)
+            for column, value in conditions
+        ]
+        postings.sort(key=lambda posting: len(posting[0]))
+        rows, _, _ = postings[0]
+        if len(postings) == 1:
+            return rows
+        checks = [(self._sections[column], value) for _, column, value in postings[1:]]
+        return array(
+            'I', [row for row in rows if all(column[row] == value for column, value in checks)]
+        )
+
+    def total(self, name, rows=None):
+        """Returns the sum of the column over all rows or the given ones.
+
+        Args:
+            name (str): Column name.
+            rows (iterable): Row numbers, e.g. returned by ``select``.
+
+        Returns:
+            int: Sum.
+        """
+        column = self.column(name)
+        if rows is None:
+            return sum(column)
+        return sum(map(column.__getitem__, rows))
+
+    def count(self, name, rows=None):
+        """Returns number of rows with non-zero value of the column."""
+        column = self.column(name)
+        if rows is None:
+            return sum(map(bool, column))
+        return sum(map(bool, map(column.__getitem__, rows)))
+
+    def games_diff_total(self, rows=None):
+        """Returns the total games diff of unit one."""
+        return self.total('games_diff', rows)
+
+    def tiebreak_frequency(self, rows=None):
+        """Returns the share of sets decided by a tiebreak, 0.0 if there are no sets."""
+        sets = self.total('set_count', rows)
+        return self.total('tiebreaks', rows) / sets if sets else 0.0
+
+    @staticmethod
+    def _read_header(view):
+        if len(view) < len(MAGIC) + _HEADER_SIZE.size or bytes(view[: len(MAGIC)]) != MAGIC:
+            raise ValueError('Buffer is not an archive')
+        (header_size,) = _HEADER_SIZE.unpack_from(view, len(MAGIC))
+        data_start = len(MAGIC) + _HEADER_SIZE.size + header_size
+        header = json.loads(bytes(view[len(MAGIC) + _HEADER_SIZE.size : data_start]))
+        if header.get('version') != ARCHIVE_FORMAT_VERSION:
+            raise ValueError(f'Unsupported archive version: {header.get("version")}')
+        if header['byteorder'] != sys.byteorder:
+            raise ValueError(f'Archive has {header["byteorder"]} byte order')
+        return header, data_start
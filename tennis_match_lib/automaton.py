@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""Automaton module provides single pass validation and parsing of scores.
+
+``ScoreAutomaton`` is a deterministic finite-state machine built from match rules
+and a score format. Its transition table is computed once, then a score is read
+character by character: the format is checked and games and tiebreaks are
+collected in the same left-to-right pass, the rules are checked on the collected
+sets afterwards by ``rules.check_sets``.
+
+The accepted format is::
+
+    set         games<game sep>games[(tiebreak)]
+    score       set<set sep>set...
+
+with at least as many sets as needed to win the match. Games have no leading
+zeros and are at most ``RulesPlan.max_games``, except in the deciding tiebreak set
+and the advantage last set, which are played on until a two games lead and have
+no tiebreak. Sets after the maximum number of
+sets are not read, the score is reported as having too many sets.
+"""
+
+from tennis_match_lib.errors import ErrorCode
+from tennis_match_lib.rules import check_sets
+from tennis_match_lib.structs import SetScore
+
+
+# character classes, games are the digits up to the maximum games and the digits
+# following the first one of games
+_DIGIT, _GAMES, _GAMES_NEXT, _GAME_SEP, _SET_SEP, _OPEN, _CLOSE = range(7)
+
+# phases of a set: before unit one games, in unit one games, after the game
+# separator, in unit two games, after the opening parenthesis, in tiebreak points
+# and after the closing parenthesis
+_START, _ONE, _SEP, _TWO, _OPENED, _TIEBREAK, _CLOSED = range(7)
+_PHASES = 7
+
+# kinds of sets, a set played on until a two games lead has no bound of games and
+# no tiebreak
+_REGULAR, _TIEBREAK_SET = range(2)
+
+# actions of transitions
+(
+    _GAMES_START,
+    _GAMES_DIGIT,
+    _NUMBER_START,
+    _NUMBER_DIGIT,
+    _STORE_ONE,
+    _STORE_TWO,
+    _STORE_TIEBREAK,
+    _END_SET,
+    _END_TIEBREAK_SET,
+) = range(9)
+
+
+class ScoreAutomaton:
+    """Finite-state machine validating and parsing scores in a single pass.
+
+    Args:
+        score_format (tennis_match_lib.score_format.ScoreFormat): Score format.
+        rules (tennis_match_lib.rules.MatchRules): Match rules.
+    """
+
+    def __init__(self, score_format, rules):
+        self.score_format = score_format
+        self.rules = rules
+        self.plan = rules.compile()
+        self._table = [
+            transitions.get for transitions in _build_table(score_format, self.plan.max_games)
+        ]
+        # start state of the set at every position, see RulesPlan.max_set_games
+        self._starts = tuple(
+            _state(_REGULAR if max_games is not None else _TIEBREAK_SET, _START)
+            for max_games in self.plan.max_set_games
+        )
+
+    def matches_format(self, score):
+        """Checks the format of the score, see the module docstring.
+
+        A score with too many sets has a valid format if its sets up to the maximum
+        number of sets have.
+        """
+        return self.scan(score)[0] != ErrorCode.INVALID_FORMAT
+
+    def scan(self, score):
+        """Validates and parses the score.
+
+        Errors are reported as by ``Validator.validate``: the format, the number of
+        sets and the number of won sets are checked first, then the first set with
+        too small games, the first set with equal games and whether the last set
+        decided the match, see ``rules.check_sets``.
+
+        Args:
+            score (str): Tennis match score without an outcome marker.
+
+        Returns:
+            tuple: ``ErrorCode``, 1-based index of the offending set or 0, and the
+            list of ``SetScore``, None if the format is not valid or the score has
+            too many sets.
+        """
+        if not isinstance(score, str):
+            return ErrorCode.INVALID_FORMAT, 0, None
+        table = self._table
+        starts = self._starts
+        max_sets = len(starts)
+        max_games = self.plan.max_games
+        sets = []
+        state = starts[0]
+        value = unit_one_games = unit_two_games = tiebreak = 0
+        for char in score:
+            transition = table[state](char)
+            if transition is None:
+                return ErrorCode.INVALID_FORMAT, 0, None
+            action, state, digit = transition
+            if action == _GAMES_START:
+                value = digit
+            elif action == _STORE_ONE:
+                unit_one_games = value
+            elif action == _END_SET:
+                sets.append(SetScore(unit_one_games, value))
+                if len(sets) == max_sets:
+                    return ErrorCode.TOO_MANY_SETS, 0, None
+                state = starts[len(sets)]
+            elif action == _GAMES_DIGIT:
+                # no leading zeros, so a score has a single spelling
+                value = value * 10 + digit
+                if value > max_games or value < 10:
+                    return ErrorCode.INVALID_FORMAT, 0, None
+            elif action == _NUMBER_START:
+                value = digit
+            elif action == _NUMBER_DIGIT:
+                value = value * 10 + digit
+            elif action == _STORE_TWO:
+                unit_two_games = value
+            elif action == _STORE_TIEBREAK:
+                tiebreak = value
+            else:
+                sets.append(SetScore(unit_one_games, unit_two_games, tiebreak))
+                if len(sets) == max_sets:
+                    return ErrorCode.TOO_MANY_SETS, 0, None
+                state = starts[len(sets)]
+        phase = state % _PHASES
+        if phase == _TWO:
+            sets.append(SetScore(unit_one_games, value))
+        elif phase == _CLOSED:
+            sets.append(SetScore(unit_one_games, unit_two_games, tiebreak))
+        else:
+            return ErrorCode.INVALID_FORMAT, 0, None
+        return self._check_rules(sets) + (sets,)
+
+    def _check_rules(self, sets):
+        if len(sets) < self.plan.sets_to_win:
+            return ErrorCode.INVALID_FORMAT, 0
+        return check_sets(self.plan, sets)
+
+
+def _state(kind, phase):
+    return kind * _PHASES + phase
+
+
+def _build_table(score_format, max_games):
+    # transitions of every state by character: action, target state and value of a
+    # digit; a missing character rejects the score, the target state of set ends
+    # is replaced by the start of the next set. Games of regular sets are bounded
+    # by the table, only numbers of several digits are checked while scanning
+    digits = [(str(digit), digit) for digit in range(10)]
+    characters = {
+        _DIGIT: digits,
+        _GAMES: digits[: max_games + 1],
+        _GAMES_NEXT: digits if max_games >= 10 else [],
+        _GAME_SEP: [(score_format.game_sep, None)],
+        _SET_SEP: [(score_format.set_sep, None)],
+        _OPEN: [('(', None)],
+        _CLOSE: [(')', None)],
+    }
+    transitions = [
+        (_START, _GAMES, _GAMES_START, _ONE),
+        (_ONE, _GAMES_NEXT, _GAMES_DIGIT, _ONE),
+        (_ONE, _GAME_SEP, _STORE_ONE, _SEP),
+        (_SEP, _GAMES, _GAMES_START, _TWO),
+        (_TWO, _GAMES_NEXT, _GAMES_DIGIT, _TWO),
+        (_TWO, _SET_SEP, _END_SET, _START),
+        (_TWO, _OPEN, _STORE_TWO, _OPENED),
+        (_OPENED, _DIGIT, _NUMBER_START, _TIEBREAK),
+        (_TIEBREAK, _DIGIT, _NUMBER_DIGIT, _TIEBREAK),
+        (_TIEBREAK, _CLOSE, _STORE_TIEBREAK, _CLOSED),
+        (_CLOSED, _SET_SEP, _END_TIEBREAK_SET, _START),
+    ]
+    # games of the deciding tiebreak set are numbers of any size and the set has
+    # no tiebreak
+    tiebreak_set_actions = {_GAMES_START: _NUMBER_START, _GAMES_DIGIT: _NUMBER_DIGIT}
+    table = [{} for _ in range(2 * _PHASES)]
+    for phase, char_class, action, target in transitions:
+        for char, digit in characters[char_class]:
+            table[_state(_REGULAR, phase)][char] = (action, _state(_REGULAR, target), digit)
+        if phase in (_START, _ONE, _SEP) or (phase == _TWO and char_class != _OPEN):
+            tiebreak_set_class = _DIGIT if char_class in (_GAMES, _GAMES_NEXT) else char_class
+            for char, digit in characters[tiebreak_set_class]:
+                table[_state(_TIEBREAK_SET, phase)][char] = (
+                    tiebreak_set_actions.get(action, action),
+                    _state(_TIEBREAK_SET, target),
+                    digit,
+                )
+    return table
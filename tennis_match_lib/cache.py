@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""Cache module provides opt-in LRU caching of parse and validation results.
+"""
+
+from collections import OrderedDict, namedtuple
+import threading
+
+from tennis_match_lib import validation
+from tennis_match_lib.errors import ScoreError
+from tennis_match_lib.parser import Parser
+from tennis_match_lib.validator import Validator
+
+
+DEFAULT_MAXSIZE = 4096
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class LRUCache:
+    """Thread-safe size-bounded least recently used cache.
+
+    Args:
+        maxsize (int): Maximum number of cached entries.
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        if maxsize < 1:
+            raise ValueError(f'Invalid cache size: {maxsize}')
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key, default=None):
+        """Returns cached value for the key and marks it as recently used."""
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self._misses += 1
+                return default
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key, value):
+        """Stores the value evicting the least recently used entry if the cache is full."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def info(self):
+        """Returns cache statistics.
+
+        Returns:
+            CacheInfo: Hits, misses, maximum and current size.
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._data))
+
+    def clear(self):
+        """Removes all entries and resets statistics."""
+        with self._lock:
+            self._data.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+
+class CachedParser(Parser):
+    """Parser which caches parse results by ``(score, score_format, rules)``.
+
+    Cached results are immutable: sets are returned as a tuple of frozen
+    ``SetScore``. Scores which fail to parse and scores which are not strings are
+    not cached.
+
+    Args:
+        score_format (tennis_match_lib.score_format.ScoreFormat): Score format.
+        rules (tennis_match_lib.rules.MatchRules): Match rules.
+        maxsize (int): Maximum number of cached results, ignored if ``cache`` is given.
+        cache (LRUCache): Cache to share between parsers, a new one is created if omitted.
+    """
+
+    def __init__(self, score_format, rules, maxsize=DEFAULT_MAXSIZE, cache=None):
+        super().__init__(score_format, rules)
+        self.cache = LRUCache(maxsize) if cache is None else cache
+
+    def try_parse(self, score):
+        if not isinstance(score, str):
+            return super().try_parse(score)
+        key = (score, self.score_format, self.rules)
+        parse_result = self.cache.get(key)
+        if parse_result is None:
+            parse_result = super().try_parse(score)
+            if isinstance(parse_result, ScoreError):
+                return parse_result
+            parse_result = parse_result._replace(sets=tuple(parse_result.sets))
+            self.cache.put(key, parse_result)
+        return parse_result
+
+    def cache_info(self):
+        return self.cache.info()
+
+
+class CachedValidator(Validator):
+    """Validator which caches validation results by ``(score, score_format, rules)``.
+
+    Errors of ``Invalid`` results are cached as a tuple and returned as a new
+    list, as by ``Validator``, so callers can't change cached results.
+
+    Args:
+        score_format (tennis_match_lib.score_format.ScoreFormat): Score format.
+        rules (tennis_match_lib.rules.MatchRules): Match rules.
+        maxsize (int): Maximum number of cached results, ignored if ``cache`` is given.
+        cache (LRUCache): Cache to share between validators, a new one is created if omitted.
+        collector (tennis_match_lib.instrumentation.Collector): Collector of stage
+            metrics, notified on cache misses only.
+    """
+
+    def __init__(self, score_format, rules, maxsize=DEFAULT_MAXSIZE, cache=None, collector=None):
+        super().__init__(score_format, rules, collector)
+        self.cache = LRUCache(maxsize) if cache is None else cache
+
+    def validate(self, score):
+        if not isinstance(score, str):
+            return super().validate(score)
+        key = (score, self.score_format, self.rules)
+        result = self.cache.get(key)
+        if result is None:
+            result = super().validate(score)
+            if result.is_valid():
+                self.cache.put(key, result)
+            else:
+                self.cache.put(key, validation.Invalid(tuple(result.value)))
+            return result
+        if result.is_valid():
+            return result
+        return validation.Invalid(list(result.value))
+
+    def cache_info(self):
+        return self.cache.info()
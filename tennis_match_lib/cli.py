@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+"""Command line interface to validate and parse files with tennis match scores.
+
+Input rows are streamed from CSV, TSV or JSON lines files (or stdin) in chunks,
+so memory usage is bounded by the chunk size and the number of workers, not by
+the size of the input. Every row is written back annotated with the validation
+result, parsed sets and stats info.
+"""
+
+import argparse
+from collections import Counter, deque
+import csv
+import json
+import math
+import os
+import sys
+import time
+
+from tennis_match_lib import parallel
+from tennis_match_lib.errors import ScoreError
+from tennis_match_lib.parser import Parser
+from tennis_match_lib.rules import MatchRules
+from tennis_match_lib.score_format import ScoreFormat
+from tennis_match_lib.score_table import ScoreTable, TableParser, TableValidator
+from tennis_match_lib.validator import Validator
+
+
+RULES = {
+    'pro_tour': MatchRules.pro_tour,
+    'club': MatchRules.club,
+    'club_short': MatchRules.club_short,
+    'grand_slam': MatchRules.grand_slam,
+}
+INPUT_FORMATS = ('csv', 'tsv', 'jsonl')
+ANNOTATION_FIELDS = (
+    'valid',
+    'errors',
+    'sets',
+    'unit_one_sets_diff',
+    'unit_two_sets_diff',
+    'unit_one_games_diff',
+    'unit_two_games_diff',
+    'outcome',
+)
+
+_worker_state = {}
+
+
+def main(argv=None):
+    """Runs ``tennis-match`` command.
+
+    Args:
+        argv (list): Command line arguments, ``sys.argv[1:]`` if omitted.
+
+    Returns:
+        int: Exit code.
+    """
+    args = _build_arg_parser().parse_args(argv)
+    input_format = args.format or _guess_format(args.input)
+    score_format = ScoreFormat(set_sep=args.set_sep, game_sep=args.game_sep)
+    rules = RULES[args.rules]()
+
+    input_file = _open(args.input, 'r')
+    output_file = _open(args.output, 'w')
+    stats = RunStats()
+    try:
+        if args.table is not None:
+            # checked once here instead of in every worker
+            with ScoreTable.open(args.table) as table:
+                if table.rules != rules:
+                    raise ValueError(f'score table {args.table} is built for other rules')
+        rows, writer = _reader_writer(input_format, input_file, output_file, args.column)
+        chunks = parallel.chunked(rows, args.chunksize)
+        for chunk, annotations, latency in _annotate_chunks(
+            chunks, args.column, score_format, rules, args.workers, args.table
+        ):
+            for row, annotation in zip(chunk, annotations):
+                row.update(annotation)
+                writer(row)
+            stats.add_chunk(annotations, latency)
+    except (KeyError, ValueError) as ex:
+        print(f'tennis-match: error: {ex}', file=sys.stderr)
+        return 2
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+    if not args.quiet:
+        print(stats.summary(), file=sys.stderr)
+    return 0
+
+
+def _build_arg_parser():
+    arg_parser = argparse.ArgumentParser(
+        prog='tennis-match', description='Validate and parse files with tennis match scores.'
+    )
+    arg_parser.add_argument('input', help="input file, '-' for stdin")
+    arg_parser.add_argument('-o', '--output', default='-', help="output file, '-' for stdout")
+    arg_parser.add_argument(
+        '-f', '--format', choices=INPUT_FORMATS, help='input format, guessed by file extension'
+    )
+    arg_parser.add_argument('-c', '--column', default='score', help='column/key with the score')
+    arg_parser.add_argument('-r', '--rules', choices=sorted(RULES), default='pro_tour')
+    arg_parser.add_argument('--set-sep', choices=ScoreFormat.ALLOWED_SET_SEP, default=' ')
+    arg_parser.add_argument('--game-sep', choices=ScoreFormat.ALLOWED_GAME_SEP, default=':')
+    arg_parser.add_argument(
+        '-w', '--workers', type=int, default=1, help='number of worker processes'
+    )
+    arg_parser.add_argument('--chunksize', type=int, default=1000, help='rows per chunk')
+    arg_parser.add_argument(
+        '--table', help='score table file built for the rules, shared by the workers'
+    )
+    arg_parser.add_argument('-q', '--quiet', action='store_true', help='do not print stats')
+    return arg_parser
+
+
+def _guess_format(path):
+    extension = os.path.splitext(path)[1].lstrip('.').lower()
+    if extension in ('jsonl', 'ndjson', 'json'):
+        return 'jsonl'
+    if extension == 'tsv':
+        return 'tsv'
+    return 'csv'
+
+
+def _open(path, mode):
+    if path == '-':
+        return sys.stdin if mode == 'r' else sys.stdout
+    return open(path, mode, encoding='utf-8', newline='')
+
+
+def _reader_writer(input_format, input_file, output_file, column):
+    if input_format == 'jsonl':
+        rows = _json_rows(input_file)
+
+        def write_json(row):
+            output_file.write(json.dumps(row))
+            output_file.write('\n')
+
+        return rows, write_json
+
+    delimiter = '\t' if input_format == 'tsv' else ','
+    reader = csv.DictReader(input_file, delimiter=delimiter)
+    if reader.fieldnames is None or column not in reader.fieldnames:
+        raise KeyError(f'column {column!r} not found in the input header')
+    fieldnames = reader.fieldnames + [f for f in ANNOTATION_FIELDS if f not in reader.fieldnames]
+    writer = csv.DictWriter(output_file, fieldnames=fieldnames, delimiter=delimiter)
+    writer.writeheader()
+
+    def write_csv(row):
+        row['errors'] = '; '.join(row['errors'])
+        row['sets'] = json.dumps(row['sets'])
+        writer.writerow(row)
+
+    return _csv_rows(reader), write_csv
+
+
+def _json_rows(input_file):
+    for number, line in enumerate(input_file, 1):
+        if not line.strip():
+            continue
+        row = json.loads(line)
+        if not isinstance(row, dict):
+            raise ValueError(f'line {number} is not a JSON object')
+        yield row
+
+
+def _csv_rows(reader):
+    for row in reader:
+        # DictReader keeps fields beyond the header under the None key
+        if None in row:
+            raise ValueError(f'line {reader.line_num} has more fields than the header')
+        yield row
+
+
+def _annotate_chunks(chunks, column, score_format, rules, workers, table_path=None):
+    chunks = iter(chunks)
+    window = deque()
+
+    def score_chunks():
+        # keeps input rows of the chunks in flight to annotate them in order
+        for chunk in chunks:
+            window.append(chunk)
+            yield [row[column] for row in chunk]
+
+    for annotations, latency in parallel.imap_ordered(
+        _annotate_scores, score_chunks(), workers, _init_worker, (score_format, rules, table_path)
+    ):
+        yield window.popleft(), annotations, latency
+
+
+def _init_worker(score_format, rules, table_path=None):
+    if table_path is None:
+        _worker_state['parser'] = Parser(score_format, rules)
+        _worker_state['validator'] = Validator(score_format, rules)
+        return
+    # the table stays mapped for the lifetime of the worker
+    table = ScoreTable.open(table_path)
+    _worker_state['parser'] = TableParser(score_format, rules, table)
+    _worker_state['validator'] = TableValidator(score_format, rules, table)
+
+
+def _annotate_scores(scores):
+    parser = _worker_state['parser']
+    validator = _worker_state['validator']
+    return [_annotate(parser, validator, score) for score in scores]
+
+
+def _annotate(parser, validator, score):
+    validation_result = validator.validate(score)
+    annotation = {
+        'valid': validation_result.is_valid(),
+        'errors': [] if validation_result.is_valid() else list(map(str, validation_result.value)),
+        'sets': None,
+        'unit_one_sets_diff': None,
+        'unit_two_sets_diff': None,
+        'unit_one_games_diff': None,
+        'unit_two_games_diff': None,
+        'outcome': None,
+    }
+    parse_result = parser.try_parse(score)
+    if isinstance(parse_result, ScoreError):
+        return annotation
+    sets, stats_info, outcome = parse_result
+    annotation['sets'] = [[s.unit_one_games, s.unit_two_games, s.tiebreak] for s in sets]
+    annotation['unit_one_sets_diff'] = stats_info.unit_one_sets_diff
+    annotation['unit_two_sets_diff'] = stats_info.unit_two_sets_diff
+    annotation['unit_one_games_diff'] = stats_info.unit_one_games_diff
+    annotation['unit_two_games_diff'] = stats_info.unit_two_games_diff
+    annotation['outcome'] = outcome.name.lower()
+    return annotation
+
+
+# chunk latencies are counted in buckets growing by 2 ** (1 / 16), about 4.4%,
+# so the stats of a run take constant memory whatever the number of chunks
+LATENCY_BUCKETS_PER_DOUBLING = 16
+MIN_LATENCY = 1e-6
+
+
+class RunStats:
+    """Throughput and latency stats of a run.
+
+    Chunk latencies are kept in a histogram, percentiles are the upper bounds of
+    their buckets, capped by the maximum latency.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.rows = 0
+        self.valid = 0
+        self.chunks = 0
+        self.max_latency = 0.0
+        self._latency_buckets = Counter()
+
+    def add_chunk(self, annotations, latency):
+        self.rows += len(annotations)
+        self.valid += sum(1 for annotation in annotations if annotation['valid'])
+        self.chunks += 1
+        self.max_latency = max(self.max_latency, latency)
+        self._latency_buckets[_latency_bucket(latency)] += 1
+
+    def latency_percentile(self, percent):
+        """Returns the chunk latency in seconds below which the percent of chunks
+        fall, 0.0 if no chunk was added."""
+        rank = min(self.chunks - 1, self.chunks * percent // 100)
+        seen = 0
+        for bucket in sorted(self._latency_buckets):
+            seen += self._latency_buckets[bucket]
+            if seen > rank:
+                return min(2 ** (bucket / LATENCY_BUCKETS_PER_DOUBLING), self.max_latency)
+        return 0.0
+
+    def summary(self):
+        elapsed = time.perf_counter() - self.started
+        throughput = self.rows / elapsed if elapsed else 0.0
+        return (
+            f'rows={self.rows} valid={self.valid} invalid={self.rows - self.valid} '
+            f'elapsed={elapsed:.3f}s throughput={throughput:,.0f} rows/s '
+            f'chunk latency p50={self.latency_percentile(50) * 1000:.1f}ms '
+            f'p99={self.latency_percentile(99) * 1000:.1f}ms '
+            f'max={self.max_latency * 1000:.1f}ms'
+        )
+
+
+def _latency_bucket(latency):
+    # index of the bucket whose upper bound is the least one not below the latency
+    return math.ceil(math.log2(max(latency, MIN_LATENCY)) * LATENCY_BUCKETS_PER_DOUBLING)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
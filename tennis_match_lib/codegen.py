@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""Codegen module generates validation functions specialized for match rules.
+
+``Validator`` reads its rules on every call. ``compile_check`` instead emits the
+source of a function for a single ``MatchRules`` and ``ScoreFormat`` with every
+number of sets, per position games threshold, sets to win and separator inlined
+as a constant, and checks of sets unrolled for every possible number of sets.
+Games are taken from the groups of a regular expression of the format of
+``ScoreAutomaton`` for the number of sets, so a score is scanned once by ``re``
+and never by a Python loop.
+
+Generated functions are compiled once per configuration and return the same
+``(ErrorCode, set_index)`` as the checks of ``Validator.validate_many`` and as
+``rules.check_sets``. Scores with an outcome marker are passed to the interpreted
+checks.
+"""
+
+import functools
+import re
+
+from tennis_match_lib import common
+from tennis_match_lib.errors import ErrorCode
+from tennis_match_lib.validator import Validator, sets_pattern
+
+
+@functools.lru_cache(maxsize=64)
+def compile_check(score_format, rules):
+    """Returns the generated check of scores for the rules and the format.
+
+    Args:
+        score_format (tennis_match_lib.score_format.ScoreFormat): Score format.
+        rules (tennis_match_lib.rules.MatchRules): Match rules.
+
+    Returns:
+        callable: Function of a score returning ``(ErrorCode, set_index)``,
+        ``(ErrorCode.NONE, 0)`` for a valid score.
+    """
+    plan = rules.compile()
+    outcome_errors = Validator(score_format, rules)._outcome_errors
+
+    def outcome_check(sets_score, outcome):
+        errors = outcome_errors(sets_score, outcome)
+        return (errors[0].code, errors[0].set_index) if errors else (ErrorCode.NONE, 0)
+
+    namespace = {
+        'MATCH_TOO_MANY_SETS': re.compile(
+            sets_pattern(score_format, plan, plan.sets) + score_format.set_sep
+        ).match,
+        'SET_ENDINGS': common._SET_ENDINGS,  # pylint: disable=protected-access
+        'split_outcome': common.split_outcome,
+        'outcome_check': outcome_check,
+        'OK': (ErrorCode.NONE, 0),
+        'INVALID_FORMAT': (ErrorCode.INVALID_FORMAT, 0),
+        'TOO_MANY_SETS': (ErrorCode.TOO_MANY_SETS, 0),
+        'TOO_FEW_SETS': (ErrorCode.TOO_FEW_SETS, 0),
+        'TOO_MANY_WON_SETS': (ErrorCode.TOO_MANY_WON_SETS, 0),
+        'GAMES_TOO_SMALL': ErrorCode.GAMES_TOO_SMALL,
+        'GAMES_EQUAL': ErrorCode.GAMES_EQUAL,
+        'SET_INCOMPLETE': ErrorCode.SET_INCOMPLETE,
+    }
+    for count in range(plan.sets_to_win, plan.sets + 1):
+        pattern = re.compile(sets_pattern(score_format, plan, count))
+        namespace[f'MATCH_{count}'] = pattern.fullmatch
+    source = generate_source(score_format, rules)
+    exec(  # pylint: disable=exec-used
+        compile(source, f'<check {score_format!r} {rules!r}>', 'exec'), namespace
+    )
+    check = namespace['check']
+    check.source = source
+    return check
+
+
+def generate_source(score_format, rules):
+    """Returns the source of the check generated by ``compile_check``."""
+    plan = rules.compile()
+    set_sep = score_format.set_sep
+    lines = [
+        'def check(score):',
+        '    if not isinstance(score, str):',
+        '        return INVALID_FORMAT',
+        '    if score and score[-1] not in SET_ENDINGS:',
+        f'        sets_score, outcome = split_outcome(score, {set_sep!r})',
+        '        if outcome is not None:',
+        '            return outcome_check(sets_score, outcome)',
+        f'    sets = score.count({set_sep!r}) + 1',
+        f'    if sets > {plan.sets}:',
+        '        if MATCH_TOO_MANY_SETS(score) is None:',
+        '            return INVALID_FORMAT',
+        '        return TOO_MANY_SETS',
+    ]
+    for count in range(plan.sets_to_win, plan.sets + 1):
+        lines += [
+            f'    if sets == {count}:',
+            f'        match = MATCH_{count}(score)',
+            '        if match is None:',
+            '            return INVALID_FORMAT',
+        ]
+        lines += _sets_checks(plan, count)
+    # fewer sets than needed to win the match
+    lines.append('    return INVALID_FORMAT')
+    return '\n'.join(lines) + '\n'
+
+
+class GeneratedValidator(Validator):
+    """Validator whose ``validate_many`` and ``is_valid`` run the generated check.
+
+    Results are the same as of ``Validator``, ``validate`` and ``validate_all``
+    are not changed as they build error objects anyway.
+
+    Args:
+        score_format (tennis_match_lib.score_format.ScoreFormat): Score format.
+        rules (tennis_match_lib.rules.MatchRules): Match rules.
+        collector (tennis_match_lib.instrumentation.Collector): Collector of stage
+            metrics of ``validate``.
+    """
+
+    def is_valid(self, score):
+        return not self._check(score)[0]
+
+    def _compile_checks(self):
+        return compile_check(self.score_format, self.rules)
+
+
+def _sets_checks(plan, count):
+    # the checks of rules.check_sets for the number of sets, in the same order,
+    # with the values of the plan for every set position inlined
+    sets_to_win = plan.sets_to_win
+    groups = ', '.join(f'a{i}, b{i}, t{i}' for i in range(count))
+    lines = [f'        {groups} = match.groups()']
+    lines += [f'        a{i}, b{i} = int(a{i}), int(b{i})' for i in range(count)]
+    won = ' + '.join(f'(a{i} > b{i})' for i in range(count))
+    lines.append(f'        won = {won}')
+    if count > sets_to_win:
+        lines += [
+            f'        if won > {sets_to_win} or {count} - won > {sets_to_win}:',
+            '            return TOO_MANY_WON_SETS',
+        ]
+    for i in range(count):
+        games = plan.min_winner_games[i]
+        lines += [
+            f'        if a{i} < {games} and b{i} < {games}:',
+            f'            return GAMES_TOO_SMALL, {i + 1}',
+        ]
+    for i in range(count):
+        lines += [f'        if a{i} == b{i}:', f'            return GAMES_EQUAL, {i + 1}']
+    for i in range(count):
+        lines += [
+            f'        winner, loser = (a{i}, b{i}) if a{i} > b{i} else (b{i}, a{i})',
+            f'        if not ({_set_complete_condition(plan, i)}):',
+            f'            return SET_INCOMPLETE, {i + 1}',
+        ]
+    if count > sets_to_win:
+        # a unit which won the match before the last set
+        last = count - 1
+        lines += [
+            f'        won_before_last = won - (a{last} > b{last})',
+            f'        if won_before_last >= {sets_to_win} '
+            f'or {last} - won_before_last >= {sets_to_win}:',
+            '            return TOO_MANY_SETS',
+        ]
+    lines += [
+        f'        if won == {sets_to_win} or {count} - won == {sets_to_win}:',
+        '            return OK',
+        '        return TOO_FEW_SETS',
+    ]
+    return lines
+
+
+def _set_complete_condition(plan, position):
+    # rules.is_set_complete of the set at the position, games of the winner are
+    # at least the minimum and of the units differ, as they are checked before
+    games = plan.min_winner_games[position]
+    regular = f'winner == {games} and loser <= {games - 2}'
+    if plan.max_set_games[position] is None:
+        # the format has no tiebreak points for a set played on until a two games lead
+        return f'{regular} or winner - loser == 2'
+    tiebreak_at = plan.tiebreak_at
+    tiebreak = f'winner == {tiebreak_at + 1} and loser == {tiebreak_at}'
+    if tiebreak_at + 1 == games:
+        return f'{tiebreak} or t{position} is None and {regular}'
+    late = f'winner == {tiebreak_at + 1} and loser == {tiebreak_at - 1}'
+    return f'{tiebreak} or t{position} is None and ({regular} or {late})'
@@ -1,47 +1,267 @@
-import re
+import functools
 
-from tennis_match_lib.structs import SetScore
+from tennis_match_lib.structs import MatchOutcome, SetScore
 
 
 DEFAULT_SET_SEPARATOR = ' '
 DEFAULT_GAME_SEPARATOR = ':'
-TIEBREAK_SCORE_PATTERN = re.compile(r'([(]\d+[)])')
+
+# lowercase markers following the sets, e.g. '6:4 3:1 ret.'
+OUTCOME_MARKERS = {
+    'ret.': MatchOutcome.RETIRED,
+    'ret': MatchOutcome.RETIRED,
+    'retired': MatchOutcome.RETIRED,
+    'w/o': MatchOutcome.WALKOVER,
+    'wo': MatchOutcome.WALKOVER,
+    'walkover': MatchOutcome.WALKOVER,
+    'def.': MatchOutcome.DEFAULTED,
+    'def': MatchOutcome.DEFAULTED,
+    'default': MatchOutcome.DEFAULTED,
+    'unf.': MatchOutcome.IN_PROGRESS,
+    'unfinished': MatchOutcome.IN_PROGRESS,
+    'live': MatchOutcome.IN_PROGRESS,
+}
+
+_DIGITS = {str(digit): digit for digit in range(10)}
+_SET_ENDINGS = frozenset('0123456789)')
+_UNIT_ONE_GAMES, _UNIT_TWO_GAMES, _TIEBREAK, _SET_END = range(4)
 
 
 def reverse_score(
     score, set_separator=DEFAULT_SET_SEPARATOR, game_separator=DEFAULT_GAME_SEPARATOR
 ):
-    def _reverse(score):
-        a, b = score.split(game_separator)
-        return f'{b}{game_separator}{a}'
+    """Returns the score from the perspective of unit two, ``'6:4 7:6(5)'`` becomes
+    ``'4:6 6:7(5)'``.
+
+    Raises:
+        ValueError: If the score is not valid, see ``normalize_score``.
+    """
+    return normalize_score(score, set_separator, game_separator, reverse=True)
+
+
+def normalize_score(
+    score,
+    set_separator=DEFAULT_SET_SEPARATOR,
+    game_separator=DEFAULT_GAME_SEPARATOR,
+    target_set_separator=None,
+    target_game_separator=None,
+    reverse=False,
+):
+    """Converts the score into another format and optionally into the perspective of
+    unit two.
+
+    The score is checked and split into its numbers by a single compiled regular
+    expression for its number of sets, then formatted by a single ``str.format``
+    call. Leading zeros are dropped, so the result is canonical: equal sets give
+    equal strings.
+
+    Args:
+        score (str): Tennis match score.
+        set_separator (str): Set separator of the score.
+        game_separator (str): Game separator of the score.
+        target_set_separator (str): Set separator of the result, the same by default.
+        target_game_separator (str): Game separator of the result, the same by default.
+        reverse (bool): Swaps games of both units.
+
+    Returns:
+        str: Converted score.
+
+    Raises:
+        ValueError: If the score does not match ``games<sep>games[(tiebreak)]`` sets
+            separated by the set separator.
+        TypeError: If the score is not a string.
+    """
+    if not isinstance(score, str):
+        raise TypeError(f'Score must be a string, not {type(score).__name__}')
+    match, template = _normalizer(
+        set_separator,
+        game_separator,
+        set_separator if target_set_separator is None else target_set_separator,
+        game_separator if target_game_separator is None else target_game_separator,
+        reverse,
+        score.count(set_separator) + 1,
+    )
+    numbers = match(score)
+    if numbers is None:
+        raise ValueError(f'Invalid score {score!r}')
+    return template.format(*numbers.groups(''))
 
-    split = score.split(set_separator)
-    tiebreaks = []
-    for _set in split:
-        if '(' in _set:
-            tiebreaks.append(_set[3:])
-        else:
-            tiebreaks.append('')
-    tbless_score = TIEBREAK_SCORE_PATTERN.sub('', score).split(set_separator)
-    return set_separator.join([f'{_reverse(s)}{t}' for s, t in zip(tbless_score, tiebreaks)])
+
+def score_key(score, set_separator=DEFAULT_SET_SEPARATOR, game_separator=DEFAULT_GAME_SEPARATOR):
+    """Returns hashable key of the score, equal for the same sets in any format.
+
+    Args:
+        score (str): Tennis match score.
+        set_separator (str): Set separator.
+        game_separator (str): Game separator.
+
+    Returns:
+        str: Score in the default format without leading zeros.
+
+    Raises:
+        ValueError: If the score is not valid, see ``normalize_score``.
+    """
+    return normalize_score(
+        score, set_separator, game_separator, DEFAULT_SET_SEPARATOR, DEFAULT_GAME_SEPARATOR
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _normalizer(
+    set_separator, game_separator, target_set_separator, target_game_separator, reverse, sets
+):
+    import re  # pylint: disable=import-outside-toplevel
+
+    # every set has 5 groups: games of both units and parentheses around the tiebreak
+    set_pattern = rf'0*(\d+){re.escape(game_separator)}0*(\d+)(?:(\()0*(\d+)(\)))?'
+    pattern = re.compile(re.escape(set_separator).join([set_pattern] * sets), re.ASCII)
+    game_sep = target_game_separator.replace('{', '{{').replace('}', '}}')
+    set_templates = []
+    for i in range(0, 5 * sets, 5):
+        first, second = (i + 1, i) if reverse else (i, i + 1)
+        tiebreak = f'{{{i + 2}}}{{{i + 3}}}{{{i + 4}}}'
+        set_templates.append(f'{{{first}}}{game_sep}{{{second}}}{tiebreak}')
+    set_sep = target_set_separator.replace('{', '{{').replace('}', '}}')
+    return pattern.fullmatch, set_sep.join(set_templates)
 
 
 def parse_score(
     score, set_separator=DEFAULT_SET_SEPARATOR, game_separator=DEFAULT_GAME_SEPARATOR
 ):
-    sets = score.split(set_separator)
-    return [parse_set(s, game_separator) for s in sets]
+    """Parses the score into the list of sets in a single pass over its characters.
+
+    Args:
+        score (str): Tennis match score, e.g. ``'6:4 7:6(5)'``.
+        set_separator (str): Set separator.
+        game_separator (str): Game separator.
+
+    Returns:
+        list: List of ``SetScore``.
+
+    Raises:
+        ValueError: If the score does not match ``games<sep>games[(tiebreak)]`` sets
+            separated by the set separator.
+        TypeError: If the score is not a string.
+    """
+    if not isinstance(score, str):
+        raise TypeError(f'Score must be a string, not {type(score).__name__}')
+    sets = try_parse_score(score, set_separator, game_separator)
+    if sets is None:
+        raise ValueError(f'Invalid score {score!r}')
+    return sets
+
+
+def try_parse_score(
+    score, set_separator=DEFAULT_SET_SEPARATOR, game_separator=DEFAULT_GAME_SEPARATOR
+):
+    """Parses the score like ``parse_score``, but never raises.
+
+    Returns:
+        list: List of ``SetScore``, None if the score is not valid or not a string.
+    """
+    if not isinstance(score, str):
+        return None
+    sets = []
+    state = _UNIT_ONE_GAMES
+    value = -1
+    unit_one_games = unit_two_games = 0
+    digits = _DIGITS
+    for char in score:
+        digit = digits.get(char)
+        if digit is not None and state != _SET_END:
+            value = digit if value < 0 else value * 10 + digit
+        elif value < 0 and state != _SET_END:
+            return None
+        elif char == game_separator and state == _UNIT_ONE_GAMES:
+            unit_one_games = value
+            value = -1
+            state = _UNIT_TWO_GAMES
+        elif char == set_separator and state == _UNIT_TWO_GAMES:
+            sets.append(SetScore(unit_one_games, value))
+            value = -1
+            state = _UNIT_ONE_GAMES
+        elif char == '(' and state == _UNIT_TWO_GAMES:
+            unit_two_games = value
+            value = -1
+            state = _TIEBREAK
+        elif char == ')' and state == _TIEBREAK:
+            sets.append(SetScore(unit_one_games, unit_two_games, value))
+            value = -1
+            state = _SET_END
+        elif char == set_separator and state == _SET_END:
+            state = _UNIT_ONE_GAMES
+        else:
+            return None
+    if state == _UNIT_TWO_GAMES and value >= 0:
+        sets.append(SetScore(unit_one_games, value))
+    elif state != _SET_END:
+        return None
+    return sets
+
+
+def split_outcome(score, set_separator=DEFAULT_SET_SEPARATOR):
+    """Splits the outcome marker off the score.
+
+    Scores ending with a digit or a tiebreak have no marker, so for them this is a
+    single check of the last character.
+
+    Args:
+        score (str): Tennis match score, e.g. ``'6:4 3:1 ret.'``.
+        set_separator (str): Set separator.
+
+    Returns:
+        tuple: Score without the marker and ``MatchOutcome`` of the marker, the
+        score itself and None if it has no known marker.
+    """
+    if not score or not isinstance(score, str) or score[-1] in _SET_ENDINGS:
+        return score, None
+    sets, _, marker = score.rpartition(set_separator)
+    outcome = OUTCOME_MARKERS.get(marker.lower())
+    if outcome is None:
+        return score, None
+    return sets, outcome
+
+
+def parse_match(
+    score, set_separator=DEFAULT_SET_SEPARATOR, game_separator=DEFAULT_GAME_SEPARATOR
+):
+    """Parses the score which may end with an outcome marker, see ``OUTCOME_MARKERS``.
+
+    A marker may follow an empty score, e.g. ``'w/o'``.
+
+    Returns:
+        tuple: List of ``SetScore`` and ``MatchOutcome`` of the marker, None if the
+        score has no marker.
+
+    Raises:
+        ValueError: If the score without the marker is not valid, see ``parse_score``.
+        TypeError: If the score is not a string.
+    """
+    sets, outcome = split_outcome(score, set_separator)
+    if outcome is not None and not sets:
+        return [], outcome
+    return parse_score(sets, set_separator, game_separator), outcome
+
+
+def try_parse_match(
+    score, set_separator=DEFAULT_SET_SEPARATOR, game_separator=DEFAULT_GAME_SEPARATOR
+):
+    """Parses the score like ``parse_match``, but never raises.
+
+    Returns:
+        tuple: List of ``SetScore``, None if the score is not valid, and
+        ``MatchOutcome`` of the marker, None if the score has no marker.
+    """
+    sets, outcome = split_outcome(score, set_separator)
+    if outcome is not None and not sets:
+        return [], outcome
+    return try_parse_score(sets, set_separator, game_separator), outcome
 
 
 def parse_set(
     set_score, set_separator=DEFAULT_SET_SEPARATOR, game_separator=DEFAULT_GAME_SEPARATOR
 ):
-    tb_score = None
-    score = set_score
-    if TIEBREAK_SCORE_PATTERN.search(set_score):
-        tb_score = int(set_score[4:-1])
-        score = TIEBREAK_SCORE_PATTERN.sub('', set_score)
-    unit_one_games, unit_two_games = [int(game) for game in score.split(game_separator)]
-    return SetScore(
-        unit_one_games=unit_one_games, unit_two_games=unit_two_games, tiebreak=tb_score
-    )
+    sets = parse_score(set_score, set_separator, game_separator)
+    if len(sets) != 1:
+        raise ValueError(f'Expected single set score: {set_score!r}')
+    return sets[0]
@@ -1,4 +1,15 @@
-import re
+_PATTERNS = {
+    'TIEBREAK_SCORE_PATTERN': r'([(]\d+[)])',
+}
 
 
-TIEBREAK_SCORE_PATTERN = re.compile(r'([(]\d+[)])')
+def __getattr__(name):
+    # patterns are compiled on first access to keep them out of the import time
+    try:
+        pattern = _PATTERNS[name]
+    except KeyError:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}') from None
+    import re  # pylint: disable=import-outside-toplevel
+
+    compiled = globals()[name] = re.compile(pattern)
+    return compiled
@@ -1,6 +1,74 @@
+import enum
+from collections import namedtuple
+
+
 class TiebreakValueError(Exception):
     pass
 
 
 class GameValueError(Exception):
     pass
+
+
+class ErrorCode(enum.IntEnum):
+
+    NONE = 0
+    INVALID_FORMAT = 1
+    TOO_MANY_SETS = 2
+    TOO_FEW_SETS = 3
+    UNPARSABLE_SCORE = 4
+    TOO_MANY_WON_SETS = 5
+    GAMES_TOO_SMALL = 6
+    GAMES_EQUAL = 7
+    GAMES_TOO_LARGE = 8
+    SET_INCOMPLETE = 9
+    MATCH_ALREADY_DECIDED = 10
+
+
+ERROR_MESSAGES = {
+    ErrorCode.INVALID_FORMAT: 'Score has invalid format',
+    ErrorCode.TOO_MANY_SETS: 'Number of sets is too large',
+    ErrorCode.TOO_FEW_SETS: 'Number of sets is too small',
+    ErrorCode.UNPARSABLE_SCORE: 'Unable to parse the score',
+    ErrorCode.TOO_MANY_WON_SETS: 'Number of won sets is too large',
+    ErrorCode.GAMES_TOO_SMALL: 'Set {set_index} has invalid number of games: value is too small',
+    ErrorCode.GAMES_EQUAL: 'Set {set_index} has invalid number of games: games cannot be equal',
+    ErrorCode.GAMES_TOO_LARGE: 'Set {set_index} has invalid number of games: value is too large',
+    ErrorCode.SET_INCOMPLETE: 'Set {set_index} has invalid number of games: set is not complete',
+    ErrorCode.MATCH_ALREADY_DECIDED: 'Match was already decided before its outcome marker',
+}
+
+
+def error_message(code, set_index=0):
+    """Renders human readable message for the given error code.
+
+    Args:
+        code (ErrorCode): Error code.
+        set_index (int): 1-based index of the offending set, 0 if not set specific.
+
+    Returns:
+        str: Error message.
+    """
+    return ERROR_MESSAGES[code].format(set_index=set_index)
+
+
+class ScoreError(namedtuple('ScoreError', ['code', 'set_index', 'value'], defaults=(0, None))):
+    """Error of a score, its message is rendered only when it is asked for.
+
+    Errors compare and hash as tuples of their fields, use ``message`` to check
+    them against message strings.
+
+    Attributes:
+        code (ErrorCode): Error code.
+        set_index (int): 1-based index of the offending set, 0 if not set specific.
+        value: Offending value, e.g. the score or the ``SetScore``, None if unknown.
+    """
+
+    __slots__ = ()
+
+    @property
+    def message(self):
+        return error_message(self.code, self.set_index)
+
+    def __str__(self):
+        return self.message
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""Instrumentation module provides collectors of validation stage metrics.
+
+A collector is passed to ``Validator(..., collector=collector)`` and is notified
+after every stage of ``Validator.validate`` with the time the stage took and the
+error code it rejected the score with. Validators without a collector run the
+plain validation chain.
+"""
+
+import abc
+from collections import Counter, namedtuple
+import threading
+
+from tennis_match_lib.errors import ErrorCode
+
+
+STAGES = (
+    'outcome',
+    'regexp',
+    'number_of_sets',
+    'parse_score',
+    'number_of_won_sets',
+    'games_too_small',
+    'games_equality',
+    'set_complete',
+    'match_decided',
+)
+
+StageStats = namedtuple('StageStats', ['calls', 'seconds', 'rejections'])
+StageStats.__doc__ = """Metrics of a validation stage.
+
+Attributes:
+    calls (int): Number of scores checked by the stage.
+    seconds (float): Cumulative time of the stage.
+    rejections (int): Number of scores rejected by the stage.
+"""
+
+
+class Collector(abc.ABC):
+    """Interface of validation metrics collectors."""
+
+    @abc.abstractmethod
+    def observe(self, stage, seconds, error_code):
+        """Records a stage call.
+
+        Args:
+            stage (str): Stage name, one of ``STAGES``.
+            seconds (float): Time the stage took.
+            error_code (tennis_match_lib.errors.ErrorCode): Error the score was
+                rejected with, ``ErrorCode.NONE`` if the score passed the stage.
+        """
+
+
+class InMemoryCollector(Collector):
+    """Thread-safe collector keeping counters in memory."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = Counter()
+        self._seconds = Counter()
+        self._rejections = Counter()
+        self._failures = Counter()
+
+    def observe(self, stage, seconds, error_code):
+        with self._lock:
+            self._calls[stage] += 1
+            self._seconds[stage] += seconds
+            if error_code:
+                self._rejections[stage] += 1
+                self._failures[error_code] += 1
+
+    def stages(self):
+        """Returns ``StageStats`` of every stage called at least once, in stage order."""
+        with self._lock:
+            return {
+                stage: StageStats(
+                    self._calls[stage], self._seconds[stage], self._rejections[stage]
+                )
+                for stage in STAGES
+                if stage in self._calls
+            }
+
+    def failures(self):
+        """Returns histogram of failure reasons: ``{ErrorCode: count}``."""
+        with self._lock:
+            return dict(self._failures)
+
+    def reset(self):
+        with self._lock:
+            self._calls.clear()
+            self._seconds.clear()
+            self._rejections.clear()
+            self._failures.clear()
+
+
+def to_prometheus_text(collector, namespace='tennis_match_validator'):
+    """Renders metrics of the collector in Prometheus text exposition format.
+
+    Args:
+        collector (InMemoryCollector): Collector.
+        namespace (str): Prefix of the metric names.
+
+    Returns:
+        str: Metrics.
+    """
+    stages = collector.stages()
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f'# HELP {namespace}_{name} {help_text}')
+        lines.append(f'# TYPE {namespace}_{name} {kind}')
+        for labels, value in samples:
+            lines.append(f'{namespace}_{name}{{{labels}}} {value}')
+
+    metric(
+        'stage_calls_total',
+        'counter',
+        'Number of scores checked by the validation stage.',
+        [(f'stage="{stage}"', stats.calls) for stage, stats in stages.items()],
+    )
+    metric(
+        'stage_seconds_total',
+        'counter',
+        'Cumulative time of the validation stage in seconds.',
+        [(f'stage="{stage}"', repr(stats.seconds)) for stage, stats in stages.items()],
+    )
+    metric(
+        'stage_rejections_total',
+        'counter',
+        'Number of scores rejected by the validation stage.',
+        [(f'stage="{stage}"', stats.rejections) for stage, stats in stages.items()],
+    )
+    failures = collector.failures()
+    metric(
+        'failures_total',
+        'counter',
+        'Number of invalid scores by failure reason.',
+        [
+            (f'reason="{ErrorCode(code).name.lower()}"', failures[code])
+            for code in sorted(failures)
+        ],
+    )
+    return '\n'.join(lines) + '\n'
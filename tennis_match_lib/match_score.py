@@ -1,47 +1,83 @@
-from collections import OrderedDict
-from dataclasses import dataclass
+# -*- coding: utf-8 -*-
+"""Match score module provides incremental live scoring of a tennis match.
 
-from rules import MatchRules
-from score_format import ScoreFormat
+``TennisMatchScore`` is a state machine driven by point, game, tiebreak and set
+events. Every event updates sets, winner and stats counters in constant time, and
+the score string is rendered only when it is read after a change.
+"""
 
+import enum
 
-class TennisMatchScore2:
+from tennis_match_lib import common
+from tennis_match_lib.errors import GameValueError
+from tennis_match_lib.rules import MatchRules
+from tennis_match_lib.score_format import ScoreFormat
+from tennis_match_lib.structs import BasicMatchStatsInfo, MatchOutcome, SetScore
 
-    # general given
-    unit_one: any
-    unit_two: any
-    score: str
 
-    # general calculated
-    winner: any
-    loser: any
+GAME_POINTS_TO_WIN = 4
 
-    # additional given
-    duration: any
-    datetime: any
-    court_name: any
 
-    # score calculated/parsed
-    sets: NSetsMatchScore
+class Unit(enum.IntEnum):
 
-    # stats info calculated
-    stats_info: TennisMatchBasicStatsInfo
+    ONE = 1
+    TWO = 2
 
-    # aux stats info
 
-    # match rules given: needed only for validation
-    rules: MatchRules
-
-    # score format given: needed only for parsing
-    score_format: ScoreFormat
+_REGULAR_SET, _ADVANTAGE_SET, _TIEBREAK_SET = range(3)
+_OUTCOME_MARKERS = {
+    MatchOutcome.RETIRED: 'ret.',
+    MatchOutcome.WALKOVER: 'w/o',
+    MatchOutcome.DEFAULTED: 'def.',
+}
 
 
 class TennisMatchScore:
+    """Live score of a tennis match.
+
+    Args:
+        unit_one: Player or team one.
+        unit_two: Player or team two.
+        score (str): Score to start from, e.g. ``'6:4 3:2'``; the last set may be in
+            progress. A score ending with a retirement, walkover or default marker,
+            e.g. ``'6:4 3:2 ret.'``, is the win of unit one, as feeds list the
+            winner first. The match starts from scratch if omitted.
+        rules (tennis_match_lib.rules.MatchRules): Match rules.
+        score_format (tennis_match_lib.score_format.ScoreFormat): Score format.
+        duration: Match duration.
+        datetime: Match start.
+        court_name (str): Court name.
+
+    Raises:
+        GameValueError: If the score can't be reached under the rules.
+    """
+
+    __slots__ = (
+        'unit_one',
+        'unit_two',
+        'rules',
+        'score_format',
+        'duration',
+        'datetime',
+        'court_name',
+        '_plan',
+        '_completed',
+        '_games',
+        '_points',
+        '_in_tiebreak',
+        '_set_kind',
+        '_sets_won',
+        '_games_diff',
+        '_winner',
+        '_outcome',
+        '_score',
+    )
+
     def __init__(
         self,
         unit_one,
         unit_two,
-        score,
+        score=None,
         rules=MatchRules.pro_tour(),
         score_format=ScoreFormat.default(),
         duration=None,
@@ -50,23 +86,325 @@ class TennisMatchScore:
     ):
         self.unit_one = unit_one
         self.unit_two = unit_two
-        self.score = score
         self.rules = rules
         self.score_format = score_format
         self.duration = duration
         self.datetime = datetime
         self.court_name = court_name
-        self.sets = None  # TODO
-        self.stats_info = None  # TODO
+        self._plan = rules.compile()
+        self._completed = []
+        self._games = [0, 0]
+        self._points = [0, 0]
+        self._in_tiebreak = False
+        self._set_kind = self._kind_of_set(0)
+        self._sets_won = [0, 0]
+        self._games_diff = 0
+        self._winner = None
+        self._outcome = MatchOutcome.COMPLETED
+        self._score = ''
+        if score:
+            self._seed(score)
+
+    def point_won(self, unit):
+        """Adds a point won by the unit to the current game, tiebreak or tiebreak set.
+
+        Args:
+            unit (Unit): Unit which won the point.
+
+        Raises:
+            ValueError: If the match is over or the unit is unknown.
+        """
+        i = self._unit_index(unit)
+        points = self._points
+        points[i] += 1
+        won, lost = points[i], points[1 - i]
+        if self._set_kind == _TIEBREAK_SET:
+            self._games[i] += 1
+            self._score = None
+            if won >= self._plan.min_winner_games[len(self._completed)] and won - lost >= 2:
+                self._games_diff += 1 if i == 0 else -1
+                self._finish_set(i, None)
+        elif self._in_tiebreak:
+            points_to_win = self._plan.tiebreak_points_to_win
+            # a no-ad tiebreak is decided by a single point when both are one point short
+            if won >= points_to_win and (won - lost >= 2 or self._plan.no_ad):
+                self._win_tiebreak(i, lost)
+        elif self._plan.no_ad:
+            if won >= GAME_POINTS_TO_WIN:
+                self._win_game(i)
+        elif won >= GAME_POINTS_TO_WIN and won - lost >= 2:
+            self._win_game(i)
+        elif won == lost > GAME_POINTS_TO_WIN - 1:
+            # deuce is deuce however long the game lasts
+            points[0] = points[1] = GAME_POINTS_TO_WIN - 1
+
+    def game_won(self, unit):
+        """Adds a game won by the unit to the current set.
+
+        A game won during a tiebreak is the tiebreak won, without its points.
+
+        Args:
+            unit (Unit): Unit which won the game.
+
+        Raises:
+            ValueError: If the match is over, the unit is unknown or the deciding
+                tiebreak set is played, which has no games.
+        """
+        i = self._unit_index(unit)
+        if self._set_kind == _TIEBREAK_SET:
+            raise ValueError('Deciding tiebreak set is played to points, not games')
+        if self._in_tiebreak:
+            self._win_tiebreak(i, None)
+        else:
+            self._win_game(i)
+
+    def tiebreak_won(self, unit, loser_points):
+        """Adds the tiebreak or the deciding tiebreak set won by the unit.
+
+        Args:
+            unit (Unit): Unit which won the tiebreak.
+            loser_points (int): Points of the unit which lost the tiebreak.
+
+        Raises:
+            ValueError: If no tiebreak is played, the match is over or the unit is
+                unknown.
+        """
+        i = self._unit_index(unit)
+        if self._set_kind == _TIEBREAK_SET:
+            games = self._games
+            games[i] = max(self._plan.min_winner_games[len(self._completed)], loser_points + 2)
+            games[1 - i] = loser_points
+            self._games_diff += 1 if i == 0 else -1
+            self._finish_set(i, None)
+        elif self._in_tiebreak:
+            self._win_tiebreak(i, loser_points)
+        else:
+            raise ValueError(f'No tiebreak is played at {self._games[0]}:{self._games[1]}')
+
+    def add_set(self, set_score):
+        """Adds a complete set, e.g. when only set results are reported.
+
+        Args:
+            set_score (tennis_match_lib.structs.SetScore): Set score.
+
+        Raises:
+            GameValueError: If the current set is already started or the set score
+                is not a complete set under the rules.
+        """
+        if self._games != [0, 0] or self._points != [0, 0]:
+            raise GameValueError(f'Set is in progress: {self.score}')
+        position = len(self._completed)
+        self._replay_set(set_score)
+        if len(self._completed) == position:
+            raise GameValueError(f'Set is not complete: {self._format_set(set_score)}')
+
+    def retired(self, unit):
+        """Ends the match by the retirement of the unit, the other unit wins.
+
+        Raises:
+            ValueError: If the match is over or the unit is unknown.
+        """
+        self._end(unit, MatchOutcome.RETIRED)
+
+    def defaulted(self, unit):
+        """Ends the match by the default of the unit, the other unit wins.
+
+        Raises:
+            ValueError: If the match is over or the unit is unknown.
+        """
+        self._end(unit, MatchOutcome.DEFAULTED)
 
-    def _validate(self):
-        pass
+    def walkover(self, unit):
+        """Gives the match to the other unit before it started.
+
+        Raises:
+            ValueError: If the match is started or over, or the unit is unknown.
+        """
+        if self._completed or self._games != [0, 0] or self._points != [0, 0]:
+            raise ValueError(f'Match is already started: {self.score}')
+        self._end(unit, MatchOutcome.WALKOVER)
+
+    @property
+    def score(self):
+        """str: Current score, the set in progress and the outcome marker included."""
+        if self._score is None:
+            sets = [self._format_set(s) for s in self.sets]
+            if self._outcome in _OUTCOME_MARKERS:
+                sets.append(_OUTCOME_MARKERS[self._outcome])
+            self._score = self.score_format.set_sep.join(sets)
+        return self._score
+
+    @property
+    def outcome(self):
+        """tennis_match_lib.structs.MatchOutcome: Outcome, ``IN_PROGRESS`` until the
+        match is over."""
+        if self._winner is None:
+            return MatchOutcome.IN_PROGRESS
+        return self._outcome
+
+    @property
+    def sets(self):
+        """list: ``SetScore`` of every complete set and of the set in progress or
+        the set the match ended in."""
+        if self._games == [0, 0]:
+            return list(self._completed)
+        return self._completed + [SetScore(self._games[0], self._games[1])]
+
+    @property
+    def points(self):
+        """tuple: Points of both units in the current game or tiebreak."""
+        return tuple(self._points)
+
+    @property
+    def in_tiebreak(self):
+        """bool: True while a tiebreak or the deciding tiebreak set is played."""
+        return self._in_tiebreak or self._set_kind == _TIEBREAK_SET
+
+    @property
+    def stats_info(self):
+        """tennis_match_lib.structs.BasicMatchStatsInfo: Stats of the current score.
+
+        Only complete sets count as won, games of the set in progress are counted.
+        """
+        sets_diff = self._sets_won[0] - self._sets_won[1]
+        return BasicMatchStatsInfo(
+            unit_one_sets_diff=sets_diff,
+            unit_two_sets_diff=-sets_diff,
+            unit_one_games_diff=self._games_diff,
+            unit_two_games_diff=-self._games_diff,
+        )
+
+    @property
+    def winner(self):
+        """Unit which won the match, None while the match is not over."""
+        if self._winner is None:
+            return None
+        return self.unit_one if self._winner == 0 else self.unit_two
+
+    @property
+    def loser(self):
+        """Unit which lost the match, None while the match is not over."""
+        if self._winner is None:
+            return None
+        return self.unit_two if self._winner == 0 else self.unit_one
+
+    def is_finished(self):
+        return self._winner is not None
 
     def is_unit_one_winner(self):
-        pass
+        return self._winner == 0
 
     def is_unit_two_winner(self):
-        pass
+        return self._winner == 1
+
+    def __repr__(self):
+        return (
+            f'TennisMatchScore(unit_one={self.unit_one!r}, unit_two={self.unit_two!r}, '
+            f'score={self.score!r})'
+        )
+
+    def _unit_index(self, unit):
+        if self._winner is not None:
+            raise ValueError(f'Match is over: {self.score}')
+        if unit == Unit.ONE:
+            return 0
+        if unit == Unit.TWO:
+            return 1
+        raise ValueError(f'Invalid unit: {unit}')
+
+    def _end(self, unit, outcome):
+        i = self._unit_index(unit)
+        self._winner = 1 - i
+        self._outcome = outcome
+        self._in_tiebreak = False
+        self._score = None
+
+    def _kind_of_set(self, position):
+        plan = self._plan
+        if position == plan.tiebreak_set_position:
+            return _TIEBREAK_SET
+        if position < plan.sets and plan.max_set_games[position] is None:
+            return _ADVANTAGE_SET
+        return _REGULAR_SET
+
+    def _win_game(self, i):
+        games = self._games
+        games[i] += 1
+        self._points[0] = self._points[1] = 0
+        self._games_diff += 1 if i == 0 else -1
+        self._score = None
+        won, lost = games[i], games[1 - i]
+        if won >= self._plan.games and won - lost >= 2:
+            self._finish_set(i, None)
+        elif self._set_kind == _REGULAR_SET and won == lost == self._plan.tiebreak_at:
+            self._in_tiebreak = True
+
+    def _win_tiebreak(self, i, loser_points):
+        self._games[i] += 1
+        self._games_diff += 1 if i == 0 else -1
+        self._finish_set(i, loser_points)
+
+    def _finish_set(self, i, tiebreak):
+        self._completed.append(SetScore(self._games[0], self._games[1], tiebreak))
+        self._games = [0, 0]
+        self._points = [0, 0]
+        self._in_tiebreak = False
+        self._set_kind = self._kind_of_set(len(self._completed))
+        self._score = None
+        self._sets_won[i] += 1
+        if self._sets_won[i] == self._plan.sets_to_win:
+            self._winner = i
+
+    def _format_set(self, s):
+        game_sep = self.score_format.game_sep
+        tiebreak = '' if s.tiebreak is None else f'({s.tiebreak})'
+        return f'{s.unit_one_games}{game_sep}{s.unit_two_games}{tiebreak}'
+
+    def _seed(self, score):
+        try:
+            sets, outcome = common.parse_match(
+                score, self.score_format.set_sep, self.score_format.game_sep
+            )
+        except (TypeError, ValueError) as ex:
+            raise GameValueError(f'Invalid game value: {score}: {ex}') from ex
+        for position, set_score in enumerate(sets):
+            self._replay_set(set_score)
+            if len(self._completed) == position and position < len(sets) - 1:
+                raise GameValueError(f'Set {position + 1} is not complete: {score}')
+        if outcome in _OUTCOME_MARKERS:
+            try:
+                _END_BY_OUTCOME[outcome](self, Unit.TWO)
+            except ValueError as ex:
+                raise GameValueError(f'Invalid outcome: {score}: {ex}') from ex
+
+    def _replay_set(self, set_score):
+        # plays the games in an order reaching the set score, so the rules are
+        # checked by the state machine itself
+        position = len(self._completed)
+        one, two = set_score.unit_one_games, set_score.unit_two_games
+        winner = Unit.ONE if one > two else Unit.TWO
+        event = self.point_won if self._set_kind == _TIEBREAK_SET else self.game_won
+        try:
+            for _ in range(min(one, two)):
+                event(Unit.ONE)
+                event(Unit.TWO)
+            for _ in range(abs(one - two)):
+                if set_score.tiebreak is not None and self._in_tiebreak:
+                    self.tiebreak_won(winner, set_score.tiebreak)
+                else:
+                    event(winner)
+        except ValueError as ex:
+            raise GameValueError(f'Invalid set score: {self._format_set(set_score)}') from ex
+        if len(self._completed) > position:
+            replayed = self._completed[position]
+        else:
+            replayed = SetScore(self._games[0], self._games[1])
+        if len(self._completed) > position + 1 or replayed != set_score:
+            raise GameValueError(f'Invalid set score: {self._format_set(set_score)}')
 
 
-# TODO: case when someone get retired, or walkover
+_END_BY_OUTCOME = {
+    MatchOutcome.RETIRED: TennisMatchScore.retired,
+    MatchOutcome.WALKOVER: TennisMatchScore.walkover,
+    MatchOutcome.DEFAULTED: TennisMatchScore.defaulted,
+}
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""Parallel module provides process pool based batch parsing of tennis match scores.
+
+Worker processes parse chunks of raw scores and send back compact packed records
+instead of pickled ``ParseResult`` objects: every record takes a few bytes per set,
+and results are decoded lazily only for the rows which are accessed.
+"""
+
+from array import array
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import itertools
+import os
+import struct
+import time
+
+from tennis_match_lib.errors import GameValueError, ScoreError
+from tennis_match_lib.parser import Parser, ParseResult
+from tennis_match_lib.score_table import ScoreTable, TableParser
+from tennis_match_lib.structs import BasicMatchStatsInfo, MatchOutcome, PackedMatch
+
+
+DEFAULT_CHUNKSIZE = 2000
+
+# outcome, unit one sets diff and unit one games diff followed by the packed sets
+_RECORD_HEADER = struct.Struct('<Bbh')
+
+_worker_state = {}
+
+
+def parse_parallel(
+    scores, score_format, rules, workers=None, chunksize=DEFAULT_CHUNKSIZE, table_path=None
+):
+    """Parses scores in worker processes.
+
+    Scores which can't be parsed do not abort the batch: their rows hold
+    ``GameValueError`` instead of ``ParseResult``. Workers share the score table,
+    if given, and parse only the scores which are not in it.
+
+    Args:
+        scores (iterable): Tennis match scores.
+        score_format (tennis_match_lib.score_format.ScoreFormat): Score format.
+        rules (tennis_match_lib.rules.MatchRules): Match rules.
+        workers (int): Number of worker processes, number of CPUs if omitted.
+            Scores are parsed in the current process if it is 1.
+        chunksize (int): Number of scores sent to a worker at once.
+        table_path (str): Path of a score table file built for the rules, see
+            ``tennis_match_lib.score_table.write_table``.
+
+    Returns:
+        ParallelParseResults: Parse results in the order of the scores.
+    """
+    workers = workers or os.cpu_count() or 1
+    results = ParallelParseResults()
+    chunks = chunked(scores, chunksize)
+    for chunk_result, _ in imap_ordered(
+        _parse_chunk, chunks, workers, _init_worker, (score_format, rules, table_path)
+    ):
+        results.add_chunk(*chunk_result)
+    return results
+
+
+class ParallelParseResults:
+    """Lazily decoded sequence of parse results.
+
+    Every item is either ``ParseResult`` (its sets are ``PackedMatch``) or
+    ``GameValueError`` for a score which failed to parse.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._chunk_starts = []
+        self._errors = {}
+        self._length = 0
+
+    def add_chunk(self, blob, offsets, errors):
+        """Appends packed results of a chunk as returned by a worker."""
+        offsets = array('I', offsets)
+        for row, message in errors:
+            self._errors[self._length + row] = message
+        self._chunk_starts.append(self._length)
+        self._chunks.append((blob, offsets))
+        self._length += len(offsets) - 1
+
+    @property
+    def errors(self):
+        """dict: Error message of every failed row by its index."""
+        return self._errors
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('result index out of range')
+        if index in self._errors:
+            return GameValueError(self._errors[index])
+        chunk_index = bisect_right(self._chunk_starts, index) - 1
+        blob, offsets = self._chunks[chunk_index]
+        row = index - self._chunk_starts[chunk_index]
+        return _decode(blob, offsets[row], offsets[row + 1])
+
+    def __iter__(self):
+        for index in range(self._length):
+            yield self[index]
+
+
+def chunked(items, chunksize):
+    """Splits the iterable into lists of at most ``chunksize`` items."""
+    if chunksize < 1:
+        raise ValueError(f'Invalid chunk size: {chunksize}')
+    items = iter(items)
+    while True:
+        chunk = list(itertools.islice(items, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def imap_ordered(function, chunks, workers, initializer=None, initargs=()):
+    """Applies the function to every chunk in worker processes keeping the order.
+
+    At most two chunks per worker are in flight, so chunks are consumed lazily
+    and memory usage does not depend on the total number of chunks.
+
+    Args:
+        function (callable): Picklable function applied to every chunk.
+        chunks (iterable): Chunks.
+        workers (int): Number of worker processes, the function is called in the
+            current process if it is 1.
+        initializer (callable): Called once in every worker with ``initargs``.
+        initargs (tuple): Initializer arguments.
+
+    Yields:
+        tuple: Function result and chunk latency in seconds.
+    """
+    if workers < 1:
+        raise ValueError(f'Invalid number of workers: {workers}')
+    if workers == 1:
+        if initializer is not None:
+            initializer(*initargs)
+        for chunk in chunks:
+            started = time.perf_counter()
+            result = function(chunk)
+            yield result, time.perf_counter() - started
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=initializer, initargs=initargs
+    ) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append((executor.submit(function, chunk), time.perf_counter()))
+            if len(pending) >= 2 * workers:
+                yield _pop_result(pending)
+        while pending:
+            yield _pop_result(pending)
+
+
+def _pop_result(pending):
+    future, submitted = pending.popleft()
+    result = future.result()
+    return result, time.perf_counter() - submitted
+
+
+def _init_worker(score_format, rules, table_path=None):
+    if table_path is None:
+        _worker_state['parser'] = Parser(score_format, rules)
+        return
+    # the table stays mapped for the lifetime of the worker
+    table = ScoreTable.open(table_path)
+    _worker_state['parser'] = TableParser(score_format, rules, table)
+
+
+def _parse_chunk(scores):
+    parser = _worker_state['parser']
+    blob = bytearray()
+    offsets = array('I', [0])
+    errors = []
+    for row, score in enumerate(scores):
+        parse_result = parser.try_parse(score)
+        if isinstance(parse_result, ScoreError):
+            errors.append((row, f'Invalid game value: {score}: {parse_result.message}'))
+        else:
+            sets, stats_info, outcome = parse_result
+            try:
+                header = _RECORD_HEADER.pack(
+                    outcome,
+                    stats_info.unit_one_sets_diff,
+                    stats_info.unit_one_games_diff,
+                )
+                packed = PackedMatch.from_sets(sets).tobytes()
+            except (OverflowError, struct.error):
+                # values out of range of the packed record fail only this row
+                errors.append((row, f'Game value out of range: {score}'))
+            else:
+                blob += header
+                blob += packed
+        offsets.append(len(blob))
+    return bytes(blob), offsets.tobytes(), errors
+
+
+def _decode(blob, start, end):
+    outcome, sets_diff, games_diff = _RECORD_HEADER.unpack_from(blob, start)
+    sets = PackedMatch(blob[start + _RECORD_HEADER.size : end])
+    stats_info = BasicMatchStatsInfo(
+        unit_one_sets_diff=sets_diff,
+        unit_two_sets_diff=-sets_diff,
+        unit_one_games_diff=games_diff,
+        unit_two_games_diff=-games_diff,
+    )
+    return ParseResult(sets=sets, stats_info=stats_info, outcome=MatchOutcome(outcome))
@@ -7,13 +7,22 @@
 from collections import namedtuple
 
 from tennis_match_lib import common
-from tennis_match_lib.constants import TIEBREAK_SCORE_PATTERN
-from tennis_match_lib.errors import GameValueError
-from tennis_match_lib.rules import LastSet
-from tennis_match_lib.structs import BasicMatchStatsInfo, SetScore
+from tennis_match_lib.errors import ErrorCode, GameValueError, ScoreError
+from tennis_match_lib.rules import is_set_complete
+from tennis_match_lib.structs import BasicMatchStatsInfo, MatchOutcome, SetScore
 
 
-ParseResult = namedtuple('ParseResult', ['sets', 'stats_info'])
+ParseResult = namedtuple(
+    'ParseResult', ['sets', 'stats_info', 'outcome'], defaults=(MatchOutcome.COMPLETED,)
+)
+ParseResult.__doc__ = """Parsed sets, stats info and outcome of a score.
+
+Attributes:
+    sets (list): ``SetScore`` of every set.
+    stats_info (tennis_match_lib.structs.BasicMatchStatsInfo): Sets and games diffs.
+    outcome (tennis_match_lib.structs.MatchOutcome): How the match ended,
+        ``COMPLETED`` if omitted.
+"""
 
 
 class Parser:
@@ -27,26 +36,67 @@ class Parser:
     def __init__(self, score_format, rules):
         self.score_format = score_format
         self.rules = rules
+        self.plan = rules.compile()
 
     def parse(self, score):
-        """Returns parsed sets and stats info for the given score.
+        """Returns parsed sets, stats info and outcome for the given score.
+
+        The score may end with an outcome marker, e.g. ``'6:4 3:1 ret.'``, see
+        ``common.OUTCOME_MARKERS``. A score without a marker is completed if a unit
+        has won the match, otherwise it is in progress. An unfinished last set is
+        not counted in the sets diff, its games are counted in the games diff.
 
         Args:
             score (str): Tennis match score.
 
         Returns:
-            namedtuple: Parse result with sets and stats info.
+            ParseResult: Parse result with sets, stats info and outcome.
+
+        Raises:
+            GameValueError: If the score can't be parsed.
         """
-        try:
-            sets = common.parse_score(score)
-        except (TypeError, ValueError) as ex:
-            raise GameValueError(f'Invalid game value: {score}: {ex}') from ex
-        stats_info = self._calculate_stats_info(sets)
-        parse_result = ParseResult(sets=sets, stats_info=stats_info)
+        parse_result = self.try_parse(score)
+        if isinstance(parse_result, ScoreError):
+            raise GameValueError(f'Invalid game value: {score}: {parse_result.message}')
         return parse_result
 
-    def _calculate_stats_info(self, sets):
-        unit_one_sets, unit_two_sets = self._calculate_sets_count(sets)
+    def try_parse(self, score):
+        """Parses the score like ``parse``, but returns the error instead of raising it.
+
+        Bulk callers should use it, so that invalid scores cost neither exceptions
+        nor error messages.
+
+        Args:
+            score (str): Tennis match score.
+
+        Returns:
+            ParseResult | ScoreError: Parse result, or ``UNPARSABLE_SCORE`` error with
+            the score as its value.
+        """
+        sets, outcome = common.try_parse_match(
+            score, self.score_format.set_sep, self.score_format.game_sep
+        )
+        if sets is None:
+            return ScoreError(ErrorCode.UNPARSABLE_SCORE, 0, score)
+        sets_count = self._calculate_sets_count(self._finished_sets(sets))
+        stats_info = self._calculate_stats_info(sets, sets_count)
+        if outcome is None:
+            if max(sets_count) >= self.plan.sets_to_win:
+                outcome = MatchOutcome.COMPLETED
+            else:
+                outcome = MatchOutcome.IN_PROGRESS
+        return ParseResult(sets=sets, stats_info=stats_info, outcome=outcome)
+
+    def _finished_sets(self, sets):
+        # sets followed by another one are over, so only the last one is checked
+        if sets and not is_set_complete(self.plan, len(sets) - 1, sets[-1]):
+            return sets[:-1]
+        return sets
+
+    def _calculate_stats_info(self, sets, sets_count=None):
+        if sets_count is None:
+            sets_count = self._calculate_sets_count(self._finished_sets(sets))
+        unit_one_sets, unit_two_sets = sets_count
         unit_one_games_diff, unit_two_games_diff = self._calculate_games_count(sets)
         return BasicMatchStatsInfo(
             unit_one_sets_diff=(unit_one_sets - unit_two_sets),
@@ -63,7 +113,7 @@ class Parser:
         return unit_one_sets, unit_two_sets
 
     def _calculate_games_count(self, sets):
-        if len(sets) == self.rules.sets and self.rules.last_set == LastSet.TIEBREAK_SET:
+        if len(sets) == self.plan.sets and self.plan.tiebreak_set_position >= 0:
             return self._get_games_diff_when_last_tiebreak_set(sets)
         unit_one_games_diff = self._get_games_diff(sets)
         return unit_one_games_diff, unit_one_games_diff * (-1)
@@ -1,4 +1,8 @@
+from collections import namedtuple
 import enum
+import functools
+
+from tennis_match_lib.errors import ErrorCode
 
 
 class SetsCount(enum.IntEnum):
@@ -22,22 +26,282 @@ class LastSet(enum.IntEnum):
 
 
 TIEBREAK_SET_POINTS_TO_WIN = 10
+TIEBREAK_POINTS_TO_WIN = 7
+
+
+RulesPlan = namedtuple(
+    'RulesPlan',
+    [
+        'sets',
+        'sets_to_win',
+        'games',
+        'tiebreak_at',
+        'tiebreak_points_to_win',
+        'max_games',
+        'last_set',
+        'tb_set_points_to_win',
+        'no_ad',
+        'tiebreak_set_position',
+        'min_winner_games',
+        'max_set_games',
+    ],
+)
+RulesPlan.__doc__ = """Compiled match rules with all derived values precomputed.
+
+Attributes:
+    sets (int): Maximum number of sets.
+    sets_to_win (int): Number of sets needed to win the match.
+    games (int): Number of games needed to win a set.
+    tiebreak_at (int): Games of every unit at which a set is decided by a tiebreak.
+    tiebreak_points_to_win (int): Points needed to win the tiebreak of a set.
+    max_games (int): Maximum games of a unit in a regular set.
+    last_set (LastSet): Last set rule.
+    tb_set_points_to_win (int): Points needed to win the deciding tiebreak set.
+    no_ad (bool): Games are decided by a single point at deuce, tiebreaks by a single
+        point when both units are one point short of the win.
+    tiebreak_set_position (int): 0-based position of the deciding tiebreak set,
+        -1 if there is none, as in a single set match.
+    min_winner_games (tuple): Minimum games of the set winner by set position.
+    max_set_games (tuple): Maximum games of a unit by set position, None for a set
+        played on until a two games lead, which has no tiebreak.
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def compile_rules(rules):
+    """Returns compiled form of the match rules, cached per rules.
+
+    Args:
+        rules (MatchRules): Match rules.
+
+    Returns:
+        RulesPlan: Compiled match rules.
+    """
+    sets = rules.sets
+    # a single set match is decided by a regular set, the deciding tiebreak set
+    # follows regular ones
+    has_tiebreak_set = rules.last_set == LastSet.TIEBREAK_SET and sets > 1
+    tiebreak_set_position = sets - 1 if has_tiebreak_set else -1
+    advantage_set_position = sets - 1 if rules.last_set == LastSet.NO_TIEBREAK else -1
+    tiebreak_set_games = max(rules.tb_set_points_to_win, rules.games)
+    max_games = rules.tiebreak_at + 1
+    return RulesPlan(
+        sets=sets,
+        sets_to_win=sets // 2 + 1,
+        games=rules.games,
+        tiebreak_at=rules.tiebreak_at,
+        tiebreak_points_to_win=rules.tiebreak_points_to_win,
+        max_games=max_games,
+        last_set=rules.last_set,
+        tb_set_points_to_win=rules.tb_set_points_to_win,
+        no_ad=rules.no_ad,
+        tiebreak_set_position=tiebreak_set_position,
+        min_winner_games=tuple(
+            tiebreak_set_games if position == tiebreak_set_position else rules.games
+            for position in range(sets)
+        ),
+        # the deciding tiebreak set and the advantage last set are played on until
+        # a two games lead, so their games are not bounded
+        max_set_games=tuple(
+            None if position in (tiebreak_set_position, advantage_set_position) else max_games
+            for position in range(sets)
+        ),
+    )
+
+
+def is_set_complete(plan, position, set_score):
+    """Checks if the set is finished under the rules, e.g. 6:4 or 7:6 but not 6:5 or 7:0.
+
+    A regular set ends with a unit at the games to win a set and two games ahead,
+    one game later at the tiebreak, e.g. 7:5, or with the tiebreak, e.g. 7:6. The
+    deciding tiebreak set and the advantage last set end as soon as a unit is two
+    games ahead with at least the games to win the set. Only the tiebreak of a
+    regular set may have tiebreak points.
+
+    Args:
+        plan (RulesPlan): Compiled match rules.
+        position (int): 0-based position of the set in the match.
+        set_score (tennis_match_lib.structs.SetScore): Set score.
+
+    Returns:
+        bool: True if a unit has won the set with its last game or tiebreak.
+    """
+    winner = max(set_score.unit_one_games, set_score.unit_two_games)
+    loser = min(set_score.unit_one_games, set_score.unit_two_games)
+    position = min(position, plan.sets - 1)
+    min_games = plan.min_winner_games[position]
+    if plan.max_set_games[position] is None:
+        # played on until a two games lead, without a tiebreak
+        if set_score.tiebreak is not None:
+            return False
+        if winner > min_games:
+            return winner - loser == 2
+        return winner == min_games and loser <= min_games - 2
+    tiebreak_at = plan.tiebreak_at
+    if winner == tiebreak_at + 1 and loser == tiebreak_at:
+        return True
+    if set_score.tiebreak is not None:
+        return False
+    if winner == min_games:
+        return loser <= min_games - 2
+    return winner == tiebreak_at + 1 and loser == tiebreak_at - 1
+
+
+def has_too_small_games(plan, position, set_score):
+    """Checks if neither unit has the games needed to win the set, e.g. 5:4.
+
+    Args:
+        plan (RulesPlan): Compiled match rules.
+        position (int): 0-based position of the set in the match.
+        set_score (tennis_match_lib.structs.SetScore): Set score.
+
+    Returns:
+        bool: True if the games of both units are too small.
+    """
+    min_games = plan.min_winner_games[position]
+    return set_score.unit_one_games < min_games and set_score.unit_two_games < min_games
+
+
+def has_too_large_games(plan, position, set_score):
+    """Checks if a unit has more games than a set at the position can have.
+
+    Args:
+        plan (RulesPlan): Compiled match rules.
+        position (int): 0-based position of the set in the match.
+        set_score (tennis_match_lib.structs.SetScore): Set score.
+
+    Returns:
+        bool: True if the games of a unit are too large, a set played on until a
+        two games lead has no upper bound.
+    """
+    max_games = plan.max_set_games[position]
+    return (
+        max_games is not None
+        and max(set_score.unit_one_games, set_score.unit_two_games) > max_games
+    )
+
+
+def has_equal_games(set_score):
+    """Checks if the units have equal games, so that no one has won the set."""
+    return set_score.unit_one_games == set_score.unit_two_games
+
+
+def count_won_sets(sets):
+    """Returns numbers of sets won by unit one and unit two.
+
+    A set with equal games is counted for unit two, such a set is an error anyway.
+    """
+    unit_one_won = 0
+    for s in sets:
+        if s.unit_one_games > s.unit_two_games:
+            unit_one_won += 1
+    return unit_one_won, len(sets) - unit_one_won
+
+
+def has_too_many_won_sets(plan, sets):
+    """Checks if a unit has won more sets than needed to win the match."""
+    unit_one_won, unit_two_won = count_won_sets(sets)
+    return unit_one_won > plan.sets_to_win or unit_two_won > plan.sets_to_win
+
+
+def check_decided(plan, sets):
+    """Checks that the last set of a complete match decided it.
+
+    Args:
+        plan (RulesPlan): Compiled match rules.
+        sets (list): ``SetScore`` of every set.
+
+    Returns:
+        ErrorCode: ``TOO_FEW_SETS`` if no unit has won the match, ``TOO_MANY_SETS``
+        if sets were played after a unit had won it, ``ErrorCode.NONE`` otherwise.
+    """
+    won = [0, 0]
+    for i, s in enumerate(sets, 1):
+        winner = s.unit_one_games <= s.unit_two_games
+        won[winner] += 1
+        if won[winner] == plan.sets_to_win:
+            return ErrorCode.NONE if i == len(sets) else ErrorCode.TOO_MANY_SETS
+    return ErrorCode.TOO_FEW_SETS
+
+
+def check_sets(plan, sets):
+    """Checks the rules of a complete match on its sets.
+
+    The maximum number of sets is not checked, it is a matter of the score format.
+    Errors are reported in the order of ``Validator.validate``: the number of won
+    sets, the first set with too small games, the first set with equal games, the
+    first set which is not complete (see ``is_set_complete``), then whether the
+    match was decided by its last set.
+
+    Args:
+        plan (RulesPlan): Compiled match rules.
+        sets (list): ``SetScore`` of every set, at most ``plan.sets``.
+
+    Returns:
+        tuple: ``ErrorCode`` and 1-based index of the offending set or 0,
+        ``(ErrorCode.NONE, 0)`` if the sets are valid.
+    """
+    if has_too_many_won_sets(plan, sets):
+        return ErrorCode.TOO_MANY_WON_SETS, 0
+    for i, s in enumerate(sets):
+        if has_too_small_games(plan, i, s):
+            return ErrorCode.GAMES_TOO_SMALL, i + 1
+    for i, s in enumerate(sets, 1):
+        if has_equal_games(s):
+            return ErrorCode.GAMES_EQUAL, i
+    for i, s in enumerate(sets):
+        if not is_set_complete(plan, i, s):
+            return ErrorCode.SET_INCOMPLETE, i + 1
+    return check_decided(plan, sets), 0
 
 
 class MatchRules:
+    """Tennis match rules.
+
+    Args:
+        max_sets (SetsCount): Maximum number of sets.
+        games_count (GamesCount): Number of games needed to win a set.
+        last_set_rule (LastSet): How the last set is decided.
+        tb_set_points_to_win (int): Points needed to win the deciding tiebreak set.
+        tiebreak_at (int): Games of every unit at which a set is decided by a tiebreak,
+            the number of games to win a set or one less (e.g. 3 for Fast4), equal to
+            the number of games to win a set if omitted.
+        no_ad (bool): Games are decided by a single point at deuce, tiebreaks by a
+            single point when both units are one point short of the win.
+        tiebreak_points_to_win (int): Points needed to win the tiebreak of a set, 7 if
+            omitted, 5 for Fast4.
+    """
+
+    __slots__ = (
+        '_sets',
+        '_games',
+        '_last_set',
+        '_tb_set_points_to_win',
+        '_tiebreak_at',
+        '_no_ad',
+        '_tiebreak_points_to_win',
+    )
+
     def __init__(
         self,
         max_sets: SetsCount,
         games_count: GamesCount,
         last_set_rule: LastSet,
         tb_set_points_to_win=TIEBREAK_SET_POINTS_TO_WIN,
+        tiebreak_at=None,
+        no_ad=False,
+        tiebreak_points_to_win=TIEBREAK_POINTS_TO_WIN,
     ):
         MatchRules._check_max_sets(max_sets)
         MatchRules._check_games_count(games_count)
         self._sets = max_sets
         self._games = games_count
-        self.last_set = last_set_rule
-        self.tb_set_points_to_win = tb_set_points_to_win
+        self._last_set = last_set_rule
+        self._tb_set_points_to_win = tb_set_points_to_win
+        self._tiebreak_at = self.games if tiebreak_at is None else tiebreak_at
+        self._no_ad = no_ad
+        self._tiebreak_points_to_win = tiebreak_points_to_win
+        MatchRules._check_tiebreak_at(self._tiebreak_at, self.games)
 
     @classmethod
     def pro_tour(cls):
@@ -65,6 +329,100 @@ class MatchRules:
             max_sets=SetsCount.FIVE, games_count=GamesCount.SIX, last_set_rule=LastSet.TIEBREAK
         )
 
+    @classmethod
+    def fast4(cls):
+        """Returns Fast4 rules: sets to four games with a tiebreak to five points at 3:3
+        and no-ad games."""
+        return cls(
+            max_sets=SetsCount.FIVE,
+            games_count=GamesCount.FOUR,
+            last_set_rule=LastSet.TIEBREAK,
+            tiebreak_at=3,
+            no_ad=True,
+            tiebreak_points_to_win=5,
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        """Creates match rules from the dict returned by ``to_dict``."""
+        return cls(
+            max_sets=SetsCount(data['max_sets']),
+            games_count=GamesCount(data['games_count']),
+            last_set_rule=LastSet(data['last_set_rule']),
+            tb_set_points_to_win=data['tb_set_points_to_win'],
+            tiebreak_at=data.get('tiebreak_at'),
+            no_ad=data.get('no_ad', False),
+            tiebreak_points_to_win=data.get('tiebreak_points_to_win', TIEBREAK_POINTS_TO_WIN),
+        )
+
+    def to_dict(self):
+        """Returns JSON serializable representation of the match rules."""
+        return {
+            'max_sets': int(self._sets),
+            'games_count': int(self._games),
+            'last_set_rule': int(self._last_set),
+            'tb_set_points_to_win': self._tb_set_points_to_win,
+            'tiebreak_at': self._tiebreak_at,
+            'no_ad': self._no_ad,
+            'tiebreak_points_to_win': self._tiebreak_points_to_win,
+        }
+
+    def compile(self):
+        """Returns compiled form of the rules, see ``compile_rules``.
+
+        Returns:
+            RulesPlan: Compiled match rules.
+        """
+        return compile_rules(self)
+
+    @property
+    def last_set(self):
+        return self._last_set
+
+    @property
+    def tb_set_points_to_win(self):
+        return self._tb_set_points_to_win
+
+    @property
+    def tiebreak_at(self):
+        return self._tiebreak_at
+
+    @property
+    def no_ad(self):
+        return self._no_ad
+
+    @property
+    def tiebreak_points_to_win(self):
+        return self._tiebreak_points_to_win
+
+    def _key(self):
+        return (
+            self._sets,
+            self._games,
+            self._last_set,
+            self._tb_set_points_to_win,
+            self._tiebreak_at,
+            self._no_ad,
+            self._tiebreak_points_to_win,
+        )
+
+    def __eq__(self, other):
+        if isinstance(other, MatchRules):
+            return self._key() == other._key()
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return (
+            f'MatchRules(max_sets={self._sets!r}, games_count={self._games!r}, '
+            f'last_set_rule={self._last_set!r}, '
+            f'tb_set_points_to_win={self._tb_set_points_to_win!r}, '
+            f'tiebreak_at={self._tiebreak_at!r}, no_ad={self._no_ad!r}, '
+            f'tiebreak_points_to_win={self._tiebreak_points_to_win!r})'
+        )
+
     @property
     def sets(self):
         if self._sets == SetsCount.ONE:
@@ -74,7 +432,7 @@ class MatchRules:
         elif self._sets == SetsCount.FIVE:
             return 5
         else:
-            raise ValueError(f'Unexpected sets value: {self._max_sets}')
+            raise ValueError(f'Unexpected sets value: {self._sets}')
 
     @property
     def games(self):
@@ -83,7 +441,7 @@ class MatchRules:
         elif self._games == GamesCount.SIX:
             return 6
         else:
-            raise ValueError(f'Unexpected games value: {self._max_sets}')
+            raise ValueError(f'Unexpected games value: {self._games}')
 
     @staticmethod
     def _check_max_sets(sets):
@@ -94,3 +452,10 @@ class MatchRules:
     def _check_games_count(games):
         if games not in (GamesCount.FOUR, GamesCount.SIX):
             raise ValueError(f'Invalid games value: {games}')
+
+    @staticmethod
+    def _check_tiebreak_at(tiebreak_at, games):
+        # the games after a tiebreak bound the games of a set, so the tiebreak is at
+        # the games to win a set or one game short of them
+        if not games - 1 <= tiebreak_at <= games:
+            raise ValueError(f'Invalid tiebreak games value: {tiebreak_at}')
@@ -13,14 +13,35 @@ class ScoreFormat:
         game_sep (str): Game separator.
     """
 
+    __slots__ = ('_set_sep', '_game_sep')
+
     ALLOWED_SET_SEP = (' ',)
     ALLOWED_GAME_SEP = (':', '-', r'/')
 
     def __init__(self, set_sep, game_sep):
         ScoreFormat._check_set_sep(set_sep)
         ScoreFormat._check_game_sep(game_sep)
-        self.set_sep = set_sep
-        self.game_sep = game_sep
+        self._set_sep = set_sep
+        self._game_sep = game_sep
+
+    @property
+    def set_sep(self):
+        return self._set_sep
+
+    @property
+    def game_sep(self):
+        return self._game_sep
+
+    def __eq__(self, other):
+        if isinstance(other, ScoreFormat):
+            return (self._set_sep, self._game_sep) == (other._set_sep, other._game_sep)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self._set_sep, self._game_sep))
+
+    def __repr__(self):
+        return f'ScoreFormat(set_sep={self._set_sep!r}, game_sep={self._game_sep!r})'
 
     @classmethod
     def default(cls):
@@ -0,0 +1,374 @@
+# -*- coding: utf-8 -*-
+"""Score table module provides a read-only lookup table of parsed and validated scores.
+
+A table is built once, e.g. by the parent process of an ingestion, from the scores
+it is likely to see, and written into a file. Worker processes map the file with
+``mmap`` instead of warming caches of their own: its pages are shared by all of
+them through the page cache, and entries are read in place::
+
+    magic         b'TMT1'
+    header size   uint32
+    header        JSON: entries, rules, byte order, positions of sections
+    slots         uint32 per slot, number of the entry + 1 or 0 for an empty slot
+    offsets       uint32 per entry and one for the end of the last entry
+    entries       key length uint8, key, error code uint8, set index uint8 and the
+                  parse result as a wire record (see ``tennis_match_lib.wire``)
+
+Keys are canonical scores (see ``common.score_key``), slots are an open
+addressing hash table of CRC-32 of the keys, so lookups do not depend on the hash
+seed of the process. Parse and validation results do not depend on separators,
+so a table serves every ``ScoreFormat``. Scores spelled otherwise than their key,
+e.g. with leading zeros, and scores with an outcome marker are not in a table.
+"""
+
+import json
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from collections import namedtuple
+
+from tennis_match_lib import common, validation
+from tennis_match_lib.errors import ErrorCode, ScoreError
+from tennis_match_lib.parser import Parser
+from tennis_match_lib.rules import MatchRules
+from tennis_match_lib.score_format import ScoreFormat
+from tennis_match_lib.validator import Validator
+from tennis_match_lib.wire import WireRecord, encode_record
+
+
+MAGIC = b'TMT1'
+TABLE_FORMAT_VERSION = 3
+MAX_KEY_LENGTH = 255
+
+_HEADER_SIZE = struct.Struct('<I')
+_ENTRY_HEADER = struct.Struct('<BB')
+_ALIGNMENT = 8
+
+TableEntry = namedtuple('TableEntry', ['code', 'set_index', 'record'])
+TableEntry.__doc__ = """Entry of a score table.
+
+Attributes:
+    code (int): ``ErrorCode`` of the first violated rule, 0 for a valid score.
+    set_index (int): 1-based index of the offending set or 0.
+    record (tennis_match_lib.wire.WireRecord): Parse result, valid while the table
+        is open.
+"""
+
+
+def build_table(scores, score_format, rules):
+    """Parses and validates the scores and returns a table of their canonical forms.
+
+    Scores are deduplicated by their keys, scores which have no key (see
+    ``common.score_key``) or whose parse result does not fit a wire record are
+    skipped.
+
+    Args:
+        scores (iterable): Tennis match scores.
+        score_format (tennis_match_lib.score_format.ScoreFormat): Score format.
+        rules (tennis_match_lib.rules.MatchRules): Match rules.
+
+    Returns:
+        bytes: Table readable by ``ScoreTable``.
+    """
+    key_format = ScoreFormat.default()
+    parser = Parser(key_format, rules)
+    keys = {}
+    for score in scores:
+        try:
+            key = common.score_key(score, score_format.set_sep, score_format.game_sep)
+        except (TypeError, ValueError):
+            continue
+        if key in keys or len(key.encode()) > MAX_KEY_LENGTH:
+            continue
+        parse_result = parser.try_parse(key)
+        if isinstance(parse_result, ScoreError):
+            continue
+        try:
+            keys[key] = encode_record(parse_result)
+        except ValueError:
+            continue
+    batch = Validator(key_format, rules).validate_many(keys)
+    checks = [(ErrorCode.NONE, 0)] * len(keys)
+    for row, code, set_index in batch.errors():
+        checks[row] = (code, set_index)
+
+    slot_count = 1
+    while slot_count < 2 * len(keys):
+        slot_count *= 2
+    slots = array('I', bytes(4 * slot_count))
+    offsets = array('I', [0])
+    entries = bytearray()
+    for number, ((key, record), (code, set_index)) in enumerate(zip(keys.items(), checks)):
+        key = key.encode()
+        slot = zlib.crc32(key) & (slot_count - 1)
+        while slots[slot]:
+            slot = (slot + 1) & (slot_count - 1)
+        slots[slot] = number + 1
+        entries.append(len(key))
+        entries += key
+        entries += _ENTRY_HEADER.pack(code, set_index)
+        entries += record
+        offsets.append(len(entries))
+
+    sections = [('slots', slots), ('offsets', offsets)]
+    layout = {}
+    position = 0
+    for name, values in sections:
+        size = len(values) * values.itemsize
+        layout[name] = [values.typecode, position, size]
+        position += size + -size % _ALIGNMENT
+    layout['entries'] = ['B', position, len(entries)]
+    header = json.dumps(
+        {
+            'version': TABLE_FORMAT_VERSION,
+            'entries': len(keys),
+            'byteorder': sys.byteorder,
+            'rules': rules.to_dict(),
+            'sections': layout,
+        }
+    ).encode()
+    header += b' ' * (-(len(MAGIC) + _HEADER_SIZE.size + len(header)) % _ALIGNMENT)
+    table = bytearray(MAGIC)
+    table += _HEADER_SIZE.pack(len(header))
+    table += header
+    for _, values in sections:
+        table += values.tobytes()
+        table += bytes(-len(table) % _ALIGNMENT)
+    table += entries
+    return bytes(table)
+
+
+def write_table(path, scores, score_format, rules):
+    """Builds a table of the scores, see ``build_table``, and writes it into a file.
+
+    Args:
+        path (str): Table file path.
+        scores (iterable): Tennis match scores.
+        score_format (tennis_match_lib.score_format.ScoreFormat): Score format.
+        rules (tennis_match_lib.rules.MatchRules): Match rules.
+
+    Returns:
+        int: Number of entries.
+    """
+    table = build_table(scores, score_format, rules)
+    with open(path, 'wb') as table_file:
+        table_file.write(table)
+    with ScoreTable(table) as opened:
+        return len(opened)
+
+
+class ScoreTable:
+    """Read-only table of parsed and validated scores, use ``ScoreTable.open``.
+
+    Args:
+        buffer: Object supporting the buffer protocol with the table, e.g. ``mmap``
+            or ``multiprocessing.shared_memory.SharedMemory.buf``.
+
+    Raises:
+        ValueError: If the buffer is not a table or was written on a machine with
+            other byte order.
+    """
+
+    def __init__(self, buffer):
+        self._mmap = None
+        self._view = memoryview(buffer).cast('B')
+        self._views = []
+        try:
+            header, data_start = self._read_header(self._view)
+            self.rules = MatchRules.from_dict(header['rules'])
+            self._entries = header['entries']
+            sections = {}
+            for name, (typecode, position, size) in header['sections'].items():
+                start = data_start + position
+                section = self._view[start : start + size].cast(typecode)
+                self._views.append(section)
+                sections[name] = section
+            self._slots = sections['slots']
+            self._offsets = sections['offsets']
+            self._data = sections['entries']
+            self._mask = len(self._slots) - 1
+        except (KeyError, ValueError, TypeError) as ex:
+            self.close()
+            raise ValueError(f'Invalid score table: {ex}') from ex
+
+    @classmethod
+    def open(cls, path):
+        """Maps the table file into memory, use the table with ``with``.
+
+        Args:
+            path (str): Table file path.
+
+        Returns:
+            ScoreTable: Score table.
+        """
+        with open(path, 'rb') as table_file:
+            mapped = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            table = cls(mapped)
+        except ValueError:
+            mapped.close()
+            raise
+        table._mmap = mapped
+        return table
+
+    def close(self):
+        """Releases the buffer, entries can't be used afterwards."""
+        for view in self._views:
+            view.release()
+        self._views = []
+        self._view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._entries
+
+    def lookup(self, key):
+        """Returns the entry of the canonical score.
+
+        Args:
+            key (str): Canonical score, see ``common.score_key``.
+
+        Returns:
+            TableEntry: Entry of the score, None if the score is not in the table.
+        """
+        key = key.encode()
+        slots = self._slots
+        offsets = self._offsets
+        data = self._data
+        length = len(key)
+        slot = zlib.crc32(key) & self._mask
+        while True:
+            number = slots[slot]
+            if not number:
+                return None
+            start = offsets[number - 1]
+            if data[start] == length and data[start + 1 : start + 1 + length] == key:
+                start += 1 + length
+                code, set_index = _ENTRY_HEADER.unpack_from(data, start)
+                return TableEntry(code, set_index, WireRecord(data, start + _ENTRY_HEADER.size))
+            slot = (slot + 1) & self._mask
+
+    @staticmethod
+    def _read_header(view):
+        if len(view) < len(MAGIC) + _HEADER_SIZE.size or bytes(view[: len(MAGIC)]) != MAGIC:
+            raise ValueError('Buffer is not a score table')
+        (header_size,) = _HEADER_SIZE.unpack_from(view, len(MAGIC))
+        data_start = len(MAGIC) + _HEADER_SIZE.size + header_size
+        header = json.loads(bytes(view[len(MAGIC) + _HEADER_SIZE.size : data_start]))
+        if header.get('version') != TABLE_FORMAT_VERSION:
+            raise ValueError(f'Unsupported score table version: {header.get("version")}')
+        if header['byteorder'] != sys.byteorder:
+            raise ValueError(f'Score table has {header["byteorder"]} byte order')
+        return header, data_start
+
+
+def _table_lookup(table, score_format):
+    # lookup of scores in the format, the separators are replaced by the default
+    # ones of keys; a score with default game separators of another format is
+    # not a score of the format
+    lookup = table.lookup
+    game_sep = score_format.game_sep
+    default_game_sep = common.DEFAULT_GAME_SEPARATOR
+    if game_sep == default_game_sep:
+        return lambda score: lookup(score) if isinstance(score, str) else None
+
+    def lookup_score(score):
+        if not isinstance(score, str) or default_game_sep in score:
+            return None
+        return lookup(score.replace(game_sep, default_game_sep))
+
+    return lookup_score
+
+
+def _check_rules(table, rules):
+    if table.rules != rules:
+        raise ValueError(f'Score table is built for other rules: {table.rules!r}')
+
+
+class TableParser(Parser):
+    """Parser which takes parse results from a score table and parses the other scores.
+
+    Args:
+        score_format (tennis_match_lib.score_format.ScoreFormat): Score format.
+        rules (tennis_match_lib.rules.MatchRules): Match rules.
+        table (ScoreTable): Table built for the same rules.
+
+    Raises:
+        ValueError: If the table is built for other rules.
+    """
+
+    def __init__(self, score_format, rules, table):
+        _check_rules(table, rules)
+        super().__init__(score_format, rules)
+        self.table = table
+        self._lookup = _table_lookup(table, score_format)
+
+    def try_parse(self, score):
+        entry = self._lookup(score)
+        if entry is None:
+            return super().try_parse(score)
+        return entry.record.to_parse_result()
+
+
+class TableValidator(Validator):
+    """Validator which takes results of scores from a score table.
+
+    Scores which are not in the table are checked as by ``Validator``, so are all
+    scores of ``validate`` with a collector, whose stages are measured, and of
+    ``validate_all``.
+
+    Args:
+        score_format (tennis_match_lib.score_format.ScoreFormat): Score format.
+        rules (tennis_match_lib.rules.MatchRules): Match rules.
+        table (ScoreTable): Table built for the same rules.
+        collector (tennis_match_lib.instrumentation.Collector): Collector of stage
+            metrics of ``validate``.
+
+    Raises:
+        ValueError: If the table is built for other rules.
+    """
+
+    def __init__(self, score_format, rules, table, collector=None):
+        _check_rules(table, rules)
+        self.table = table
+        self._lookup = _table_lookup(table, score_format)
+        super().__init__(score_format, rules, collector)
+
+    def validate(self, score):
+        entry = self._lookup(score)
+        if entry is None or self.collector is not None:
+            return super().validate(score)
+        if not entry.code:
+            return validation.Valid(score)
+        sets = entry.record.sets
+        return validation.Invalid(
+            [self._scan_error(score, ErrorCode(entry.code), entry.set_index, sets)]
+        )
+
+    def is_valid(self, score):
+        entry = self._lookup(score)
+        if entry is None:
+            return super().is_valid(score)
+        return not entry.code
+
+    def _compile_checks(self):
+        lookup = self._lookup
+        check = super()._compile_checks()
+
+        def table_check(score):
+            entry = lookup(score)
+            if entry is None:
+                return check(score)
+            return ErrorCode(entry.code), entry.set_index
+
+        return table_check
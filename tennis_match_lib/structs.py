@@ -1,7 +1,41 @@
-from dataclasses import dataclass
+from array import array
+from dataclasses import dataclass, fields
+import enum
 
 
-@dataclass
+def _slotted(cls):
+    # dataclass(slots=True) is available only since Python 3.10, so the class is
+    # recreated with __slots__ in place of the per-instance __dict__
+    field_names = tuple(f.name for f in fields(cls))
+    namespace = dict(cls.__dict__)
+    for name in field_names + ('__dict__', '__weakref__'):
+        namespace.pop(name, None)
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in field_names)
+
+    def __setstate__(self, state):
+        for name, value in zip(field_names, state):
+            object.__setattr__(self, name, value)
+
+    namespace['__slots__'] = field_names
+    namespace['__getstate__'] = __getstate__
+    namespace['__setstate__'] = __setstate__
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+class MatchOutcome(enum.IntEnum):
+    """How a match ended, or that it did not end yet."""
+
+    COMPLETED = 0
+    RETIRED = 1
+    WALKOVER = 2
+    DEFAULTED = 3
+    IN_PROGRESS = 4
+
+
+@_slotted
+@dataclass(frozen=True)
 class SetScore:
 
     unit_one_games: int
@@ -10,10 +44,88 @@ class SetScore:
     duration = None
 
 
-@dataclass
+@_slotted
+@dataclass(frozen=True)
 class BasicMatchStatsInfo:
 
     unit_one_sets_diff: int
     unit_two_sets_diff: int
     unit_one_games_diff: int
     unit_two_games_diff: int
+
+
+class PackedMatch:
+    """Sets of a match packed into a single immutable bytes blob.
+
+    Every set takes three signed 16-bit values: games of unit one, games of unit
+    two and tiebreak points (-1 if there was no tiebreak). The packed match behaves
+    like a read-only sequence of ``SetScore``, so it can be used wherever a list of
+    sets is expected.
+
+    Args:
+        blob (bytes): Packed sets as returned by ``tobytes``.
+    """
+
+    __slots__ = ('_blob',)
+
+    _TYPECODE = 'h'
+    _NO_TIEBREAK = -1
+
+    def __init__(self, blob=b''):
+        if len(blob) % (3 * array(self._TYPECODE).itemsize):
+            raise ValueError(f'Invalid packed match length: {len(blob)}')
+        self._blob = bytes(blob)
+
+    @classmethod
+    def from_sets(cls, sets):
+        """Packs the given sets.
+
+        Args:
+            sets (iterable): ``SetScore`` values.
+
+        Returns:
+            PackedMatch: Packed match.
+        """
+        values = array(cls._TYPECODE)
+        for s in sets:
+            tiebreak = cls._NO_TIEBREAK if s.tiebreak is None else s.tiebreak
+            values.extend((s.unit_one_games, s.unit_two_games, tiebreak))
+        return cls(values.tobytes())
+
+    def tobytes(self):
+        return self._blob
+
+    def _values(self):
+        return memoryview(self._blob).cast(self._TYPECODE)
+
+    def __len__(self):
+        return len(self._blob) // (3 * array(self._TYPECODE).itemsize)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('set index out of range')
+        one, two, tiebreak = self._values()[3 * index : 3 * index + 3]
+        return SetScore(one, two, None if tiebreak == self._NO_TIEBREAK else tiebreak)
+
+    def __iter__(self):
+        values = self._values()
+        for i in range(0, len(values), 3):
+            tiebreak = values[i + 2]
+            yield SetScore(
+                values[i], values[i + 1], None if tiebreak == self._NO_TIEBREAK else tiebreak
+            )
+
+    def __eq__(self, other):
+        if isinstance(other, PackedMatch):
+            return self._blob == other._blob
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self._blob)
+
+    def __repr__(self):
+        return f'PackedMatch({list(self)!r})'
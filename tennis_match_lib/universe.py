@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""Universe module enumerates every legal score of match rules and indexes them.
+
+Only game level shapes of scores are considered: tiebreak points are ignored and a
+set played on until a two games lead, the deciding tiebreak set
+(``LastSet.TIEBREAK_SET``) or the advantage last set (``LastSet.NO_TIEBREAK``), is
+reduced to its winner. With that the set of legal scores is finite for any
+``MatchRules``.
+
+The legality of a set does not depend on the other sets, only the number of won
+sets does, so the index is stored as a trie with shared suffixes: a state is the
+set position with the number of sets won by each unit, and every legal set shape
+is a transition to the next state. A state in which a unit has won the match
+accepts the score and has no transitions, as no set is played afterwards.
+Checking a score is a walk of at most ``rules.sets`` dictionary lookups.
+"""
+
+import json
+
+from tennis_match_lib import common
+from tennis_match_lib.rules import MatchRules, is_set_complete
+from tennis_match_lib.score_format import ScoreFormat
+from tennis_match_lib.structs import SetScore
+
+
+INDEX_FORMAT_VERSION = 3
+
+
+def iter_legal_scores(rules, score_format=None):
+    """Yields every legal normalized score of the given match rules.
+
+    Args:
+        rules (tennis_match_lib.rules.MatchRules): Match rules.
+        score_format (tennis_match_lib.score_format.ScoreFormat): Score format,
+            default one if omitted.
+
+    Yields:
+        str: Legal score without tiebreak points.
+    """
+    yield from ScoreIndex.build(rules).iter_scores(score_format)
+
+
+class ScoreIndex:
+    """Index of all legal scores of match rules.
+
+    Use ``ScoreIndex.build`` to create the index for rules and ``save``/``load``
+    to persist it.
+
+    Args:
+        rules (tennis_match_lib.rules.MatchRules): Match rules.
+        transitions (list): Transitions of every state: ``{(games, games): state}``.
+        accepting (iterable): States in which a score is complete.
+    """
+
+    def __init__(self, rules, transitions, accepting):
+        self.rules = rules
+        self._transitions = transitions
+        self._accepting = frozenset(accepting)
+        self._plan = rules.compile()
+        self._played_on_position = self._played_on_set(self._plan)
+
+    @classmethod
+    def build(cls, rules):
+        """Builds index of all legal scores of the given rules.
+
+        Args:
+            rules (tennis_match_lib.rules.MatchRules): Match rules.
+
+        Returns:
+            ScoreIndex: Score index.
+        """
+        plan = rules.compile()
+        sets_to_win = plan.sets_to_win
+        states = {(0, 0, 0): 0}
+        transitions = [{}]
+        accepting = []
+        queue = [(0, 0, 0)]
+        for position, unit_one_won, unit_two_won in queue:
+            state = states[(position, unit_one_won, unit_two_won)]
+            if sets_to_win in (unit_one_won, unit_two_won):
+                accepting.append(state)
+                continue
+            for shape in cls._legal_set_shapes(plan, position):
+                next_key = (
+                    position + 1,
+                    unit_one_won + (shape[0] > shape[1]),
+                    unit_two_won + (shape[0] < shape[1]),
+                )
+                if next_key not in states:
+                    states[next_key] = len(transitions)
+                    transitions.append({})
+                    queue.append(next_key)
+                transitions[state][shape] = states[next_key]
+        return cls(rules, transitions, accepting)
+
+    @staticmethod
+    def _played_on_set(plan):
+        # a set played on until a two games lead has no upper bound, so it is kept as
+        # its winner only
+        for position, max_games in enumerate(plan.max_set_games):
+            if max_games is None:
+                return position
+        return None
+
+    @staticmethod
+    def _legal_set_shapes(plan, position):
+        min_games = plan.min_winner_games[position]
+        max_games = plan.max_set_games[position]
+        if max_games is None:
+            return [(min_games, 0), (0, min_games)]
+        values = range(max_games + 1)
+        return [
+            (a, b)
+            for a in values
+            for b in values
+            if is_set_complete(plan, position, SetScore(a, b))
+        ]
+
+    def contains(self, score, score_format=None):
+        """Checks if the normalized score is legal.
+
+        Args:
+            score (str): Tennis match score.
+            score_format (tennis_match_lib.score_format.ScoreFormat): Score format,
+                default one if omitted.
+
+        Returns:
+            bool: True if the score is legal.
+        """
+        score_format = score_format or ScoreFormat.default()
+        try:
+            sets = common.parse_score(score, score_format.set_sep, score_format.game_sep)
+        except (TypeError, ValueError):
+            return False
+        if len(sets) > self.rules.sets:
+            return False
+        transitions = self._transitions
+        state = 0
+        for position, s in enumerate(sets):
+            shape = (s.unit_one_games, s.unit_two_games)
+            if position == self._played_on_position:
+                if not is_set_complete(self._plan, position, s):
+                    return False
+                games = self._plan.min_winner_games[position]
+                shape = (games, 0) if shape[0] > shape[1] else (0, games)
+            elif s.tiebreak is not None and not is_set_complete(self._plan, position, s):
+                # tiebreak points are ignored, but only the tiebreak has them
+                return False
+            state = transitions[state].get(shape)
+            if state is None:
+                return False
+        return state in self._accepting
+
+    def __contains__(self, score):
+        return self.contains(score)
+
+    def iter_scores(self, score_format=None):
+        """Yields every legal score of the index.
+
+        Args:
+            score_format (tennis_match_lib.score_format.ScoreFormat): Score format,
+                default one if omitted.
+
+        Yields:
+            str: Legal score without tiebreak points.
+        """
+        score_format = score_format or ScoreFormat.default()
+        set_sep = score_format.set_sep
+        game_sep = score_format.game_sep
+        stack = [(0, ())]
+        while stack:
+            state, sets = stack.pop()
+            if state in self._accepting:
+                yield set_sep.join(sets)
+            for (one, two), next_state in reversed(list(self._transitions[state].items())):
+                stack.append((next_state, sets + (f'{one}{game_sep}{two}',)))
+
+    def __len__(self):
+        # number of legal scores: number of paths from the root to accepting states
+        paths = [0] * len(self._transitions)
+        paths[0] = 1
+        for state, transitions in enumerate(self._transitions):
+            for next_state in transitions.values():
+                paths[next_state] += paths[state]
+        return sum(paths[state] for state in self._accepting)
+
+    def save(self, path):
+        """Saves the index to the file.
+
+        Args:
+            path (str): File path.
+        """
+        data = {
+            'version': INDEX_FORMAT_VERSION,
+            'rules': self.rules.to_dict(),
+            'accepting': sorted(self._accepting),
+            'transitions': [
+                [[one, two, next_state] for (one, two), next_state in transitions.items()]
+                for transitions in self._transitions
+            ],
+        }
+        with open(path, 'w', encoding='utf-8') as index_file:
+            json.dump(data, index_file, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, path, rules=None):
+        """Loads the index saved by ``save``.
+
+        Args:
+            path (str): File path.
+            rules (tennis_match_lib.rules.MatchRules): Expected match rules, not checked
+                if omitted.
+
+        Returns:
+            ScoreIndex: Score index.
+
+        Raises:
+            ValueError: If the file has unsupported version or was built for other rules.
+        """
+        with open(path, encoding='utf-8') as index_file:
+            data = json.load(index_file)
+        if data.get('version') != INDEX_FORMAT_VERSION:
+            raise ValueError(f'Unsupported score index version: {data.get("version")}')
+        index_rules = MatchRules.from_dict(data['rules'])
+        if rules is not None and rules != index_rules:
+            raise ValueError(f'Score index was built for other rules: {index_rules}')
+        transitions = [
+            {(one, two): next_state for one, two, next_state in state_transitions}
+            for state_transitions in data['transitions']
+        ]
+        return cls(index_rules, transitions, data['accepting'])
@@ -1,13 +1,14 @@
-from dataclasses import dataclass
+from array import array
+from dataclasses import dataclass, field
 from functools import reduce
-from toolz import curry
-from typing import Any
 
+from tennis_match_lib.errors import ErrorCode, error_message
 
-@dataclass
+
+@dataclass(frozen=True)
 class Valid:
 
-    value: Any
+    value: object
 
     def is_valid(self):
         return True
@@ -22,10 +23,10 @@ class Valid:
         return f(self.value)
 
 
-@dataclass
+@dataclass(frozen=True)
 class Invalid:
 
-    value: Any
+    value: object
 
     def is_valid(self):
         return False
@@ -41,4 +42,65 @@ class Invalid:
 
 
 def validate_into(f, *args):
-    return reduce(lambda a, b: a.apply(b), args, Valid(curry(f)))
+    return reduce(lambda a, b: a.apply(b), args, Valid(_curry(f, len(args)) if args else f))
+
+
+def _curry(f, arity, args=()):
+    """Returns ``f`` taking its ``arity`` arguments one by one."""
+    if len(args) == arity:
+        return f(*args)
+    return lambda value: _curry(f, arity, args + (value,))
+
+
+def collect(value, *results):
+    """Combines independent validation results, keeping the errors of all of them.
+
+    Args:
+        value: Value of the combined result if every result is valid.
+        results: ``Valid`` or ``Invalid`` results with lists of errors.
+
+    Returns:
+        Valid | Invalid: ``Valid(value)`` or ``Invalid`` with errors of every
+        invalid result in order.
+    """
+
+    def keep(_):
+        return keep
+
+    combined = reduce(lambda a, b: a.apply(b), results, Valid(keep))
+    return Valid(value) if combined.is_valid() else combined
+
+
+@dataclass
+class ValidationBatch:
+    """Columnar result of a batch validation.
+
+    ``valid`` holds one flag per input row. Failing rows are listed in ``rows``
+    with the matching error code and 1-based set index (0 if the error is not
+    related to a particular set) at the same positions of ``error_codes`` and
+    ``set_indices``.
+    """
+
+    valid: array = field(default_factory=lambda: array('b'))
+    rows: array = field(default_factory=lambda: array('L'))
+    error_codes: array = field(default_factory=lambda: array('B'))
+    set_indices: array = field(default_factory=lambda: array('B'))
+
+    def __len__(self):
+        return len(self.valid)
+
+    def is_valid(self, row):
+        return bool(self.valid[row])
+
+    @property
+    def valid_count(self):
+        return len(self.valid) - len(self.rows)
+
+    def errors(self):
+        """Yields ``(row, error_code, set_index)`` for every failing row."""
+        for row, code, set_index in zip(self.rows, self.error_codes, self.set_indices):
+            yield row, ErrorCode(code), set_index
+
+    def messages(self):
+        """Returns mapping of failing row index to rendered error message."""
+        return {row: error_message(code, set_index) for row, code, set_index in self.errors()}
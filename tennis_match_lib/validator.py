@@ -1,28 +1,67 @@
-from collections import Counter
+from collections import namedtuple
 import re
+import time
 
 from tennis_match_lib import common
-from tennis_match_lib.rules import LastSet
+from tennis_match_lib.automaton import ScoreAutomaton
+from tennis_match_lib.errors import ErrorCode, ScoreError
+from tennis_match_lib.rules import (
+    check_decided,
+    count_won_sets,
+    has_equal_games,
+    has_too_large_games,
+    has_too_many_won_sets,
+    has_too_small_games,
+    is_set_complete,
+)
+from tennis_match_lib.structs import MatchOutcome
 from tennis_match_lib import validation
 
 
+ParsedScore = namedtuple('ParsedScore', ['score', 'sets'])
+
+
 class Validator:
-    def __init__(self, score_format, rules):
+
+    # number of is_valid calls between reorderings of its checks, 0 keeps the order
+    FAIL_FAST_REORDER_INTERVAL = 1024
+
+    def __init__(self, score_format, rules, collector=None):
         self.score_format = score_format
         self.rules = rules
+        self.collector = collector
+        self.plan = rules.compile()
         self.re_pattern_raw = self._generate_re_pattern()
         self.re_pattern = re.compile(self.re_pattern_raw)
-        self.sets = []
+        # sets up to the maximum number of sets followed by a set separator
+        self._re_too_many_sets = re.compile(
+            sets_pattern(score_format, self.plan, self.plan.sets) + score_format.set_sep
+        )
+        self.automaton = ScoreAutomaton(score_format, rules)
+        self._check = self._compile_checks()
+        self._stages = (
+            ('regexp', self._validate_by_regexp),
+            ('number_of_sets', self._validate_number_of_sets),
+            ('parse_score', self._parse_score),
+            ('number_of_won_sets', self._validate_number_of_won_sets),
+            ('games_too_small', self._validate_games_have_too_small_numbers),
+            ('games_equality', self._validate_games_equality),
+            ('set_complete', self._validate_sets_complete),
+            ('match_decided', self._validate_match_decided),
+        )
+        self._fail_fast = self._compile_fail_fast()
 
     def validate(self, score):
-        return (
-            validation.validate_into(str, self._validate_by_regexp(score))
-            .and_then(self._validate_number_of_sets)
-            .and_then(self._parse_score)
-            .and_then(self._validate_number_of_won_sets)
-            .and_then(self._validate_games_have_too_small_numbers)
-            .and_then(self._validate_games_equality)
-        )
+        sets_score, outcome = common.split_outcome(score, self.score_format.set_sep)
+        if outcome is not None:
+            return self._validate_outcome(score, sets_score, outcome)
+        if self.collector is not None:
+            return self._validate_instrumented(score)
+        # the checks of the stages below in a single pass, see ScoreAutomaton
+        code, set_index, sets = self.automaton.scan(score)
+        if not code:
+            return validation.Valid(score)
+        return validation.Invalid([self._scan_error(score, code, set_index, sets)])
         # 1. validate score according to regexp for given format and rules
 
         # Failure Set Cases:
@@ -41,91 +80,439 @@ class Validator:
         # 9. if two game is 7, one game is 6 and no tiebreak score
         # 10. if tiebreak score can't be parsed to int
 
+    def is_valid(self, score):
+        """Checks the score as fast as possible, without building error messages.
+
+        The verdict is the same as of ``validate(score).is_valid()``. Cheap checks run
+        first and stop at the first failure. Every ``FAIL_FAST_REORDER_INTERVAL``
+        calls, checks which can run in any order are sorted by the number of scores
+        they rejected, so the most selective ones run first for the data at hand.
+
+        Args:
+            score (str): Tennis match score.
+
+        Returns:
+            bool: True if the score is valid.
+        """
+        sets_score, outcome = common.split_outcome(score, self.score_format.set_sep)
+        if outcome is not None:
+            return not self._outcome_errors(sets_score, outcome)
+        return self._fail_fast(score)
+
+    def fail_fast_order(self):
+        """Returns names of the ``is_valid`` checks in their current order."""
+        return self._fail_fast.order()
+
+    def validate_all(self, score):
+        """Validates the score reporting every violated rule, not only the first one.
+
+        Format, number of sets and number of won sets are checked for the whole score,
+        games are checked for every set. Only a score which can't be parsed at all
+        stops the validation early.
+
+        Args:
+            score (str): Tennis match score.
+
+        Returns:
+            Valid | Invalid: ``Valid(score)`` or ``Invalid`` with all errors.
+        """
+        if not isinstance(score, str):
+            return validation.Invalid([ScoreError(ErrorCode.INVALID_FORMAT, 0, score)])
+        sets_score, outcome = common.split_outcome(score, self.score_format.set_sep)
+        if outcome is not None:
+            errors = self._outcome_errors(sets_score, outcome)
+            return validation.Invalid(errors) if errors else validation.Valid(score)
+        results = [self._validate_by_regexp(score), self._validate_number_of_sets(score)]
+        parsed = self._parse_score(score)
+        if not parsed.is_valid():
+            return validation.collect(score, *results, parsed)
+        parsed = parsed.value
+        results.append(self._validate_number_of_won_sets(parsed))
+        for i, s in enumerate(parsed.sets[: self.plan.sets], 1):
+            results.append(self._validate_set_games(i, s))
+        if len(parsed.sets) <= self.plan.sets:
+            results.append(self._validate_match_decided(parsed))
+        return validation.collect(score, *results)
+
+    def validate_many(self, scores):
+        """Validates every score of the given iterable.
+
+        The checks are the same as in ``validate`` but are compiled once per
+        validator and report error codes instead of building ``Valid``/``Invalid``
+        objects for every score.
+
+        Args:
+            scores (iterable): Tennis match scores.
+
+        Returns:
+            tennis_match_lib.validation.ValidationBatch: Columnar validation result.
+        """
+        check = self._check
+        batch = validation.ValidationBatch()
+        valid = batch.valid.append
+        rows = batch.rows.append
+        error_codes = batch.error_codes.append
+        set_indices = batch.set_indices.append
+        for row, score in enumerate(scores):
+            code, set_index = check(score)
+            if code:
+                valid(0)
+                rows(row)
+                error_codes(code)
+                set_indices(set_index)
+            else:
+                valid(1)
+        return batch
+
+    def _validate_outcome(self, score, sets_score, outcome):
+        started = time.perf_counter()
+        errors = self._outcome_errors(sets_score, outcome)
+        if self.collector is not None:
+            code = errors[0].code if errors else ErrorCode.NONE
+            self.collector.observe('outcome', time.perf_counter() - started, code)
+        if errors:
+            return validation.Invalid(errors[:1])
+        return validation.Valid(score)
+
+    def _outcome_errors(self, sets_score, outcome):
+        """Returns ``ScoreError`` of every rule violated by the sets of a score which
+        ended with an outcome marker.
+
+        A walkover has no sets, any other outcome has at least one. Every set but the
+        last one is checked as in ``validate``, the last one may be unfinished, but no
+        unit may have won the match already.
+        """
+        if outcome == MatchOutcome.WALKOVER:
+            if sets_score:
+                return [ScoreError(ErrorCode.INVALID_FORMAT, 0, sets_score)]
+            return []
+        if not sets_score:
+            return [ScoreError(ErrorCode.TOO_FEW_SETS, 0, 0)]
+        sets = common.try_parse_score(
+            sets_score, self.score_format.set_sep, self.score_format.game_sep
+        )
+        if sets is None:
+            return [ScoreError(ErrorCode.INVALID_FORMAT, 0, sets_score)]
+        plan = self.plan
+        if len(sets) > plan.sets:
+            return [ScoreError(ErrorCode.TOO_MANY_SETS, 0, len(sets))]
+        errors = []
+        won = [0, 0]
+        last = len(sets) - 1
+        for i, s in enumerate(sets):
+            set_errors = len(errors)
+            if has_too_large_games(plan, i, s):
+                errors.append(ScoreError(ErrorCode.GAMES_TOO_LARGE, i + 1, s))
+            if i == last:
+                if is_set_complete(plan, i, s):
+                    won[s.unit_one_games < s.unit_two_games] += 1
+                continue
+            won[s.unit_one_games <= s.unit_two_games] += 1
+            if has_too_small_games(plan, i, s):
+                errors.append(ScoreError(ErrorCode.GAMES_TOO_SMALL, i + 1, s))
+            if has_equal_games(s):
+                errors.append(ScoreError(ErrorCode.GAMES_EQUAL, i + 1, s))
+            if len(errors) == set_errors and not is_set_complete(plan, i, s):
+                errors.append(ScoreError(ErrorCode.SET_INCOMPLETE, i + 1, s))
+        if max(won) > plan.sets_to_win:
+            errors.insert(0, ScoreError(ErrorCode.TOO_MANY_WON_SETS, 0, tuple(won)))
+        elif max(won) == plan.sets_to_win:
+            errors.insert(0, ScoreError(ErrorCode.MATCH_ALREADY_DECIDED, 0, tuple(won)))
+        return errors
+
+    def _scan_error(self, score, code, set_index, sets):
+        # the error of the stage which would have rejected the score
+        if set_index:
+            return ScoreError(code, set_index, sets[set_index - 1])
+        if code in (ErrorCode.TOO_MANY_SETS, ErrorCode.TOO_FEW_SETS):
+            return ScoreError(code, 0, score.count(self.score_format.set_sep) + 1)
+        if code == ErrorCode.TOO_MANY_WON_SETS:
+            return ScoreError(code, 0, count_won_sets(sets))
+        return ScoreError(code, 0, score)
+
+    def _validate_instrumented(self, score):
+        # the checks of validate as separate stages, every stage is timed and
+        # reported to the collector
+        collector = self.collector
+        timer = time.perf_counter
+        value = score
+        for stage, function in self._stages:
+            started = timer()
+            result = function(value)
+            elapsed = timer() - started
+            if not result.is_valid():
+                collector.observe(stage, elapsed, result.value[0].code)
+                return result
+            collector.observe(stage, elapsed, ErrorCode.NONE)
+            value = result.value
+        return self._unwrap_score(value)
+
+    def _compile_checks(self):
+        scan = self.automaton.scan
+        split_outcome = common.split_outcome
+        outcome_errors = self._outcome_errors
+        set_sep = self.score_format.set_sep
+        ok = (ErrorCode.NONE, 0)
+        invalid_format = (ErrorCode.INVALID_FORMAT, 0)
+
+        def check(score):
+            if not isinstance(score, str):
+                return invalid_format
+            sets_score, outcome = split_outcome(score, set_sep)
+            if outcome is not None:
+                errors = outcome_errors(sets_score, outcome)
+                return (errors[0].code, errors[0].set_index) if errors else ok
+            code, set_index, _ = scan(score)
+            return code, set_index
+
+        return check
+
+    def _compile_fail_fast(self):
+        fullmatch = self.re_pattern.fullmatch
+        set_sep = self.score_format.set_sep
+        game_sep = self.score_format.game_sep
+        plan = self.plan
+        max_sets = plan.sets
+        sets_to_win = plan.sets_to_win
+
+        def number_of_sets(score):
+            return sets_to_win <= score.count(set_sep) + 1 <= max_sets
+
+        def matches_format(score):
+            # the same format as of the automaton for a number of sets in range,
+            # which is checked as well
+            return fullmatch(score) is not None
+
+        def parse_score(score):
+            return common.try_parse_score(score, set_sep, game_sep)
+
+        def games_equality(sets):
+            for s in sets:
+                if has_equal_games(s):
+                    return False
+            return True
+
+        def games_too_small(sets):
+            for i, s in enumerate(sets):
+                if has_too_small_games(plan, i, s):
+                    return False
+            return True
+
+        def number_of_won_sets(sets):
+            return not has_too_many_won_sets(plan, sets)
+
+        def set_complete(sets):
+            for i, s in enumerate(sets):
+                if not is_set_complete(plan, i, s):
+                    return False
+            return True
+
+        def match_decided(sets):
+            return not check_decided(plan, sets)
+
+        # checks are in the order of their cost, the number of sets is checked
+        # before parsing, so that checks of parsed sets can index rules by set
+        return _FailFast(
+            (('number_of_sets', number_of_sets), ('format', matches_format)),
+            parse_score,
+            (
+                ('games_equality', games_equality),
+                ('games_too_small', games_too_small),
+                ('number_of_won_sets', number_of_won_sets),
+                ('set_complete', set_complete),
+                ('match_decided', match_decided),
+            ),
+            self.FAIL_FAST_REORDER_INTERVAL,
+        )
+
     def _generate_re_pattern(self):
-        _games = self.rules.games + 1
+        # the format of the automaton as a regular expression for scores with a
+        # number of sets in range, used by is_valid; separators of ScoreFormat
+        # have no special meaning in patterns
+        _games = _games_pattern(self.plan.max_games)
         _sep = self.score_format.game_sep
-        req_set_pattern = f'[0-{_games}]{_sep}[0-{_games}](\\(\\d+\\))?'
-        aux_set_pattern = f'( {req_set_pattern})?'
-        tb_set_pattern = r'( \d+:\d+)?'
-        req_sets = []
-        aux_sets = []
-        for i in range(self.rules.sets):
-            if i <= self.rules.sets // 2:
-                req_sets.append(req_set_pattern)
-            else:
-                aux_sets.append(aux_set_pattern)
-        if self.rules.last_set == LastSet.TIEBREAK_SET:
-            if aux_sets:
-                aux_sets[-1] = tb_set_pattern
-            else:
-                aux_sets.append(tb_set_pattern)
-        return f"{' '.join(req_sets)}{''.join(aux_sets)}"
+        _set_sep = self.score_format.set_sep
+        req_set_pattern = f'{_games}{_sep}{_games}(\\([0-9]+\\))?'
+        # sets played on until a two games lead, see RulesPlan.max_set_games
+        played_on_set_pattern = f'[0-9]+{_sep}[0-9]+'
+        set_patterns = [
+            req_set_pattern if max_games is not None else played_on_set_pattern
+            for max_games in self.plan.max_set_games
+        ]
+        req_sets = set_patterns[: self.plan.sets_to_win]
+        aux_sets = set_patterns[self.plan.sets_to_win :]
+        if played_on_set_pattern in aux_sets:
+            # optional sets are nested, so the played on set matches its own
+            # position only
+            aux_pattern = ''
+            for set_pattern in reversed(aux_sets):
+                aux_pattern = f'({_set_sep}{set_pattern}{aux_pattern})?'
+        else:
+            aux_pattern = ''.join(f'({_set_sep}{set_pattern})?' for set_pattern in aux_sets)
+        return f'{_set_sep.join(req_sets)}{aux_pattern}'
+
+    def _matches_format(self, score):
+        # the format of the automaton by regular expressions only, a score with too
+        # many sets has a valid format if its sets up to the maximum number have
+        if score.count(self.score_format.set_sep) >= self.plan.sets:
+            return self._re_too_many_sets.match(score) is not None
+        return self.re_pattern.fullmatch(score) is not None
 
     def _validate_by_regexp(self, score):
-        if not isinstance(score, str) or not self.re_pattern.match(score):
-            return validation.Invalid(['Score has invalid format'])
+        if not isinstance(score, str) or not self._matches_format(score):
+            return validation.Invalid([ScoreError(ErrorCode.INVALID_FORMAT, 0, score)])
         else:
             return validation.Valid(score)
 
     def _validate_number_of_sets(self, score):
-        sets = score.split(self.score_format.set_sep)
-        if len(sets) > self.rules.sets:
-            return validation.Invalid(['Number of sets is too large'])
-        elif len(sets) < self.rules.sets // 2 + 1:
-            return validation.Invalid(['Number of sets is too small'])
+        number_of_sets = score.count(self.score_format.set_sep) + 1
+        if number_of_sets > self.plan.sets:
+            return validation.Invalid([ScoreError(ErrorCode.TOO_MANY_SETS, 0, number_of_sets)])
+        elif number_of_sets < self.plan.sets_to_win:
+            return validation.Invalid([ScoreError(ErrorCode.TOO_FEW_SETS, 0, number_of_sets)])
         else:
             return validation.Valid(score)
 
     def _parse_score(self, score):
-        try:
-            self.sets = common.parse_score(score)
-        except Exception:
-            return validation.Invalid(['Unable to parse the score'])
-        return validation.Valid(score)
+        sets = common.try_parse_score(
+            score, self.score_format.set_sep, self.score_format.game_sep
+        )
+        if sets is None:
+            return validation.Invalid([ScoreError(ErrorCode.UNPARSABLE_SCORE, 0, score)])
+        return validation.Valid(ParsedScore(score=score, sets=sets))
 
-    def _validate_number_of_won_sets(self, score):
-        won_sets = Counter([s.unit_one_games > s.unit_two_games for s in self.sets])
-        required_number_of_sets_to_win = self.rules.sets // 2 + 1
-        if (
-            won_sets[0] > required_number_of_sets_to_win
-            or won_sets[1] > required_number_of_sets_to_win
-        ):
-            return validation.Invalid(['Number of won sets is too large'])
+    def _validate_number_of_won_sets(self, parsed):
+        if has_too_many_won_sets(self.plan, parsed.sets):
+            return validation.Invalid(
+                [ScoreError(ErrorCode.TOO_MANY_WON_SETS, 0, count_won_sets(parsed.sets))]
+            )
         else:
-            return validation.Valid(score)
+            return validation.Valid(parsed)
 
-    def _validate_games_have_too_small_numbers(self, score):
-        for i, s in enumerate(self.sets, 1):
-            if (
-                self.rules.last_set == LastSet.TIEBREAK_SET
-                and i == len(self.sets)
-                and s.unit_one_games < self.rules.tb_set_points_to_win
-                and s.unit_two_games < self.rules.tb_set_points_to_win
-            ) or (s.unit_one_games < self.rules.games and s.unit_two_games < self.rules.games):
-                return validation.Invalid(
-                    [f'Set {i} has invalid number of games: value is too small']
-                )
-        return validation.Valid(score)
+    def _validate_games_have_too_small_numbers(self, parsed):
+        for i, s in enumerate(parsed.sets):
+            if has_too_small_games(self.plan, i, s):
+                return validation.Invalid([ScoreError(ErrorCode.GAMES_TOO_SMALL, i + 1, s)])
+        return validation.Valid(parsed)
 
-    def _validate_games_equality(self, score):
-        for i, s in enumerate(self.sets, 1):
-            if s.unit_one_games == s.unit_two_games:
-                return validation.Invalid(
-                    [f'Set {i} has invalid number of games: games cannot be equal']
-                )
-        return validation.Valid(score)
+    def _validate_games_equality(self, parsed):
+        for i, s in enumerate(parsed.sets, 1):
+            if has_equal_games(s):
+                return validation.Invalid([ScoreError(ErrorCode.GAMES_EQUAL, i, s)])
+        return validation.Valid(parsed)
 
-    def _validate_games_have_too_large_numbers(self, score):  ####### incomplete yet
-        for i, s in enumerate(self.sets, 1):
-            if (
-                self.rules.last_set not in (LastSet.TIEBREAK_SET, LastSet.NO_TIEBREAK)
-                and i == len(self.sets)
-                and s.unit_one_games > self.rules.tb_set_points_to_win + 1
-                and s.unit_two_games < self.rules.tb_set_points_to_win + 1
-            ) or (
-                s.unit_one_games > self.rules.games + 1 or s.unit_two_games > self.rules.games + 1
-            ):
-                return validation.Invalid(
-                    [f'Set {i} has invalid number of games: value is too small']
-                )
-        return validation.Valid(score)
+    def _validate_sets_complete(self, parsed):
+        for i, s in enumerate(parsed.sets):
+            if not is_set_complete(self.plan, i, s):
+                return validation.Invalid([ScoreError(ErrorCode.SET_INCOMPLETE, i + 1, s)])
+        return validation.Valid(parsed)
+
+    def _validate_match_decided(self, parsed):
+        code = check_decided(self.plan, parsed.sets)
+        if code:
+            return validation.Invalid([ScoreError(code, 0, len(parsed.sets))])
+        return validation.Valid(parsed)
+
+    @staticmethod
+    def _unwrap_score(parsed):
+        return validation.Valid(parsed.score)
+
+    def _validate_games_have_too_large_numbers(self, parsed):
+        for i, s in enumerate(parsed.sets, 1):
+            max_games = self.plan.max_set_games[i - 1]
+            if max_games is not None and max(s.unit_one_games, s.unit_two_games) > max_games:
+                return validation.Invalid([ScoreError(ErrorCode.GAMES_TOO_LARGE, i, s)])
+        return validation.Valid(parsed)
+
+    def _validate_set_games(self, i, s):
+        errors = []
+        if has_too_small_games(self.plan, i - 1, s):
+            errors.append(ScoreError(ErrorCode.GAMES_TOO_SMALL, i, s))
+        if has_too_large_games(self.plan, i - 1, s):
+            errors.append(ScoreError(ErrorCode.GAMES_TOO_LARGE, i, s))
+        if has_equal_games(s):
+            errors.append(ScoreError(ErrorCode.GAMES_EQUAL, i, s))
+        # a set with too small, too large or equal games is not complete either
+        if not errors and not is_set_complete(self.plan, i - 1, s):
+            errors.append(ScoreError(ErrorCode.SET_INCOMPLETE, i, s))
+        return validation.Invalid(errors) if errors else validation.Valid(s)
+
+
+def _games_pattern(max_games):
+    """Returns the pattern of games from 0 to ``max_games`` without leading zeros,
+    longer numbers first, so that a match does not stop after the first digit."""
+    if max_games < 10:
+        return f'[0-{max_games}]'
+    tens, units = divmod(max_games, 10)
+    numbers = [f'{tens}[0-{units}]']
+    if tens == 2:
+        numbers.append('1[0-9]')
+    elif tens > 2:
+        numbers.append(f'[1-{tens - 1}][0-9]')
+    numbers.append('[0-9]')
+    return f"(?:{'|'.join(numbers)})"
+
+
+def sets_pattern(score_format, plan, count):
+    """Returns the pattern of the format of ``ScoreAutomaton`` for the number of
+    sets, with games and tiebreak points of every set in 3 groups."""
+    games = f'({_games_pattern(plan.max_games)})'
+    sep = score_format.game_sep
+    set_pattern = f'{games}{sep}{games}(?:\\(([0-9]+)\\))?'
+    tiebreak_set_pattern = f'([0-9]+){sep}([0-9]+)()'
+    return score_format.set_sep.join(
+        set_pattern if max_games is not None else tiebreak_set_pattern
+        for max_games in plan.max_set_games[:count]
+    )
+
+
+class _FailFast:
+    """Boolean validation stopping at the first failed check.
+
+    Checks of the score run before parsing, checks of the parsed sets after it.
+    Within each group checks are independent, so they are reordered by the number
+    of rejections every ``interval`` calls. Counters are not locked: under threads
+    some increments may be lost, which only affects the order.
+    """
+
+    def __init__(self, score_checks, parse, sets_checks, interval):
+        self._score_checks = tuple(score_checks)
+        self._parse = parse
+        self._sets_checks = tuple(sets_checks)
+        self._interval = interval
+        self._calls = 0
+        self._rejections = dict.fromkeys(
+            [name for name, _ in self._score_checks + self._sets_checks], 0
+        )
+
+    def __call__(self, score):
+        if not isinstance(score, str):
+            return False
+        self._calls += 1
+        if self._interval and self._calls % self._interval == 0:
+            self._reorder()
+        for name, check in self._score_checks:
+            if not check(score):
+                self._rejections[name] += 1
+                return False
+        sets = self._parse(score)
+        if sets is None:
+            return False
+        for name, check in self._sets_checks:
+            if not check(sets):
+                self._rejections[name] += 1
+                return False
+        return True
+
+    def order(self):
+        return tuple(name for name, _ in self._score_checks + self._sets_checks)
+
+    def _reorder(self):
+        rejections = self._rejections
+
+        def most_rejecting_first(item):
+            return -rejections[item[0]]
+
+        # sorting is stable, checks with equal counts keep the order of their cost
+        self._score_checks = tuple(sorted(self._score_checks, key=most_rejecting_first))
+        self._sets_checks = tuple(sorted(self._sets_checks, key=most_rejecting_first))
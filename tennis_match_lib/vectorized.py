@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+"""Vectorized module provides NumPy based parsing of whole score columns.
+
+Requires the optional ``numpy`` dependency (``pip install tennis-match-lib[numpy]``).
+"""
+
+try:
+    import numpy as np
+except ImportError as ex:  # pragma: no cover
+    raise ImportError(
+        'tennis_match_lib.vectorized requires numpy: pip install tennis-match-lib[numpy]'
+    ) from ex
+
+
+NO_TIEBREAK = -1
+
+STATS_INFO_DTYPE = np.dtype(
+    [
+        ('unit_one_sets_diff', 'i1'),
+        ('unit_two_sets_diff', 'i1'),
+        ('unit_one_games_diff', 'i2'),
+        ('unit_two_games_diff', 'i2'),
+    ]
+)
+
+_MAX_GAMES = np.iinfo(np.uint8).max
+_MAX_TIEBREAK = np.iinfo(np.int16).max
+_OPEN_BRACKET = ord('(')
+_CLOSE_BRACKET = ord(')')
+_UNIT_ONE_GAMES, _UNIT_TWO_GAMES, _TIEBREAK, _SET_END, _DONE, _ERROR = range(6)
+
+
+def score_dtype(rules):
+    """Returns structured dtype of parsed scores for the given match rules.
+
+    Args:
+        rules (tennis_match_lib.rules.MatchRules): Match rules.
+
+    Returns:
+        numpy.dtype: Structured dtype with ``sets_count``, ``games`` (games of both units
+        per set), ``tiebreak`` (tiebreak points per set, -1 if none) and ``valid`` fields.
+    """
+    return np.dtype(
+        [
+            ('sets_count', 'u1'),
+            ('games', 'u1', (rules.sets, 2)),
+            ('tiebreak', 'i2', (rules.sets,)),
+            ('valid', '?'),
+        ]
+    )
+
+
+def parse_scores(scores, score_format, rules):
+    """Parses a whole array of scores at once.
+
+    The scores are scanned column by column: each step advances the same state
+    machine as ``common.parse_score`` for every row at once, so the number of
+    Python level iterations depends on the longest score, not on the number of
+    scores.
+
+    A row is marked as not valid if it can't be parsed or has more sets than the
+    rules allow; all its other fields are zeroed (``tiebreak`` is -1).
+
+    Args:
+        scores (iterable): Tennis match scores (``str`` or ASCII ``bytes``).
+        score_format (tennis_match_lib.score_format.ScoreFormat): Score format.
+        rules (tennis_match_lib.rules.MatchRules): Match rules.
+
+    Returns:
+        numpy.ndarray: Structured array of ``score_dtype(rules)``.
+    """
+    chars = _as_char_matrix(scores)
+    rows_count, width = chars.shape
+    max_sets = rules.sets
+    set_sep = ord(score_format.set_sep)
+    game_sep = ord(score_format.game_sep)
+
+    result = np.zeros(rows_count, dtype=score_dtype(rules))
+    games = result['games']
+    tiebreak = result['tiebreak']
+    tiebreak[:] = NO_TIEBREAK
+
+    state = np.zeros(rows_count, dtype=np.uint8)
+    value = np.full(rows_count, -1, dtype=np.int32)
+    unit_one = np.zeros(rows_count, dtype=np.int32)
+    unit_two = np.zeros(rows_count, dtype=np.int32)
+    sets_count = np.zeros(rows_count, dtype=np.int32)
+
+    def _store_set(mask, one, two, points):
+        fits = mask & (sets_count < max_sets) & (one <= _MAX_GAMES) & (two <= _MAX_GAMES)
+        if points is not None:
+            fits &= points <= _MAX_TIEBREAK
+        rows = np.flatnonzero(fits)
+        positions = sets_count[rows]
+        games[rows, positions, 0] = one[rows]
+        games[rows, positions, 1] = two[rows]
+        if points is not None:
+            tiebreak[rows, positions] = points[rows]
+        sets_count[rows] += 1
+        return mask & ~fits
+
+    for column in range(width):
+        char = chars[:, column]
+        active = state < _DONE
+        if not active.any():
+            break
+        is_digit = (char >= 48) & (char <= 57)
+        is_end = char == 0
+        has_value = value >= 0
+        reading = active & (state < _SET_END)
+
+        digit = reading & is_digit
+        game = active & (char == game_sep) & (state == _UNIT_ONE_GAMES) & has_value
+        set_after_games = active & (char == set_sep) & (state == _UNIT_TWO_GAMES) & has_value
+        open_tiebreak = active & (char == _OPEN_BRACKET) & (state == _UNIT_TWO_GAMES) & has_value
+        close_tiebreak = active & (char == _CLOSE_BRACKET) & (state == _TIEBREAK) & has_value
+        set_after_tiebreak = active & (char == set_sep) & (state == _SET_END)
+        end_after_games = active & is_end & (state == _UNIT_TWO_GAMES) & has_value
+        end_after_tiebreak = active & is_end & (state == _SET_END)
+        error = active & ~(
+            digit
+            | game
+            | set_after_games
+            | open_tiebreak
+            | close_tiebreak
+            | set_after_tiebreak
+            | end_after_games
+            | end_after_tiebreak
+        )
+
+        digit_value = char[digit].astype(np.int32) - 48
+        value[digit] = np.where(value[digit] < 0, digit_value, value[digit] * 10 + digit_value)
+        np.minimum(value, _MAX_TIEBREAK + 1, out=value)
+
+        unit_one[game] = value[game]
+        unit_two[open_tiebreak] = value[open_tiebreak]
+        error |= _store_set(set_after_games | end_after_games, unit_one, value, None)
+        error |= _store_set(close_tiebreak, unit_one, unit_two, value)
+
+        value[game | set_after_games | open_tiebreak | close_tiebreak] = -1
+        state[game] = _UNIT_TWO_GAMES
+        state[set_after_games | set_after_tiebreak] = _UNIT_ONE_GAMES
+        state[open_tiebreak] = _TIEBREAK
+        state[close_tiebreak] = _SET_END
+        state[end_after_games | end_after_tiebreak] = _DONE
+        state[error] = _ERROR
+
+    valid = state == _DONE
+    result['sets_count'] = np.where(valid, sets_count, 0)
+    result['valid'] = valid
+    games[~valid] = 0
+    tiebreak[~valid] = NO_TIEBREAK
+    return result
+
+
+def calculate_stats_info(parsed, rules):
+    """Calculates sets and games differences of parsed scores with array operations.
+
+    Mirrors ``Parser._calculate_stats_info``: a set won in the deciding tiebreak set
+    (``LastSet.TIEBREAK_SET``) counts as a single game and an unfinished last set is
+    not counted in the sets diff. Rows which are not valid get zero differences.
+
+    Args:
+        parsed (numpy.ndarray): Result of ``parse_scores``.
+        rules (tennis_match_lib.rules.MatchRules): Match rules used to parse the scores.
+
+    Returns:
+        numpy.ndarray: Structured array of ``STATS_INFO_DTYPE``.
+    """
+    games = parsed['games'].astype(np.int16)
+    sets_count = parsed['sets_count']
+    played = np.arange(rules.sets) < sets_count[:, np.newaxis]
+    diff = np.where(played, games[:, :, 0] - games[:, :, 1], 0)
+
+    plan = rules.compile()
+    counted = played & ~(
+        (np.arange(rules.sets) == sets_count[:, np.newaxis] - 1)
+        & ~_is_last_set_complete(parsed, plan)[:, np.newaxis]
+    )
+    unit_one_sets = np.count_nonzero((diff > 0) & counted, axis=1)
+    sets_diff = 2 * unit_one_sets - np.count_nonzero(counted, axis=1)
+
+    if plan.tiebreak_set_position >= 0:
+        deciding = sets_count == plan.sets
+        diff[deciding, -1] = np.where(diff[deciding, -1] > 0, 1, -1)
+    games_diff = diff.sum(axis=1)
+
+    result = np.zeros(len(parsed), dtype=STATS_INFO_DTYPE)
+    result['unit_one_sets_diff'] = sets_diff
+    result['unit_two_sets_diff'] = -sets_diff
+    result['unit_one_games_diff'] = games_diff
+    result['unit_two_games_diff'] = -games_diff
+    return result
+
+
+def _is_last_set_complete(parsed, plan):
+    # mirrors rules.is_set_complete for the last set of every row
+    rows = np.arange(len(parsed))
+    last = np.maximum(parsed['sets_count'].astype(np.intp) - 1, 0)
+    games = parsed['games'][rows, last].astype(np.int16)
+    winner = games.max(axis=1)
+    loser = games.min(axis=1)
+    min_winner_games = np.array(plan.min_winner_games)[last]
+    played_on = np.array([max_games is None for max_games in plan.max_set_games])[last]
+    has_tiebreak = parsed['tiebreak'][rows, last] != NO_TIEBREAK
+    tiebreak_at = plan.tiebreak_at
+    decided_by_tiebreak = (winner == tiebreak_at + 1) & (loser == tiebreak_at)
+    regular = (winner == min_winner_games) & (loser <= min_winner_games - 2)
+    played_on_complete = ~has_tiebreak & (
+        regular | ((winner > min_winner_games) & (winner - loser == 2))
+    )
+    bounded_complete = decided_by_tiebreak | (
+        ~has_tiebreak & (regular | ((winner == tiebreak_at + 1) & (loser == tiebreak_at - 1)))
+    )
+    return np.where(played_on, played_on_complete, bounded_complete)
+
+
+def _as_char_matrix(scores):
+    if not isinstance(scores, np.ndarray):
+        scores = np.asarray(list(scores))
+    if scores.dtype.kind not in 'SU':
+        scores = scores.astype(str)
+    # unicode arrays are viewed as UCS4 code points, non ASCII ones never match
+    char_type = np.uint32 if scores.dtype.kind == 'U' else np.uint8
+    width = scores.dtype.itemsize // np.dtype(char_type).itemsize
+    # extra zero column guarantees that every score ends with the end marker
+    chars = np.zeros((len(scores), width + 1), dtype=char_type)
+    if width:
+        chars[:, :width] = scores.view(char_type).reshape(len(scores), width)
+    return chars
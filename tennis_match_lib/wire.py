@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+"""Wire module provides compact binary encoding of parsed matches.
+
+A record of a parsed match is::
+
+    set count    uint8, outcome (``MatchOutcome``) in the high 4 bits
+    tiebreaks    uint8, bit i is set if set i has tiebreak points
+    sets diff    int8, of unit one
+    games diff   int16, of unit one
+    games        2 x uint8 per set
+    tiebreak     uint8 per set with tiebreak points, in set order
+
+so a three sets match takes 11 to 14 bytes. Diffs of unit two are the negated diffs
+of unit one, as computed by ``Parser``. A stream of records is framed as::
+
+    magic        b'TMW1'
+    records
+    offsets      uint32 per record and one for the end of the last record
+    footer       offsets position uint64, record count uint32, magic b'TMW1'
+
+All numbers are little-endian. ``WireReader`` reads the stream in place from any
+buffer, e.g. ``bytes`` or ``mmap``, and exposes records as lazy views.
+"""
+
+import io
+import mmap
+import struct
+
+from tennis_match_lib.parser import ParseResult
+from tennis_match_lib.structs import BasicMatchStatsInfo, MatchOutcome, SetScore
+
+
+MAGIC = b'TMW1'
+MAX_SETS = 8
+
+_HEADER = struct.Struct('<BBbh')
+_OFFSET = struct.Struct('<I')
+_FOOTER = struct.Struct('<QI4s')
+_MAGIC = struct.Struct('4s')
+# games and tiebreak points of every number of sets, read with a single call
+_BYTES = [struct.Struct(f'{count}B') for count in range(2 * MAX_SETS + 1)]
+
+
+def encode_record(parse_result):
+    """Encodes a parse result into a record.
+
+    Args:
+        parse_result (tennis_match_lib.parser.ParseResult): Parse result.
+
+    Returns:
+        bytes: Record.
+
+    Raises:
+        ValueError: If the match has more than ``MAX_SETS`` sets or a value does not
+            fit its field.
+    """
+    sets, stats_info, outcome = parse_result
+    if len(sets) > MAX_SETS:
+        raise ValueError(f'Too many sets to encode: {len(sets)}')
+    games = bytearray()
+    tiebreaks = bytearray()
+    mask = 0
+    try:
+        for i, s in enumerate(sets):
+            games.append(s.unit_one_games)
+            games.append(s.unit_two_games)
+            if s.tiebreak is not None:
+                mask |= 1 << i
+                tiebreaks.append(s.tiebreak)
+        header = _HEADER.pack(
+            len(sets) | outcome << 4,
+            mask,
+            stats_info.unit_one_sets_diff,
+            stats_info.unit_one_games_diff,
+        )
+    except (ValueError, struct.error) as ex:
+        raise ValueError(f'Unable to encode {parse_result}: {ex}') from ex
+    return header + games + tiebreaks
+
+
+def encode_many(parse_results):
+    """Encodes parse results into a framed stream.
+
+    Args:
+        parse_results (iterable): ``ParseResult`` values.
+
+    Returns:
+        bytes: Stream readable by ``WireReader``.
+    """
+    stream = io.BytesIO()
+    with WireWriter(stream) as writer:
+        for parse_result in parse_results:
+            writer.write(parse_result)
+    return stream.getvalue()
+
+
+class WireWriter:
+    """Writes parse results as a framed stream to a binary file.
+
+    The offsets and the footer are written by ``close``, so records can be
+    written one by one without keeping them in memory.
+
+    Args:
+        file (io.RawIOBase): Binary file open for writing.
+    """
+
+    def __init__(self, file):
+        self._file = file
+        self._offsets = bytearray()
+        self._position = file.write(MAGIC)
+        self._count = 0
+        self._closed = False
+
+    def write(self, parse_result):
+        """Appends a parse result to the stream."""
+        record = encode_record(parse_result)
+        if self._position + len(record) > 0xFFFFFFFF:
+            raise ValueError('Wire stream is limited to 4 GiB')
+        self._offsets += _OFFSET.pack(self._position)
+        self._position += self._file.write(record)
+        self._count += 1
+
+    def close(self):
+        """Writes the offsets and the footer, the file itself is not closed."""
+        if self._closed:
+            return
+        self._closed = True
+        self._offsets += _OFFSET.pack(self._position)
+        self._file.write(self._offsets)
+        self._file.write(_FOOTER.pack(self._position, self._count, MAGIC))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class WireReader:
+    """Sequence of lazily decoded records of a framed stream.
+
+    Nothing is copied from the buffer: records are read with ``struct`` from a
+    ``memoryview`` over it, when they are accessed.
+
+    Args:
+        buffer: Object supporting the buffer protocol, e.g. ``bytes`` or ``mmap``.
+
+    Raises:
+        ValueError: If the buffer is not a wire stream.
+    """
+
+    def __init__(self, buffer):
+        self._view = memoryview(buffer).cast('B')
+        self._mmap = None
+        try:
+            self._offsets_position, self._count = self._read_footer(self._view)
+        except ValueError:
+            self._view.release()
+            raise
+
+    @classmethod
+    def open(cls, path):
+        """Maps the file into memory and returns a reader of it, use it with ``with``.
+
+        Args:
+            path (str): File path.
+
+        Returns:
+            WireReader: Reader.
+        """
+        with open(path, 'rb') as wire_file:
+            mapped = mmap.mmap(wire_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            reader = cls(mapped)
+        except ValueError:
+            mapped.close()
+            raise
+        reader._mmap = mapped
+        return reader
+
+    def close(self):
+        """Releases the buffer, records can't be accessed afterwards."""
+        self._view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('record index out of range')
+        return WireRecord(self._view, self._offset(index))
+
+    def __iter__(self):
+        view = self._view
+        for index in range(self._count):
+            yield WireRecord(view, self._offset(index))
+
+    def iter_stats(self):
+        """Yields ``(sets_diff, games_diff)`` of unit one for every record."""
+        view = self._view
+        unpack_header = _HEADER.unpack_from
+        unpack_offset = _OFFSET.unpack_from
+        position = self._offsets_position
+        for _ in range(self._count):
+            _, _, sets_diff, games_diff = unpack_header(view, unpack_offset(view, position)[0])
+            position += _OFFSET.size
+            yield sets_diff, games_diff
+
+    def _offset(self, index):
+        return _OFFSET.unpack_from(self._view, self._offsets_position + index * _OFFSET.size)[0]
+
+    @staticmethod
+    def _read_footer(view):
+        if len(view) < len(MAGIC) + _OFFSET.size + _FOOTER.size:
+            raise ValueError('Buffer is too short for a wire stream')
+        offsets_position, count, magic = _FOOTER.unpack_from(view, len(view) - _FOOTER.size)
+        (head,) = _MAGIC.unpack_from(view, 0)
+        if head != MAGIC or magic != MAGIC:
+            raise ValueError('Buffer is not a wire stream')
+        if offsets_position + (count + 1) * _OFFSET.size + _FOOTER.size != len(view):
+            raise ValueError('Wire stream is truncated')
+        return offsets_position, count
+
+
+class WireRecord:
+    """Lazy view of a record, valid while its reader is open.
+
+    Args:
+        view (memoryview): Stream.
+        start (int): Position of the record in the stream.
+    """
+
+    __slots__ = ('_view', '_start', '_set_count', '_mask', 'sets_diff', 'games_diff')
+
+    def __init__(self, view, start):
+        self._view = view
+        self._start = start
+        self._set_count, self._mask, self.sets_diff, self.games_diff = _HEADER.unpack_from(
+            view, start
+        )
+        self._set_count &= 0x0F
+
+    def __len__(self):
+        return self._set_count
+
+    def games(self, index):
+        """Returns games of both units in the set."""
+        self._check_index(index)
+        position = self._start + _HEADER.size + 2 * index
+        return self._view[position], self._view[position + 1]
+
+    def tiebreak(self, index):
+        """Returns tiebreak points of the set, None if the set has no tiebreak."""
+        self._check_index(index)
+        if not self._mask >> index & 1:
+            return None
+        preceding = bin(self._mask & ((1 << index) - 1)).count('1')
+        return self._view[self._start + _HEADER.size + 2 * self._set_count + preceding]
+
+    def has_tiebreak(self):
+        return self._mask != 0
+
+    @property
+    def outcome(self):
+        return MatchOutcome(self._view[self._start] >> 4)
+
+    @property
+    def sets(self):
+        """list: ``SetScore`` of every set."""
+        count = self._set_count
+        position = self._start + _HEADER.size
+        games = _BYTES[2 * count].unpack_from(self._view, position)
+        mask = self._mask
+        if not mask:
+            return [SetScore(games[2 * i], games[2 * i + 1]) for i in range(count)]
+        tiebreaks = iter(
+            _BYTES[bin(mask).count('1')].unpack_from(self._view, position + 2 * count)
+        )
+        return [
+            SetScore(games[2 * i], games[2 * i + 1], next(tiebreaks) if mask >> i & 1 else None)
+            for i in range(count)
+        ]
+
+    @property
+    def stats_info(self):
+        return BasicMatchStatsInfo(
+            unit_one_sets_diff=self.sets_diff,
+            unit_two_sets_diff=-self.sets_diff,
+            unit_one_games_diff=self.games_diff,
+            unit_two_games_diff=-self.games_diff,
+        )
+
+    def to_parse_result(self):
+        return ParseResult(sets=self.sets, stats_info=self.stats_info, outcome=self.outcome)
+
+    def _check_index(self, index):
+        if not 0 <= index < self._set_count:
+            raise IndexError('set index out of range')
+
+    def __repr__(self):
+        return (
+            f'WireRecord(sets={self.sets!r}, stats_info={self.stats_info!r}, '
+            f'outcome={self.outcome!r})'
+        )
@@ -0,0 +1,115 @@
+import pickle
+import random
+
+import pytest
+
+from tennis_match_lib.aggregate import StatsAggregate, UnitStats
+from tennis_match_lib.parser import Parser
+from tennis_match_lib.rules import MatchRules
+from tennis_match_lib.score_format import ScoreFormat
+from tennis_match_lib.wire import WireReader, encode_many
+
+
+MATCHES = [
+    ('alice', 'bob', '6:4 6:2'),
+    ('bob', 'alice', '6:7(5) 6:3 7:6(8)'),
+    ('alice', 'carol', '6:4 3:6 6:1'),
+    ('carol', 'bob', '7:6(2) 7:6(4)'),
+    ('bob', 'carol', '6:4 6:6'),
+]
+
+
+@pytest.fixture
+def parser():
+    return Parser(ScoreFormat.default(), MatchRules.pro_tour())
+
+
+@pytest.fixture
+def matches(parser):
+    return [(one, two, parser.parse(score)) for one, two, score in MATCHES]
+
+
+def test_unit_stats(matches):
+    aggregate = StatsAggregate().add_batch(matches)
+    assert aggregate.units() == ['alice', 'bob', 'carol']
+    assert aggregate.unit_stats('alice') == UnitStats(
+        matches=3,
+        matches_won=2,
+        matches_lost=1,
+        sets_won=5,
+        sets_lost=3,
+        games_diff=6 - 3 + 4,
+        tiebreaks_won=1,
+        tiebreaks_lost=1,
+        deciding_sets_won=1,
+        deciding_sets_lost=1,
+    )
+    assert aggregate.unit_stats('carol') == UnitStats(3, 1, 1, 3, 3, -4 + 2 - 2, 2, 0, 0, 1)
+    assert aggregate.unit_stats('dave') == UnitStats(*[0] * 10)
+    assert set(aggregate.table()) == {'alice', 'bob', 'carol'}
+
+
+def test_head_to_head(matches):
+    aggregate = StatsAggregate().add_batch(matches)
+    assert aggregate.head_to_head('alice', 'bob') == (1, 1)
+    # the match in progress has no winner yet
+    assert aggregate.head_to_head('carol', 'bob') == (1, 0)
+    assert aggregate.head_to_head('alice', 'dave') == (0, 0)
+    assert aggregate.head_to_head_matrix() == [
+        [0, 1, 1],
+        [1, 0, 0],
+        [0, 1, 0],
+    ]
+    assert aggregate.head_to_head_matrix(['carol', 'alice']) == [[0, 0], [1, 0]]
+
+
+def test_totals_are_symmetric(matches):
+    table = StatsAggregate().add_batch(matches).table()
+    assert sum(s.games_diff for s in table.values()) == 0
+    assert sum(s.sets_won for s in table.values()) == sum(s.sets_lost for s in table.values())
+    assert sum(s.matches for s in table.values()) == 2 * len(matches)
+
+
+def test_merge_equals_single_pass(parser):
+    rng = random.Random(7)
+    scores = ['6:4 6:2', '4:6 7:6(3) 6:3', '7:6(5) 4:6 2:6', '0:6 6:7(9)', '6:4 6:4']
+    matches = [
+        (rng.randrange(20), rng.randrange(20), parser.parse(rng.choice(scores)))
+        for _ in range(500)
+    ]
+    whole = StatsAggregate().add_batch(matches)
+    parts = [StatsAggregate().add_batch(matches[i : i + 64]) for i in range(0, 500, 64)]
+    parts = [pickle.loads(pickle.dumps(part)) for part in parts]
+    assert StatsAggregate.merged(parts) == whole
+    assert StatsAggregate.merged(reversed(parts)).table() == whole.table()
+
+
+def test_incremental_updates(matches):
+    aggregate = StatsAggregate().add_batch(matches[:2])
+    aggregate.add_batch(matches[2:])
+    assert aggregate == StatsAggregate().add_batch(matches)
+    assert aggregate != StatsAggregate().add_batch(matches[:4])
+
+
+def test_wire_records(matches):
+    records = WireReader(encode_many(parse_result for _, _, parse_result in matches))
+    aggregate = StatsAggregate().add_batch(
+        (one, two, record) for (one, two, _), record in zip(matches, records)
+    )
+    assert aggregate == StatsAggregate().add_batch(matches)
+
+
+def test_outcomes(parser):
+    matches = [
+        ('alice', 'bob', parser.parse('6:4 3:1 ret.')),
+        ('alice', 'carol', parser.parse('w/o')),
+        ('carol', 'bob', parser.parse('2:6 7:6(4) 1:0 def.')),
+        ('bob', 'carol', parser.parse('6:4 3:6 6:4 unf.')),
+    ]
+    aggregate = StatsAggregate().add_batch(matches)
+    assert aggregate.unit_stats('alice') == UnitStats(2, 2, 0, 1, 0, 4, 0, 0, 0, 0)
+    assert aggregate.unit_stats('carol') == UnitStats(3, 1, 1, 2, 2, -3, 1, 0, 0, 0)
+    assert aggregate.head_to_head('bob', 'carol') == (0, 1)
+    with_rules = StatsAggregate(MatchRules.pro_tour()).add_batch(matches)
+    # the last set of the match in progress is finished
+    assert with_rules.unit_stats('carol').sets_lost == 3
@@ -0,0 +1,170 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import time
+
+import pytest
+
+from tennis_match_lib.aio import ScorePipeline, process_stream
+from tennis_match_lib.rules import MatchRules
+from tennis_match_lib.score_format import ScoreFormat
+from tennis_match_lib.structs import SetScore
+
+
+SCORES = ['6:4 6:3', '6:7(5) 7:6(3) 6:1', '6:6', '6:4 2:6 x', '7:5 6:7(4) 7:6(2)']
+
+
+class FakeFeed:
+    """Local feed producer yielding scores in bursts, counting the pulled scores."""
+
+    def __init__(self, scores, burst=100, pause=0.0):
+        self.scores = scores
+        self.burst = burst
+        self.pause = pause
+        self.pulled = 0
+
+    async def __aiter__(self):
+        for score in self.scores:
+            self.pulled += 1
+            yield score
+            if self.pulled % self.burst == 0:
+                await asyncio.sleep(self.pause)
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes up a sleeping task."""
+
+    def __init__(self, interval=0.001):
+        self.interval = interval
+        self.lags = []
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    @property
+    def max_lag(self):
+        return max(self.lags, default=0.0)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.lags.append(loop.time() - started - self.interval)
+
+
+async def _run_feed(feed, pipeline):
+    monitor = LoopLagMonitor()
+    monitor.start()
+    started = time.perf_counter()
+    results = [result async for result in pipeline.process(feed)]
+    elapsed = time.perf_counter() - started
+    await monitor.stop()
+    return results, len(results) / elapsed, monitor
+
+
+@pytest.fixture
+def score_format():
+    return ScoreFormat.default()
+
+
+@pytest.fixture
+def rules():
+    return MatchRules.pro_tour()
+
+
+def test_results_in_order(score_format, rules):
+    scores = SCORES * 200
+    pipeline = ScorePipeline(score_format, rules, batch_size=7, max_pending=3)
+    results, throughput, monitor = asyncio.run(_run_feed(FakeFeed(scores, burst=13), pipeline))
+    assert [result.score for result in results] == scores
+    assert [result.validation.is_valid() for result in results[:5]] == [
+        True,
+        True,
+        False,
+        False,
+        True,
+    ]
+    assert results[0].parse_result.sets == [SetScore(6, 4), SetScore(6, 3)]
+    assert results[2].parse_result is None
+    assert throughput > 0
+    assert monitor.lags
+
+
+def test_loop_is_not_blocked(score_format, rules):
+    scores = SCORES * 2000
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pipeline = ScorePipeline(score_format, rules, executor=executor, batch_size=64)
+        results, _, monitor = asyncio.run(_run_feed(FakeFeed(scores, burst=1000), pipeline))
+    assert len(results) == len(scores)
+    # the monitor keeps ticking while the whole feed is processed
+    assert len(monitor.lags) > 10
+
+
+def test_process_executor(score_format, rules):
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        pipeline = ScorePipeline(score_format, rules, executor=executor, batch_size=50)
+        results, _, _ = asyncio.run(_run_feed(FakeFeed(SCORES * 40), pipeline))
+    assert [result.score for result in results] == SCORES * 40
+    assert results[1].parse_result.sets[1] == SetScore(7, 6, 3)
+
+
+def test_backpressure(score_format, rules):
+    feed = FakeFeed(SCORES * 1000, burst=10)
+
+    async def consume_slowly():
+        pipeline = ScorePipeline(score_format, rules, batch_size=10, max_pending=2)
+        consumed = 0
+        async for _ in pipeline.process(feed):
+            consumed += 1
+            if consumed == 30:
+                await asyncio.sleep(0.05)
+                # the source is not pulled further than the pending batches allow
+                assert feed.pulled <= consumed + 10 * 2 + 10 + 1
+                break
+
+    asyncio.run(consume_slowly())
+    assert feed.pulled < len(feed.scores)
+
+
+def test_slow_feed_is_not_delayed(score_format, rules):
+    async def slow_feed():
+        yield '6:4 6:3'
+        await asyncio.sleep(10)
+        yield '6:4 6:4'
+
+    async def first_result():
+        stream = process_stream(
+            slow_feed(), score_format, rules, batch_size=100, batch_timeout=0.01
+        )
+        result = await asyncio.wait_for(stream.__anext__(), timeout=1)
+        await stream.aclose()
+        return result
+
+    assert asyncio.run(first_result()).score == '6:4 6:3'
+
+
+def test_source_error_is_raised(score_format, rules):
+    async def broken_feed():
+        yield '6:4 6:3'
+        raise RuntimeError('feed is down')
+
+    async def consume():
+        return [result async for result in process_stream(broken_feed(), score_format, rules)]
+
+    with pytest.raises(RuntimeError, match='feed is down'):
+        asyncio.run(consume())
+
+
+def test_invalid_arguments(score_format, rules):
+    with pytest.raises(ValueError):
+        ScorePipeline(score_format, rules, batch_size=0)
+    with pytest.raises(ValueError):
+        ScorePipeline(score_format, rules, max_pending=0)
@@ -0,0 +1,125 @@
+import pytest
+
+from tennis_match_lib.archive import Archive, ArchiveWriter, write_archive
+from tennis_match_lib.parser import Parser
+from tennis_match_lib.rules import MatchRules
+from tennis_match_lib.score_format import ScoreFormat
+from tennis_match_lib.validator import Validator
+
+
+SCORES = [
+    '6:4 6:2',
+    '6:0 6:7(8) 7:5',
+    '4:6 6:7(5)',
+    '7:6(3) 3:6 6:4',
+    '6:4 6:6',
+    '1:6 2:6',
+    'not a score',
+]
+
+
+@pytest.fixture
+def archive(tmp_path):
+    path = str(tmp_path / 'matches.tma')
+    write_archive(path, SCORES, ScoreFormat.default(), MatchRules.pro_tour())
+    with Archive.open(path) as opened:
+        yield opened
+
+
+@pytest.fixture
+def parse_results():
+    parser = Parser(ScoreFormat.default(), MatchRules.pro_tour())
+    return [parser.parse(score) for score in SCORES[:-1]]
+
+
+def test_matches(archive, parse_results):
+    assert len(archive) == len(parse_results)
+    assert archive.rules == [MatchRules.pro_tour()]
+    for row, expected in enumerate(parse_results):
+        assert archive.match(row).to_parse_result() == expected
+
+
+def test_columns(archive, parse_results):
+    validator = Validator(ScoreFormat.default(), MatchRules.pro_tour())
+    assert list(archive.column('set_count')) == [2, 3, 2, 3, 2, 2]
+    assert list(archive.column('winner')) == [1, 1, 2, 1, 1, 2]
+    assert list(archive.column('tiebreaks')) == [0, 1, 1, 1, 0, 0]
+    assert list(archive.column('valid')) == [validator.is_valid(s) for s in SCORES[:-1]]
+    assert list(archive.column('games_diff')) == [
+        r.stats_info.unit_one_games_diff for r in parse_results
+    ]
+    with pytest.raises(KeyError):
+        archive.column('games=6')
+
+
+def test_select(archive):
+    assert list(archive.select(set_count=3)) == [1, 3]
+    assert list(archive.select(winner=2)) == [2, 5]
+    assert list(archive.select(set_count=2, winner=1)) == [0, 4]
+    assert list(archive.select(winner=0)) == []
+    assert list(archive.select(rules=MatchRules.pro_tour(), winner=1, set_count=3)) == [1, 3]
+    assert list(archive.select(rules=MatchRules.club())) == []
+    assert list(archive.select(set_count=5)) == []
+    assert list(archive.select()) == list(range(6))
+
+
+def test_aggregates(archive, parse_results):
+    total = sum(r.stats_info.unit_one_games_diff for r in parse_results)
+    assert archive.games_diff_total() == total
+    assert archive.tiebreak_frequency() == 3 / 14
+    assert archive.count('tiebreaks') == 3
+    rows = archive.select(winner=2)
+    assert archive.games_diff_total(rows) == -3 - 9
+    assert archive.tiebreak_frequency(rows) == 1 / 4
+    assert archive.total('games', rows) == 23 + 15
+    assert archive.tiebreak_frequency(archive.select(set_count=5)) == 0.0
+
+
+def test_mixed_rules(tmp_path):
+    path = str(tmp_path / 'mixed.tma')
+    club = Parser(ScoreFormat.default(), MatchRules.club())
+    pro_tour = Parser(ScoreFormat.default(), MatchRules.pro_tour())
+    with ArchiveWriter(path) as writer:
+        writer.add(pro_tour.parse('6:4 6:2'), MatchRules.pro_tour())
+        writer.add(club.parse('6:4 3:6 10:8'), MatchRules.club(), valid=False)
+        writer.add(pro_tour.parse('6:4 3:6 6:1'), MatchRules.pro_tour())
+    with Archive.open(path) as archive:
+        assert archive.rules == [MatchRules.pro_tour(), MatchRules.club()]
+        assert list(archive.select(rules=MatchRules.club())) == [1]
+        assert list(archive.select(rules=MatchRules.pro_tour(), set_count=3)) == [2]
+        assert list(archive.column('valid')) == [1, 0, 1]
+
+
+def test_empty_archive(tmp_path):
+    path = str(tmp_path / 'empty.tma')
+    assert write_archive(path, [], ScoreFormat.default(), MatchRules.pro_tour()) == 0
+    with Archive.open(path) as archive:
+        assert len(archive) == 0
+        assert archive.games_diff_total() == 0
+        assert archive.tiebreak_frequency() == 0.0
+
+
+def test_invalid_archive(tmp_path):
+    path = tmp_path / 'invalid.tma'
+    path.write_bytes(b'TMW1 is not an archive')
+    with pytest.raises(ValueError):
+        Archive.open(str(path))
+    with pytest.raises(ValueError):
+        Archive(b'')
+
+
+def test_values_out_of_range(tmp_path):
+    path = str(tmp_path / 'overflow.tma')
+    parser = Parser(ScoreFormat.default(), MatchRules.club())
+    with ArchiveWriter(path) as writer:
+        assert writer.add(parser.parse('6:4 6:2'), MatchRules.club())
+        assert not writer.add(parser.parse('6:4 7:6(300)'), MatchRules.club())
+        assert not writer.add(parser.parse('6:4 40000:0'), MatchRules.pro_tour())
+        assert writer.rows == 1
+        assert writer.rules == [MatchRules.club()]
+    scores = ['6:4 7:6(300)', '6:4 3:6 10:8', '6:4 ' * 200 + '6:3']
+    assert write_archive(path, scores, ScoreFormat.default(), MatchRules.club()) == 1
+    with Archive.open(path) as archive:
+        assert len(archive) == 1
+        assert archive.match(0).to_parse_result() == parser.parse('6:4 3:6 10:8')
+        assert list(archive.column('set_count')) == [3]
@@ -0,0 +1,132 @@
+import random
+
+import pytest
+
+from tennis_match_lib.automaton import ScoreAutomaton
+from tennis_match_lib.errors import ErrorCode
+from tennis_match_lib.instrumentation import InMemoryCollector
+from tennis_match_lib.rules import GamesCount, LastSet, MatchRules, SetsCount
+from tennis_match_lib.score_format import ScoreFormat
+from tennis_match_lib.structs import SetScore
+from tennis_match_lib.validator import Validator, _games_pattern
+
+
+RULES = [
+    MatchRules.pro_tour(),
+    MatchRules.club(),
+    MatchRules.club_short(),
+    MatchRules.grand_slam(),
+    MatchRules.fast4(),
+    MatchRules(SetsCount.THREE, GamesCount.SIX, LastSet.NO_TIEBREAK),
+    MatchRules(SetsCount.ONE, GamesCount.SIX, LastSet.TIEBREAK_SET),
+    MatchRules(SetsCount.FIVE, GamesCount.FOUR, LastSet.TIEBREAK_SET),
+]
+SCORE_FORMATS = [ScoreFormat(' ', ':'), ScoreFormat(' ', '-'), ScoreFormat(' ', '/')]
+
+
+@pytest.fixture
+def automaton():
+    return ScoreAutomaton(ScoreFormat.default(), MatchRules.club())
+
+
+def test_scan(automaton):
+    assert automaton.scan('6:4 7:6(5)') == (
+        ErrorCode.NONE,
+        0,
+        [SetScore(6, 4), SetScore(7, 6, 5)],
+    )
+    assert automaton.scan('6:4 3:6 12:10') == (
+        ErrorCode.NONE,
+        0,
+        [SetScore(6, 4), SetScore(3, 6), SetScore(12, 10)],
+    )
+
+
+@pytest.mark.parametrize(
+    'score, code, set_index',
+    [
+        ('6:4 4:4', ErrorCode.GAMES_TOO_SMALL, 2),
+        ('6:4 7:7', ErrorCode.GAMES_EQUAL, 2),
+        ('6:4 4:6 9:9', ErrorCode.GAMES_TOO_SMALL, 3),
+        ('6:4 4:6 10:10', ErrorCode.GAMES_EQUAL, 3),
+        ('6:4 6:4 6:4', ErrorCode.TOO_MANY_WON_SETS, 0),
+        ('6:4 6:4 6:4 6:4', ErrorCode.TOO_MANY_SETS, 0),
+        ('6:4 6:4 6:4 x', ErrorCode.TOO_MANY_SETS, 0),
+        ('6:4', ErrorCode.INVALID_FORMAT, 0),
+        ('', ErrorCode.INVALID_FORMAT, 0),
+        ('6:4 6:', ErrorCode.INVALID_FORMAT, 0),
+        ('6:4 6:4(', ErrorCode.INVALID_FORMAT, 0),
+        ('6:4 6:4 ', ErrorCode.INVALID_FORMAT, 0),
+        ('6:4 8:6', ErrorCode.INVALID_FORMAT, 0),
+        ('6:4 4:06', ErrorCode.INVALID_FORMAT, 0),
+        ('6:4 3:6 10:8(5)', ErrorCode.INVALID_FORMAT, 0),
+        ('6:4 6-4', ErrorCode.INVALID_FORMAT, 0),
+        ('6:4 ٦:٤', ErrorCode.INVALID_FORMAT, 0),
+    ],
+)
+def test_scan_errors(automaton, score, code, set_index):
+    assert automaton.scan(score)[:2] == (code, set_index)
+
+
+def test_scan_not_a_string(automaton):
+    assert automaton.scan(None) == (ErrorCode.INVALID_FORMAT, 0, None)
+    assert automaton.scan(64) == (ErrorCode.INVALID_FORMAT, 0, None)
+
+
+def test_tiebreak_set_only_in_deciding_position(automaton):
+    assert automaton.scan('10:8 6:4')[0] == ErrorCode.INVALID_FORMAT
+    single_set = ScoreAutomaton(
+        ScoreFormat.default(), MatchRules(SetsCount.ONE, GamesCount.SIX, LastSet.TIEBREAK_SET)
+    )
+    assert single_set.scan('10:8')[0] == ErrorCode.INVALID_FORMAT
+
+
+def test_separators_of_score_format():
+    automaton = ScoreAutomaton(ScoreFormat(' ', '/'), MatchRules.club())
+    assert automaton.scan('6/4 3/6 10/8')[0] == ErrorCode.NONE
+    assert automaton.scan('6:4 3:6 10:8')[0] == ErrorCode.INVALID_FORMAT
+
+
+def test_matches_format(automaton):
+    assert automaton.matches_format('6:4 6:4 6:4')
+    assert automaton.matches_format('6:4 6:4 6:4 6:4')
+    assert not automaton.matches_format('6:4 6:4 x')
+
+
+def test_games_pattern():
+    assert _games_pattern(7) == '[0-7]'
+    assert _games_pattern(13) == '(?:1[0-3]|[0-9])'
+    assert _games_pattern(25) == '(?:2[0-5]|1[0-9]|[0-9])'
+    assert _games_pattern(35) == '(?:3[0-5]|[1-2][0-9]|[0-9])'
+
+
+def _random_score(rng, score_format):
+    sets = []
+    for _ in range(rng.randrange(7)):
+        games = [rng.randrange(8) if rng.random() < 0.8 else rng.randrange(16) for _ in 'ab']
+        set_score = f'{games[0]}{score_format.game_sep}{games[1]}'
+        if rng.random() < 0.2:
+            set_score += f'({rng.randrange(12)})'
+        sets.append(set_score)
+    score = score_format.set_sep.join(sets)
+    if rng.random() < 0.1 and score:
+        position = rng.randrange(len(score) + 1)
+        score = score[:position] + rng.choice('x:-/( )0') + score[position:]
+    return score
+
+
+@pytest.mark.parametrize('rules', RULES)
+@pytest.mark.parametrize('score_format', SCORE_FORMATS)
+def test_agrees_with_stages(rules, score_format):
+    rng = random.Random(24)
+    validator = Validator(score_format, rules)
+    instrumented = Validator(score_format, rules, collector=InMemoryCollector())
+    for _ in range(3000):
+        score = _random_score(rng, score_format)
+        # the regexp stage checks the same format by regular expressions only
+        assert instrumented._matches_format(score) == validator.automaton.matches_format(score)
+        result = validator.validate(score)
+        staged = instrumented.validate(score)
+        assert result.is_valid() == staged.is_valid(), score
+        assert result.value == staged.value, score
+        assert validator.is_valid(score) == result.is_valid(), score
@@ -0,0 +1,102 @@
+import dataclasses
+
+import pytest
+
+from tennis_match_lib import validation
+from tennis_match_lib.cache import CachedParser, CachedValidator, CacheInfo, LRUCache
+from tennis_match_lib.errors import GameValueError, ScoreError
+from tennis_match_lib.parser import Parser
+from tennis_match_lib.rules import MatchRules
+from tennis_match_lib.score_format import ScoreFormat
+from tennis_match_lib.validator import Validator
+
+
+@pytest.fixture
+def score_format():
+    return ScoreFormat.default()
+
+
+def test_match_rules_are_hashable():
+    assert MatchRules.pro_tour() == MatchRules.pro_tour()
+    assert MatchRules.pro_tour() != MatchRules.club()
+    assert len({MatchRules.pro_tour(), MatchRules.pro_tour(), MatchRules.grand_slam()}) == 2
+    with pytest.raises(AttributeError):
+        MatchRules.pro_tour().last_set = None
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert cache.info() == CacheInfo(hits=3, misses=1, maxsize=2, currsize=2)
+    cache.clear()
+    assert cache.info() == CacheInfo(hits=0, misses=0, maxsize=2, currsize=0)
+
+
+def test_lru_cache_invalid_size():
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=0)
+
+
+def test_cached_parser(score_format):
+    parser = CachedParser(score_format, MatchRules.pro_tour(), maxsize=16)
+    first = parser.parse('6:7(5) 7:5 6:4')
+    second = parser.parse('6:7(5) 7:5 6:4')
+    assert first is second
+    assert isinstance(first.sets, tuple)
+    expected = Parser(score_format, MatchRules.pro_tour()).parse('6:7(5) 7:5 6:4')
+    assert list(first.sets) == expected.sets
+    assert first.stats_info == expected.stats_info
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        first.sets[0].unit_one_games = 0
+    assert parser.cache_info() == CacheInfo(hits=1, misses=1, maxsize=16, currsize=1)
+
+
+def test_cached_parser_does_not_cache_errors(score_format):
+    parser = CachedParser(score_format, MatchRules.pro_tour())
+    for _ in range(2):
+        with pytest.raises(GameValueError):
+            parser.parse('6:F 2:6')
+    assert isinstance(parser.try_parse('6:F 2:6'), ScoreError)
+    assert parser.cache_info().currsize == 0
+    assert parser.try_parse('6:4 6:2') is parser.parse('6:4 6:2')
+
+
+def test_cached_parsers_share_cache_by_rules(score_format):
+    cache = LRUCache()
+    pro_tour = CachedParser(score_format, MatchRules.pro_tour(), cache=cache)
+    club = CachedParser(score_format, MatchRules.club(), cache=cache)
+    pro_tour.parse('6:3 3:6 10:8')
+    club.parse('6:3 3:6 10:8')
+    assert pro_tour.parse('6:3 3:6 10:8').stats_info.unit_one_games_diff == 2
+    assert club.parse('6:3 3:6 10:8').stats_info.unit_one_games_diff == 1
+    assert cache.info().currsize == 2
+
+
+def test_cached_validator(score_format):
+    validator = CachedValidator(score_format, MatchRules.pro_tour())
+    assert validator.validate('6:4 6:2') == validation.Valid('6:4 6:2')
+    uncached = Validator(score_format, MatchRules.pro_tour())
+    for _ in range(2):
+        invalid = validator.validate('3:6 6:6 6:2')
+        assert invalid == uncached.validate('3:6 6:6 6:2')
+        assert isinstance(invalid.value, list)
+        assert invalid.apply(validation.Invalid(['other'])).value[-1] == 'other'
+    invalid.value.clear()
+    assert validator.validate('3:6 6:6 6:2') == uncached.validate('3:6 6:6 6:2')
+    assert validator.validate(None) == uncached.validate(None)
+    assert validator.validate(['6:4 6:2']) == uncached.validate(['6:4 6:2'])
+    assert validator.cache_info() == CacheInfo(hits=2, misses=2, maxsize=4096, currsize=2)
+
+
+def test_cached_parser_unhashable_score(score_format):
+    parser = CachedParser(score_format, MatchRules.pro_tour())
+    with pytest.raises(GameValueError):
+        parser.parse(['6:4 6:2'])
+    assert isinstance(parser.try_parse({}), ScoreError)
+    assert parser.cache_info() == CacheInfo(hits=0, misses=0, maxsize=4096, currsize=0)
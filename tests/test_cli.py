@@ -0,0 +1,126 @@
+import csv
+import json
+
+import pytest
+
+from tennis_match_lib import cli
+from tennis_match_lib.rules import MatchRules
+from tennis_match_lib.score_format import ScoreFormat
+from tennis_match_lib.score_table import write_table
+
+
+SCORES = ['6:4 6:2', '3:6 6:6 6:2', '6:F 2:6', '6:7(5) 7:5 6:10']
+
+
+@pytest.fixture
+def csv_input(tmp_path):
+    path = tmp_path / 'scores.csv'
+    with open(path, 'w', newline='') as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(['match_id', 'score'])
+        writer.writerows(enumerate(SCORES))
+    return path
+
+
+def _read_csv(path, delimiter=','):
+    with open(path, newline='') as csv_file:
+        return list(csv.DictReader(csv_file, delimiter=delimiter))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_csv(csv_input, tmp_path, capsys, workers):
+    output = tmp_path / 'out.csv'
+    exit_code = cli.main(
+        [str(csv_input), '-o', str(output), '--workers', str(workers), '--chunksize', '1']
+    )
+    assert exit_code == 0
+    rows = _read_csv(output)
+    assert [row['match_id'] for row in rows] == ['0', '1', '2', '3']
+    assert [row['valid'] for row in rows] == ['True', 'False', 'False', 'False']
+    assert rows[0]['sets'] == '[[6, 4, null], [6, 2, null]]'
+    assert rows[0]['unit_one_games_diff'] == '6'
+    assert rows[1]['errors'] == 'Set 2 has invalid number of games: games cannot be equal'
+    assert rows[2]['sets'] == 'null'
+    assert 'rows=4 valid=1 invalid=3' in capsys.readouterr().err
+
+
+def test_jsonl_club_rules(tmp_path):
+    path = tmp_path / 'scores.jsonl'
+    path.write_text('\n'.join(json.dumps({'id': i, 'result': s}) for i, s in enumerate(SCORES)))
+    output = tmp_path / 'out.jsonl'
+    exit_code = cli.main(
+        [str(path), '-o', str(output), '-c', 'result', '--rules', 'club', '--quiet']
+    )
+    assert exit_code == 0
+    rows = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [row['valid'] for row in rows] == [True, False, False, True]
+    assert rows[3]['sets'] == [[6, 7, 5], [7, 5, None], [6, 10, None]]
+    assert rows[3]['unit_one_games_diff'] == 0
+    assert rows[2]['errors'] == ['Score has invalid format']
+
+
+def test_tsv_with_game_separator(tmp_path):
+    path = tmp_path / 'scores.tsv'
+    path.write_text('score\n6-4 6-2\n6-4 6:2\n')
+    output = tmp_path / 'out.tsv'
+    exit_code = cli.main([str(path), '-o', str(output), '--game-sep', '-', '--quiet'])
+    assert exit_code == 0
+    rows = _read_csv(output, delimiter='\t')
+    assert [row['valid'] for row in rows] == ['True', 'False']
+
+
+def test_missing_column(csv_input, tmp_path, capsys):
+    exit_code = cli.main([str(csv_input), '-o', str(tmp_path / 'out.csv'), '-c', 'result'])
+    assert exit_code == 2
+    assert "column 'result' not found" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_table(csv_input, tmp_path, workers):
+    table = tmp_path / 'scores.tmt'
+    write_table(str(table), SCORES[:2], ScoreFormat.default(), MatchRules.pro_tour())
+    expected = tmp_path / 'expected.csv'
+    output = tmp_path / 'out.csv'
+    assert cli.main([str(csv_input), '-o', str(expected), '--quiet']) == 0
+    exit_code = cli.main(
+        [str(csv_input), '-o', str(output), '--table', str(table), '-w', str(workers), '-q']
+    )
+    assert exit_code == 0
+    assert _read_csv(output) == _read_csv(expected)
+
+
+def test_table_of_other_rules(csv_input, tmp_path, capsys):
+    table = tmp_path / 'scores.tmt'
+    write_table(str(table), SCORES, ScoreFormat.default(), MatchRules.club())
+    exit_code = cli.main([str(csv_input), '-o', str(tmp_path / 'out.csv'), '--table', str(table)])
+    assert exit_code == 2
+    assert 'built for other rules' in capsys.readouterr().err
+
+
+def test_jsonl_line_not_an_object(tmp_path, capsys):
+    path = tmp_path / 'scores.jsonl'
+    path.write_text('{"score": "6:4 6:2"}\n[1, 2]\n')
+    exit_code = cli.main([str(path), '-o', str(tmp_path / 'out.jsonl')])
+    assert exit_code == 2
+    assert 'line 2 is not a JSON object' in capsys.readouterr().err
+
+
+def test_csv_row_with_extra_fields(tmp_path, capsys):
+    path = tmp_path / 'scores.csv'
+    path.write_text('match_id,score\n0,6:4 6:2\n1,6:4 6:2,extra\n')
+    exit_code = cli.main([str(path), '-o', str(tmp_path / 'out.csv')])
+    assert exit_code == 2
+    assert 'line 3 has more fields than the header' in capsys.readouterr().err
+
+
+def test_run_stats_latency_histogram():
+    stats = cli.RunStats()
+    assert stats.latency_percentile(50) == 0.0
+    for latency in range(1, 1001):
+        stats.add_chunk([{'valid': True}], latency / 1000)
+    assert stats.chunks == 1000 and stats.max_latency == 1.0
+    assert 0.5 <= stats.latency_percentile(50) <= 0.5 * 1.05
+    assert 0.99 <= stats.latency_percentile(99) <= 1.0
+    assert stats.latency_percentile(100) == 1.0
+    assert len(stats._latency_buckets) < 200
+    assert 'p50=' in stats.summary()
@@ -0,0 +1,110 @@
+import random
+
+import pytest
+
+from tennis_match_lib.codegen import GeneratedValidator, compile_check, generate_source
+from tennis_match_lib.errors import ErrorCode
+from tennis_match_lib.rules import GamesCount, LastSet, MatchRules, SetsCount, check_sets
+from tennis_match_lib.score_format import ScoreFormat
+from tennis_match_lib.structs import SetScore
+from tennis_match_lib.validator import Validator
+
+
+RULES = [
+    MatchRules.pro_tour(),
+    MatchRules.club(),
+    MatchRules.club_short(),
+    MatchRules.grand_slam(),
+    MatchRules.fast4(),
+    MatchRules(SetsCount.THREE, GamesCount.SIX, LastSet.NO_TIEBREAK),
+    MatchRules(SetsCount.ONE, GamesCount.SIX, LastSet.TIEBREAK_SET),
+    MatchRules(SetsCount.FIVE, GamesCount.FOUR, LastSet.TIEBREAK_SET),
+]
+SCORE_FORMATS = [ScoreFormat(' ', ':'), ScoreFormat(' ', '-'), ScoreFormat(' ', '/')]
+
+
+def _random_score(rng, score_format):
+    sets = []
+    for _ in range(rng.randrange(7)):
+        games = [rng.randrange(8) if rng.random() < 0.8 else rng.randrange(16) for _ in 'ab']
+        set_score = f'{games[0]}{score_format.game_sep}{games[1]}'
+        if rng.random() < 0.2:
+            set_score += f'({rng.randrange(12)})'
+        sets.append(set_score)
+    score = score_format.set_sep.join(sets)
+    kind = rng.random()
+    if kind < 0.05:
+        score += rng.choice([' ret.', ' w/o', ' def.', ' unf.'])
+    elif kind < 0.1 and score:
+        score = score[: rng.randrange(len(score))]
+    elif kind < 0.15 and score:
+        position = rng.randrange(len(score) + 1)
+        score = score[:position] + rng.choice('x:-/( )0') + score[position:]
+    return score
+
+
+@pytest.mark.parametrize('rules', RULES)
+@pytest.mark.parametrize('score_format', SCORE_FORMATS)
+def test_agrees_with_interpreted_checks(rules, score_format):
+    rng = random.Random(23)
+    interpreted = Validator(score_format, rules)
+    generated = GeneratedValidator(score_format, rules)
+    scores = [_random_score(rng, score_format) for _ in range(3000)] + [None, 64, '']
+    check = compile_check(score_format, rules)
+    for score in scores:
+        assert check(score) == interpreted._check(score), score
+        assert generated.is_valid(score) == interpreted.is_valid(score), score
+    assert generated.validate_many(scores) == interpreted.validate_many(scores)
+
+
+def _random_sets(rng, plan):
+    # sets of games within the bounds of their positions, so most pass the format
+    sets = []
+    for position in range(rng.randint(plan.sets_to_win, plan.sets)):
+        games = plan.min_winner_games[position]
+        limit = plan.max_set_games[position] or games + 4
+        winner, loser = rng.randint(games - 1, limit), rng.randint(0, limit)
+        tiebreak = rng.choice([None, 5]) if plan.max_set_games[position] else None
+        sets.append(SetScore(*rng.sample([winner, loser], 2), tiebreak))
+    return sets
+
+
+@pytest.mark.parametrize('rules', RULES)
+def test_agrees_with_check_sets(rules):
+    rng = random.Random(7)
+    plan = rules.compile()
+    check = compile_check(ScoreFormat.default(), rules)
+    for _ in range(3000):
+        sets = _random_sets(rng, plan)
+        score = ' '.join(
+            f'{s.unit_one_games}:{s.unit_two_games}'
+            + ('' if s.tiebreak is None else f'({s.tiebreak})')
+            for s in sets
+        )
+        assert check(score) == check_sets(plan, sets), score
+
+
+def test_compiled_once_per_configuration():
+    check = compile_check(ScoreFormat.default(), MatchRules.club())
+    assert compile_check(ScoreFormat.default(), MatchRules.club()) is check
+    assert compile_check(ScoreFormat(' ', '-'), MatchRules.club()) is not check
+    assert GeneratedValidator(ScoreFormat.default(), MatchRules.club())._check is check
+
+
+def test_constants_are_inlined():
+    source = generate_source(ScoreFormat(' ', '-'), MatchRules.club())
+    assert 'rules' not in source and 'plan' not in source
+    assert 'if sets > 3:' in source
+    assert 'if a2 < 10 and b2 < 10:' in source
+    assert 'if won > 2 or 3 - won > 2:' in source
+    assert 'check_sets' not in source
+    assert compile_check(ScoreFormat(' ', '-'), MatchRules.club()).source == source
+
+
+def test_results():
+    check = compile_check(ScoreFormat.default(), MatchRules.pro_tour())
+    assert check('6:4 7:6(5)') == (ErrorCode.NONE, 0)
+    assert check('6:4 6:4 ret.') == (ErrorCode.MATCH_ALREADY_DECIDED, 0)
+    assert check('6:4 4:4') == (ErrorCode.GAMES_TOO_SMALL, 2)
+    assert check('6:4 6:4 6:4 6:4') == (ErrorCode.TOO_MANY_SETS, 0)
+    assert check('6:4 6:x') == (ErrorCode.INVALID_FORMAT, 0)
@@ -0,0 +1,152 @@
+import pytest
+
+from tennis_match_lib import common
+from tennis_match_lib.structs import MatchOutcome, SetScore
+
+
+@pytest.mark.parametrize(
+    "score, game_sep, expected",
+    [
+        ('6:4', ':', [SetScore(6, 4)]),
+        ('6:4 7:6(5)', ':', [SetScore(6, 4), SetScore(7, 6, 5)]),
+        ('6-7(10) 7-6(12) 6-3', '-', [SetScore(6, 7, 10), SetScore(7, 6, 12), SetScore(6, 3)]),
+        ('6/3 1/6 10/12', '/', [SetScore(6, 3), SetScore(1, 6), SetScore(10, 12)]),
+        ('12:10(7) 6:0', ':', [SetScore(12, 10, 7), SetScore(6, 0)]),
+    ],
+)
+def test_parse_score(score, game_sep, expected):
+    assert common.parse_score(score, ' ', game_sep) == expected
+
+
+@pytest.mark.parametrize(
+    "score",
+    [
+        '',
+        '6',
+        '6:',
+        ':4',
+        '6:4 ',
+        '6:4  6:2',
+        '6:F 2:6',
+        '6:7(r) 2:6',
+        '6:7() 2:6',
+        '6:7(5',
+        '6:7(5)1',
+        '6:4:2',
+        '6:-1',
+        '6-4',
+        'justwrongscore',
+    ],
+)
+def test_parse_score_invalid(score):
+    with pytest.raises(ValueError):
+        common.parse_score(score)
+
+
+def test_parse_score_not_a_string():
+    with pytest.raises(TypeError):
+        common.parse_score(None)
+
+
+def test_parse_set():
+    assert common.parse_set('7:6(5)') == SetScore(7, 6, 5)
+    with pytest.raises(ValueError):
+        common.parse_set('6:4 6:2')
+
+
+@pytest.mark.parametrize(
+    "score, game_sep, expected",
+    [
+        ('6:4', ':', '4:6'),
+        ('6:4 7:6(5)', ':', '4:6 6:7(5)'),
+        ('6-7(10) 7-6(12) 6-3', '-', '7-6(10) 6-7(12) 3-6'),
+        ('6/3 1/6 10/12', '/', '3/6 6/1 12/10'),
+        ('12:10(7) 6:0', ':', '10:12(7) 0:6'),
+    ],
+)
+def test_reverse_score(score, game_sep, expected):
+    assert common.reverse_score(score, ' ', game_sep) == expected
+    assert common.reverse_score(expected, ' ', game_sep) == score
+
+
+@pytest.mark.parametrize(
+    "score", ['', '6:4 ', '6:4  6:2', '6:F 2:6', '6:7() 2:6', '6:4:2', '6-4']
+)
+def test_reverse_score_invalid(score):
+    with pytest.raises(ValueError):
+        common.reverse_score(score)
+
+
+def test_normalize_score():
+    assert common.normalize_score('6-4 7-6(5)', ' ', '-', ' ', '/') == '6/4 7/6(5)'
+    assert common.normalize_score('6-4 7-6(5)', ' ', '-', ' ', ':', reverse=True) == (
+        '4:6 6:7(5)'
+    )
+    assert common.normalize_score('06:4 7:6(05)') == '6:4 7:6(5)'
+    assert common.normalize_score('6:0 0:6(0)') == '6:0 0:6(0)'
+    assert common.normalize_score('6:4,6:2', ',', ':', ' ', '-') == '6-4 6-2'
+    with pytest.raises(TypeError):
+        common.normalize_score(None)
+
+
+def test_normalize_score_matches_parse_score():
+    for score in ['6:4', '7:6(10) 0:6', '06:04 6:7(007)', '10:12 7:6(1) 6:3']:
+        normalized = common.normalize_score(score, ' ', ':', ' ', '-')
+        assert common.parse_score(normalized, ' ', '-') == common.parse_score(score)
+
+
+def test_score_key():
+    keys = {
+        common.score_key('6:4 7:6(5)'),
+        common.score_key('6-4 7-6(5)', ' ', '-'),
+        common.score_key('6/4 07/6(5)', ' ', '/'),
+    }
+    assert keys == {'6:4 7:6(5)'}
+    assert common.score_key('4:6 6:7(5)') != common.score_key('6:4 7:6(5)')
+
+
+@pytest.mark.parametrize(
+    "score, expected",
+    [
+        ('6:4 3:1 ret.', ('6:4 3:1', MatchOutcome.RETIRED)),
+        ('6:4 RET', ('6:4', MatchOutcome.RETIRED)),
+        ('w/o', ('', MatchOutcome.WALKOVER)),
+        ('6:4 5:5 def.', ('6:4 5:5', MatchOutcome.DEFAULTED)),
+        ('6:4 2:1 unf.', ('6:4 2:1', MatchOutcome.IN_PROGRESS)),
+        ('6:4 7:6(5)', ('6:4 7:6(5)', None)),
+        ('6:4 abc', ('6:4 abc', None)),
+        ('', ('', None)),
+    ],
+)
+def test_split_outcome(score, expected):
+    assert common.split_outcome(score) == expected
+
+
+def test_parse_match():
+    assert common.parse_match('6:4 3:1 ret.') == (
+        [SetScore(6, 4), SetScore(3, 1)],
+        MatchOutcome.RETIRED,
+    )
+    assert common.parse_match('6-4,w/o', ',', '-') == ([SetScore(6, 4)], MatchOutcome.WALKOVER)
+    assert common.parse_match('w/o') == ([], MatchOutcome.WALKOVER)
+    assert common.parse_match('6:4') == ([SetScore(6, 4)], None)
+    with pytest.raises(ValueError):
+        common.parse_match('6:4 x ret.')
+    with pytest.raises(ValueError):
+        common.parse_match('6:4 abc')
+
+
+@pytest.mark.parametrize("score", ['6:4 7:6(5)', '6:4 6:', '6::4', '(5)', '', None, 64])
+def test_try_parse_score(score):
+    try:
+        expected = common.parse_score(score)
+    except (TypeError, ValueError):
+        expected = None
+    assert common.try_parse_score(score) == expected
+
+
+def test_try_parse_match():
+    assert common.try_parse_match('6:4 3:1 ret.') == common.parse_match('6:4 3:1 ret.')
+    assert common.try_parse_match('w/o') == ([], MatchOutcome.WALKOVER)
+    assert common.try_parse_match('6:4 x ret.') == (None, MatchOutcome.RETIRED)
+    assert common.try_parse_match('6:4 x') == (None, None)
@@ -0,0 +1,144 @@
+import threading
+
+import pytest
+
+from tennis_match_lib.cache import CachedValidator
+from tennis_match_lib.errors import ErrorCode
+from tennis_match_lib.instrumentation import Collector, InMemoryCollector, to_prometheus_text
+from tennis_match_lib.rules import MatchRules
+from tennis_match_lib.score_format import ScoreFormat
+from tennis_match_lib.validator import Validator
+
+
+SCORES = [
+    '6:4 6:3',
+    '6:4 6:3 6:2 6:1',
+    '6:4',
+    '6:4 6:4 6:4',
+    '5:4 6:3',
+    '6:4 6:6',
+    '6:5 6:3',
+    'x',
+]
+
+
+@pytest.fixture
+def collector():
+    return InMemoryCollector()
+
+
+@pytest.fixture
+def validator(collector):
+    return Validator(ScoreFormat.default(), MatchRules.pro_tour(), collector=collector)
+
+
+def test_results_are_not_changed(validator):
+    plain = Validator(ScoreFormat.default(), MatchRules.pro_tour())
+    for score in SCORES + [None]:
+        assert validator.validate(score) == plain.validate(score)
+
+
+def test_stage_stats(validator, collector):
+    for score in SCORES:
+        validator.validate(score)
+    stages = collector.stages()
+    assert list(stages) == [
+        'regexp',
+        'number_of_sets',
+        'parse_score',
+        'number_of_won_sets',
+        'games_too_small',
+        'games_equality',
+        'set_complete',
+        'match_decided',
+    ]
+    assert [(s.calls, s.rejections) for s in stages.values()] == [
+        (8, 2),
+        (6, 1),
+        (5, 0),
+        (5, 1),
+        (4, 1),
+        (3, 1),
+        (2, 1),
+        (1, 0),
+    ]
+    assert all(s.seconds >= 0 for s in stages.values())
+
+
+def test_failures_histogram(validator, collector):
+    for score in SCORES:
+        validator.validate(score)
+    assert collector.failures() == {
+        ErrorCode.INVALID_FORMAT: 2,
+        ErrorCode.TOO_MANY_SETS: 1,
+        ErrorCode.TOO_MANY_WON_SETS: 1,
+        ErrorCode.GAMES_TOO_SMALL: 1,
+        ErrorCode.GAMES_EQUAL: 1,
+        ErrorCode.SET_INCOMPLETE: 1,
+    }
+    collector.reset()
+    assert collector.stages() == {}
+    assert collector.failures() == {}
+
+
+def test_prometheus_text(validator, collector):
+    validator.validate('6:4 6:3')
+    validator.validate('x')
+    text = to_prometheus_text(collector)
+    assert '# TYPE tennis_match_validator_stage_calls_total counter' in text
+    assert 'tennis_match_validator_stage_calls_total{stage="regexp"} 2' in text
+    assert 'tennis_match_validator_stage_rejections_total{stage="regexp"} 1' in text
+    assert 'tennis_match_validator_stage_calls_total{stage="games_equality"} 1' in text
+    assert 'tennis_match_validator_failures_total{reason="invalid_format"} 1' in text
+    assert text.endswith('\n')
+
+
+def test_custom_collector():
+    class ListCollector(Collector):
+        def __init__(self):
+            self.calls = []
+
+        def observe(self, stage, seconds, error_code):
+            self.calls.append((stage, error_code))
+
+    collector = ListCollector()
+    validator = Validator(ScoreFormat.default(), MatchRules.pro_tour(), collector)
+    validator.validate('6:4 6:3 6:2 6:1')
+    assert collector.calls == [
+        ('regexp', ErrorCode.NONE),
+        ('number_of_sets', ErrorCode.TOO_MANY_SETS),
+    ]
+
+
+def test_collector_is_abstract():
+    with pytest.raises(TypeError):
+        Collector()
+
+
+def test_collector_threads(validator, collector):
+    def work():
+        for _ in range(200):
+            validator.validate('6:4 6:3')
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert collector.stages()['regexp'].calls == 800
+
+
+def test_cached_validator_reports_misses(collector):
+    validator = CachedValidator(ScoreFormat.default(), MatchRules.pro_tour(), collector=collector)
+    validator.validate('6:4 6:3')
+    validator.validate('6:4 6:3')
+    assert collector.stages()['regexp'].calls == 1
+
+
+def test_outcome_stage(validator, collector):
+    validator.validate('6:4 3:1 ret.')
+    validator.validate('6:4 6:4 ret.')
+    stages = collector.stages()
+    assert list(stages) == ['outcome']
+    assert (stages['outcome'].calls, stages['outcome'].rejections) == (2, 1)
+    assert collector.failures() == {ErrorCode.MATCH_ALREADY_DECIDED: 1}
@@ -0,0 +1,245 @@
+import itertools
+import random
+
+import pytest
+
+from tennis_match_lib.errors import GameValueError
+from tennis_match_lib.match_score import TennisMatchScore, Unit
+from tennis_match_lib.parser import Parser
+from tennis_match_lib.rules import GamesCount, LastSet, MatchRules, SetsCount, is_set_complete
+from tennis_match_lib.score_format import ScoreFormat
+from tennis_match_lib.structs import BasicMatchStatsInfo, MatchOutcome, SetScore
+from tennis_match_lib.validator import Validator
+
+
+def _play_points(match, units):
+    for unit in units:
+        match.point_won(unit)
+
+
+def test_new_match():
+    match = TennisMatchScore('Nadal', 'Federer')
+    assert match.score == ''
+    assert match.sets == []
+    assert match.winner is None
+    assert match.stats_info == BasicMatchStatsInfo(0, 0, 0, 0)
+
+
+def test_game_by_points():
+    match = TennisMatchScore('Nadal', 'Federer')
+    _play_points(match, [Unit.ONE, Unit.TWO, Unit.ONE, Unit.TWO, Unit.ONE, Unit.TWO])
+    assert match.points == (3, 3)
+    assert match.score == ''
+    _play_points(match, [Unit.ONE, Unit.TWO, Unit.TWO])
+    assert match.points == (3, 4)
+    match.point_won(Unit.TWO)
+    assert match.points == (0, 0)
+    assert match.score == '0:1'
+
+
+def test_no_ad_game():
+    match = TennisMatchScore('Nadal', 'Federer', rules=MatchRules.fast4())
+    _play_points(match, [Unit.ONE, Unit.TWO] * 3 + [Unit.ONE])
+    assert match.score == '1:0'
+
+
+def test_set_and_match_by_games():
+    match = TennisMatchScore('Nadal', 'Federer')
+    for _ in range(6):
+        match.game_won(Unit.ONE)
+    assert match.score == '6:0'
+    for _ in range(5):
+        match.game_won(Unit.ONE)
+        match.game_won(Unit.TWO)
+    assert match.score == '6:0 5:5'
+    match.game_won(Unit.ONE)
+    match.game_won(Unit.ONE)
+    assert match.score == '6:0 7:5'
+    assert match.winner == 'Nadal'
+    assert match.loser == 'Federer'
+    assert match.is_unit_one_winner()
+    assert not match.is_unit_two_winner()
+    with pytest.raises(ValueError):
+        match.game_won(Unit.TWO)
+
+
+def test_tiebreak_by_points():
+    match = TennisMatchScore('Nadal', 'Federer', '6:6')
+    assert match.in_tiebreak
+    _play_points(match, [Unit.ONE, Unit.TWO] * 6 + [Unit.TWO, Unit.TWO])
+    assert match.score == '6:7(6)'
+    assert not match.in_tiebreak
+
+
+def test_fast4_tiebreak_by_points():
+    match = TennisMatchScore('Nadal', 'Federer', '3:3', rules=MatchRules.fast4())
+    assert match.in_tiebreak
+    _play_points(match, [Unit.ONE, Unit.TWO] * 4 + [Unit.TWO])
+    assert match.score == '3:4(4)'
+
+
+def test_tiebreak_won():
+    match = TennisMatchScore('Nadal', 'Federer', '6:3 6:6')
+    match.tiebreak_won(Unit.TWO, 5)
+    assert match.score == '6:3 6:7(5)'
+    with pytest.raises(ValueError):
+        match.tiebreak_won(Unit.ONE, 5)
+
+
+def test_tiebreak_set():
+    match = TennisMatchScore('Nadal', 'Federer', '6:3 3:6', rules=MatchRules.club())
+    assert match.in_tiebreak
+    with pytest.raises(ValueError):
+        match.game_won(Unit.ONE)
+    _play_points(match, [Unit.ONE, Unit.TWO] * 9 + [Unit.TWO, Unit.ONE, Unit.ONE, Unit.ONE])
+    assert match.score == '6:3 3:6 12:10'
+    assert match.winner == 'Nadal'
+    match = TennisMatchScore('Nadal', 'Federer', '6:3 3:6', rules=MatchRules.club())
+    match.tiebreak_won(Unit.TWO, 4)
+    assert match.score == '6:3 3:6 4:10'
+
+
+def test_advantage_last_set():
+    rules = MatchRules(
+        max_sets=SetsCount.THREE, games_count=GamesCount.SIX, last_set_rule=LastSet.NO_TIEBREAK
+    )
+    match = TennisMatchScore('Nadal', 'Federer', '6:3 3:6 6:6', rules=rules)
+    assert not match.in_tiebreak
+    match.game_won(Unit.ONE)
+    match.game_won(Unit.ONE)
+    assert match.score == '6:3 3:6 8:6'
+
+
+def test_add_set():
+    match = TennisMatchScore('Nadal', 'Federer')
+    match.add_set(SetScore(7, 6, 4))
+    match.add_set(SetScore(4, 6))
+    assert match.score == '7:6(4) 4:6'
+    with pytest.raises(GameValueError):
+        match.add_set(SetScore(5, 3))
+    match.game_won(Unit.ONE)
+    with pytest.raises(GameValueError):
+        match.add_set(SetScore(6, 3))
+
+
+@pytest.mark.parametrize(
+    'rules',
+    [
+        MatchRules.pro_tour(),
+        MatchRules.club(),
+        MatchRules.fast4(),
+        MatchRules(
+            max_sets=SetsCount.THREE,
+            games_count=GamesCount.SIX,
+            last_set_rule=LastSet.NO_TIEBREAK,
+        ),
+    ],
+)
+def test_add_set_agrees_with_rules(rules):
+    plan = rules.compile()
+    # sets split evenly between the units, so that the last set decides the match
+    seed = ' '.join(
+        f'{plan.games}:0' if i % 2 else f'0:{plan.games}' for i in range(plan.sets - 1)
+    )
+    for position, score in ((0, None), (plan.sets - 1, seed)):
+        for one, two in itertools.product(range(15), repeat=2):
+            for tiebreak in (None, 3):
+                set_score = SetScore(one, two, tiebreak)
+                match = TennisMatchScore('Nadal', 'Federer', score, rules=rules)
+                try:
+                    match.add_set(set_score)
+                    added = True
+                except GameValueError:
+                    added = False
+                assert added == is_set_complete(plan, position, set_score), set_score
+
+
+@pytest.mark.parametrize(
+    'score',
+    ['8:1', '6:5 6:3', '6:4 6:3 6:1', '7:7', '6:4(5)', '6:4 3:2 6:1', 'abc'],
+)
+def test_seed_invalid_score(score):
+    with pytest.raises(GameValueError):
+        TennisMatchScore('Nadal', 'Federer', score)
+
+
+def test_seed_score_format():
+    score_format = ScoreFormat(set_sep=' ', game_sep='-')
+    match = TennisMatchScore('Nadal', 'Federer', '6-4 3-2', score_format=score_format)
+    assert match.sets == [SetScore(6, 4), SetScore(3, 2)]
+    match.game_won(Unit.TWO)
+    assert match.score == '6-4 3-3'
+
+
+@pytest.mark.parametrize(
+    'rules',
+    [MatchRules.pro_tour(), MatchRules.club(), MatchRules.grand_slam(), MatchRules.fast4()],
+)
+def test_random_matches_agree_with_parser(rules):
+    rng = random.Random(11)
+    score_format = ScoreFormat.default()
+    parser = Parser(score_format, rules)
+    validator = Validator(score_format, rules)
+    for _ in range(50):
+        match = TennisMatchScore('Nadal', 'Federer', rules=rules)
+        while not match.is_finished():
+            match.point_won(Unit.ONE if rng.random() < 0.5 else Unit.TWO)
+        assert validator.validate(match.score).is_valid(), match.score
+        assert match.stats_info == parser.parse(match.score).stats_info
+        seeded = TennisMatchScore('Nadal', 'Federer', match.score, rules=rules)
+        assert seeded.sets == match.sets
+        assert seeded.winner == match.winner
+
+
+def test_retired():
+    match = TennisMatchScore('Nadal', 'Federer', '6:4 2:3')
+    assert match.outcome == MatchOutcome.IN_PROGRESS
+    match.retired(Unit.ONE)
+    assert match.winner == 'Federer'
+    assert match.outcome == MatchOutcome.RETIRED
+    assert match.score == '6:4 2:3 ret.'
+    assert match.is_finished()
+    with pytest.raises(ValueError):
+        match.game_won(Unit.ONE)
+
+
+def test_defaulted():
+    match = TennisMatchScore('Nadal', 'Federer', '6:4')
+    match.defaulted(Unit.TWO)
+    assert match.winner == 'Nadal'
+    assert match.score == '6:4 def.'
+
+
+def test_walkover():
+    match = TennisMatchScore('Nadal', 'Federer')
+    match.walkover(Unit.TWO)
+    assert match.winner == 'Nadal'
+    assert match.outcome == MatchOutcome.WALKOVER
+    assert match.score == 'w/o'
+    started = TennisMatchScore('Nadal', 'Federer', '1:0')
+    with pytest.raises(ValueError):
+        started.walkover(Unit.TWO)
+
+
+@pytest.mark.parametrize(
+    'score, outcome',
+    [
+        ('6:4 2:3 ret.', MatchOutcome.RETIRED),
+        ('6:4 def.', MatchOutcome.DEFAULTED),
+        ('w/o', MatchOutcome.WALKOVER),
+    ],
+)
+def test_seed_with_outcome(score, outcome):
+    match = TennisMatchScore('Nadal', 'Federer', score)
+    assert match.outcome == outcome
+    assert match.winner == 'Nadal'
+    assert match.score == score
+    parse_result = Parser(ScoreFormat.default(), MatchRules.pro_tour()).parse(score)
+    assert match.stats_info == parse_result.stats_info
+
+
+def test_unfinished_match_agrees_with_parser():
+    parser = Parser(ScoreFormat.default(), MatchRules.pro_tour())
+    match = TennisMatchScore('Nadal', 'Federer', '6:4 3:1')
+    assert match.stats_info == parser.parse(match.score).stats_info
+    assert parser.parse(match.score).outcome == match.outcome == MatchOutcome.IN_PROGRESS
@@ -0,0 +1,75 @@
+import pytest
+
+from tennis_match_lib.errors import GameValueError
+from tennis_match_lib.parallel import chunked, parse_parallel
+from tennis_match_lib.parser import Parser
+from tennis_match_lib.rules import MatchRules
+from tennis_match_lib.score_format import ScoreFormat
+from tennis_match_lib.score_table import write_table
+
+
+SCORES = ['6:4 6:2', '6:F 2:6', '6:7(5) 7:5 6:10', 'justwrongscore', '6:7(0) 7:6(10) 6:7(20)']
+
+
+@pytest.mark.parametrize("workers, chunksize", [(1, 2), (2, 1), (3, 100)])
+def test_parse_parallel_matches_parser(workers, chunksize):
+    score_format = ScoreFormat.default()
+    rules = MatchRules.club()
+    parser = Parser(score_format, rules)
+    results = parse_parallel(
+        SCORES * 3, score_format, rules, workers=workers, chunksize=chunksize
+    )
+    assert len(results) == 15
+    assert sorted(results.errors) == [1, 3, 6, 8, 11, 13]
+    for score, result in zip(SCORES * 3, results):
+        try:
+            expected = parser.parse(score)
+        except GameValueError as ex:
+            assert isinstance(result, GameValueError)
+            assert str(result) == str(ex)
+            continue
+        assert list(result.sets) == expected.sets
+        assert result.stats_info == expected.stats_info
+    assert results[-1].sets[-1].tiebreak == 20
+    with pytest.raises(IndexError):
+        results[15]
+
+
+def test_parse_parallel_empty_input():
+    results = parse_parallel([], ScoreFormat.default(), MatchRules.pro_tour(), workers=2)
+    assert len(results) == 0
+    assert list(results) == []
+
+
+def test_chunked():
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    with pytest.raises(ValueError):
+        list(chunked(range(5), 0))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parse_parallel_with_table(tmp_path, workers):
+    score_format = ScoreFormat.default()
+    rules = MatchRules.club()
+    path = str(tmp_path / 'scores.tmt')
+    write_table(path, SCORES[:3], score_format, rules)
+    expected = parse_parallel(SCORES, score_format, rules, workers=1)
+    results = parse_parallel(SCORES, score_format, rules, workers=workers, table_path=path)
+    assert results.errors == expected.errors
+    for result, expected_result in zip(results, expected):
+        if isinstance(expected_result, GameValueError):
+            continue
+        assert list(result.sets) == list(expected_result.sets)
+        assert result.stats_info == expected_result.stats_info
+        assert result.outcome == expected_result.outcome
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parse_parallel_value_out_of_range(workers):
+    scores = ['6:4 7:6(40000)', '6:4 6:2', '6:4 ' * 30 + '99999:0']
+    results = parse_parallel(scores, ScoreFormat.default(), MatchRules.club(), workers=workers)
+    assert len(results) == 3
+    assert sorted(results.errors) == [0, 2]
+    assert isinstance(results[0], GameValueError)
+    assert 'out of range' in str(results[0])
+    assert results[1].stats_info.unit_one_games_diff == 6
@@ -1,10 +1,12 @@
+import pickle
+
 import pytest
 
-from tennis_match_lib.errors import GameValueError, TiebreakValueError
+from tennis_match_lib.errors import ErrorCode, GameValueError, ScoreError, TiebreakValueError
 from tennis_match_lib.score_format import ScoreFormat
 from tennis_match_lib.parser import Parser, ParseResult
 from tennis_match_lib.rules import MatchRules
-from tennis_match_lib.structs import SetScore, BasicMatchStatsInfo
+from tennis_match_lib.structs import SetScore, BasicMatchStatsInfo, MatchOutcome, PackedMatch
 
 
 @pytest.fixture
@@ -166,5 +168,74 @@ def test_neg_dos_wrong_game_value(parser):
 
 def test_neg_tres_wrong_game_value(parser):
     score = 'justwrongscore'
+    with pytest.raises(GameValueError) as excinfo:
+        parser.parse(score)
+    assert str(excinfo.value) == f'Invalid game value: {score}: {parser.try_parse(score).message}'
+    assert str(excinfo.value).endswith('Unable to parse the score')
+
+
+def test_positive_non_default_game_separator():
+    parser = Parser(score_format=ScoreFormat(' ', '-'), rules=MatchRules.pro_tour())
+    actual = parser.parse('6-4 6-7(10) 7-6(12)')
+    assert actual.sets == [
+        SetScore(unit_one_games=6, unit_two_games=4),
+        SetScore(unit_one_games=6, unit_two_games=7, tiebreak=10),
+        SetScore(unit_one_games=7, unit_two_games=6, tiebreak=12),
+    ]
+
+
+def test_stats_info_of_packed_match(parser):
+    parse_result = parser.parse('6:7(0) 7:6(10) 6:7(20)')
+    packed = PackedMatch.from_sets(parse_result.sets)
+    assert parser._calculate_stats_info(packed) == parse_result.stats_info
+
+
+@pytest.mark.parametrize(
+    "score, outcome, sets_diff, games_diff",
+    [
+        ('6:4 6:2', MatchOutcome.COMPLETED, 2, 6),
+        ('6:4 3:1', MatchOutcome.IN_PROGRESS, 1, 4),
+        ('6:4 7:5', MatchOutcome.COMPLETED, 2, 4),
+        ('6:4 3:1 ret.', MatchOutcome.RETIRED, 1, 4),
+        ('6:4 6:3 ret.', MatchOutcome.RETIRED, 2, 5),
+        ('4:6 2:3 def.', MatchOutcome.DEFAULTED, -1, -3),
+        ('6:4 2:6 1:0 unf.', MatchOutcome.IN_PROGRESS, 0, -1),
+        ('w/o', MatchOutcome.WALKOVER, 0, 0),
+    ],
+)
+def test_outcome(parser, score, outcome, sets_diff, games_diff):
+    actual = parser.parse(score)
+    assert actual.outcome == outcome
+    assert actual.stats_info.unit_one_sets_diff == sets_diff
+    assert actual.stats_info.unit_one_games_diff == games_diff
+
+
+def test_parse_result_outcome(parser):
+    sets, stats_info, outcome = parser.parse('6:4 3:1 ret.')
+    assert len(sets) == 2 and stats_info.unit_one_sets_diff == 1
+    assert outcome == MatchOutcome.RETIRED
+    result = parser.parse('6:4 3:1 ret.')
+    assert result.outcome == MatchOutcome.RETIRED
+    assert result != parser.parse('6:4 3:1')
+    assert result._replace(sets=tuple(result.sets)).outcome == MatchOutcome.RETIRED
+    assert pickle.loads(pickle.dumps(result)).outcome == MatchOutcome.RETIRED
+    assert pickle.loads(pickle.dumps(result)) == result
+
+
+def test_outcome_marker_sets(parser):
+    assert parser.parse('6:4 3:1 ret.').sets == parser.parse('6:4 3:1').sets
+    assert parser.parse('w/o').sets == []
+    with pytest.raises(GameValueError):
+        parser.parse('6:4 abc.')
+
+
+@pytest.mark.parametrize("score", ['6:4 6:2', '6:4 3:1 ret.', 'w/o', '7:6(5) 6:7(3) 6:1'])
+def test_try_parse(parser, score):
+    assert parser.try_parse(score) == parser.parse(score)
+
+
+@pytest.mark.parametrize("score", ['6:4 6:a', '', '6:4 ', '6:4 x ret.', None, 64])
+def test_try_parse_invalid(parser, score):
+    assert parser.try_parse(score) == ScoreError(ErrorCode.UNPARSABLE_SCORE, 0, score)
     with pytest.raises(GameValueError):
         parser.parse(score)
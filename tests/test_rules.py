@@ -0,0 +1,175 @@
+import pytest
+
+from tennis_match_lib import rules
+from tennis_match_lib.errors import ErrorCode
+from tennis_match_lib.parser import Parser
+from tennis_match_lib.score_format import ScoreFormat
+from tennis_match_lib.structs import SetScore
+from tennis_match_lib import validation
+from tennis_match_lib.validator import Validator
+
+
+def test_compile_pro_tour():
+    plan = rules.MatchRules.pro_tour().compile()
+    assert plan == rules.RulesPlan(
+        sets=3,
+        sets_to_win=2,
+        games=6,
+        tiebreak_at=6,
+        tiebreak_points_to_win=7,
+        max_games=7,
+        last_set=rules.LastSet.TIEBREAK,
+        tb_set_points_to_win=10,
+        no_ad=False,
+        tiebreak_set_position=-1,
+        min_winner_games=(6, 6, 6),
+        max_set_games=(7, 7, 7),
+    )
+
+
+def test_compile_club():
+    plan = rules.MatchRules.club().compile()
+    assert plan.tiebreak_set_position == 2
+    assert plan.min_winner_games == (6, 6, 10)
+    assert plan.max_set_games == (7, 7, None)
+
+
+def test_compile_advantage_last_set():
+    plan = rules.MatchRules(
+        rules.SetsCount.THREE, rules.GamesCount.SIX, rules.LastSet.NO_TIEBREAK
+    ).compile()
+    assert plan.tiebreak_set_position == -1
+    assert plan.min_winner_games == (6, 6, 6)
+    assert plan.max_set_games == (7, 7, None)
+    assert rules.is_set_complete(plan, 2, SetScore(8, 6))
+    assert not rules.is_set_complete(plan, 2, SetScore(7, 6, 5))
+
+
+def test_compile_single_set_tiebreak_set():
+    # a single set is a regular one, the deciding tiebreak set follows regular sets
+    plan = rules.MatchRules(
+        rules.SetsCount.ONE, rules.GamesCount.SIX, rules.LastSet.TIEBREAK_SET
+    ).compile()
+    assert plan.tiebreak_set_position == -1
+    assert plan.min_winner_games == (6,)
+    assert plan.max_set_games == (7,)
+
+
+@pytest.mark.parametrize(
+    "match_rules, valid, invalid",
+    [
+        (
+            rules.MatchRules(
+                rules.SetsCount.THREE, rules.GamesCount.SIX, rules.LastSet.NO_TIEBREAK
+            ),
+            ['6:4 4:6 8:6', '6:4 4:6 12:10', '7:6(5) 4:6 6:3'],
+            ['6:4 4:6 7:6(5)', '6:4 4:6 8:6(5)'],
+        ),
+        (
+            rules.MatchRules(
+                rules.SetsCount.ONE, rules.GamesCount.SIX, rules.LastSet.TIEBREAK_SET
+            ),
+            ['6:4', '7:6(5)', '5:7'],
+            ['10:8', '8:6'],
+        ),
+    ],
+)
+def test_validation_of_last_set_rules(match_rules, valid, invalid):
+    validator = Validator(ScoreFormat.default(), match_rules)
+    for score in valid:
+        assert validator.validate(score).is_valid(), score
+        assert validator.is_valid(score), score
+    for score in invalid:
+        assert not validator.validate(score).is_valid(), score
+        assert not validator.is_valid(score), score
+
+
+@pytest.mark.parametrize(
+    "set_score, complete",
+    [
+        (SetScore(6, 4), True),
+        (SetScore(7, 5), True),
+        (SetScore(7, 6, 5), True),
+        (SetScore(7, 6), True),
+        (SetScore(6, 5), False),
+        (SetScore(7, 4), False),
+        (SetScore(7, 0), False),
+        (SetScore(6, 4, 5), False),
+        (SetScore(7, 5, 5), False),
+    ],
+)
+def test_is_set_complete(set_score, complete):
+    plan = rules.MatchRules.pro_tour().compile()
+    assert rules.is_set_complete(plan, 0, set_score) == complete
+
+
+def test_compile_is_cached_per_rules():
+    assert rules.MatchRules.club().compile() is rules.MatchRules.club().compile()
+    hash(rules.MatchRules.club().compile())
+
+
+@pytest.mark.parametrize(
+    "sets, expected",
+    [
+        ([SetScore(6, 4), SetScore(3, 6), SetScore(10, 8)], (ErrorCode.NONE, 0)),
+        ([SetScore(6, 4), SetScore(6, 3), SetScore(10, 8)], (ErrorCode.TOO_MANY_WON_SETS, 0)),
+        ([SetScore(6, 4), SetScore(5, 5)], (ErrorCode.GAMES_TOO_SMALL, 2)),
+        ([SetScore(6, 6), SetScore(4, 5)], (ErrorCode.GAMES_TOO_SMALL, 2)),
+        ([SetScore(6, 4), SetScore(3, 6), SetScore(10, 10)], (ErrorCode.GAMES_EQUAL, 3)),
+    ],
+)
+def test_check_sets(sets, expected):
+    plan = rules.MatchRules.club().compile()
+    assert rules.check_sets(plan, sets) == expected
+
+
+def test_set_checks():
+    plan = rules.MatchRules.club().compile()
+    assert rules.has_too_small_games(plan, 2, SetScore(9, 7))
+    assert not rules.has_too_small_games(plan, 1, SetScore(9, 7))
+    assert rules.has_too_large_games(plan, 1, SetScore(9, 7))
+    assert not rules.has_too_large_games(plan, 2, SetScore(19, 17))
+    assert rules.has_equal_games(SetScore(6, 6, 5))
+    assert rules.count_won_sets([SetScore(6, 4), SetScore(3, 6), SetScore(5, 5)]) == (1, 2)
+
+
+def test_fast4_rules():
+    fast4 = rules.MatchRules.fast4()
+    plan = fast4.compile()
+    assert (
+        plan.sets,
+        plan.games,
+        plan.tiebreak_at,
+        plan.max_games,
+        plan.no_ad,
+        plan.tiebreak_points_to_win,
+    ) == (5, 4, 3, 4, True, 5)
+    assert rules.MatchRules.from_dict(fast4.to_dict()) == fast4
+    assert fast4 != rules.MatchRules(
+        max_sets=rules.SetsCount.FIVE,
+        games_count=rules.GamesCount.FOUR,
+        last_set_rule=rules.LastSet.TIEBREAK,
+    )
+
+
+@pytest.mark.parametrize("tiebreak_at", [0, 4, 7])
+def test_invalid_tiebreak_at(tiebreak_at):
+    with pytest.raises(ValueError):
+        rules.MatchRules(
+            max_sets=rules.SetsCount.THREE,
+            games_count=rules.GamesCount.SIX,
+            last_set_rule=rules.LastSet.TIEBREAK,
+            tiebreak_at=tiebreak_at,
+        )
+
+
+def test_fast4_validation_and_parsing():
+    fast4 = rules.MatchRules.fast4()
+    validator = Validator(ScoreFormat.default(), fast4)
+    assert validator.re_pattern_raw.startswith(r'[0-4]:[0-4](\([0-9]+\))?')
+    assert validator.validate('4:3(5) 2:4 4:1 4:0') == validation.Valid('4:3(5) 2:4 4:1 4:0')
+    assert not validator.validate('5:3 4:2 4:1').is_valid()
+    assert not validator.validate('4:3 3:2 4:1').is_valid()
+    stats_info = Parser(ScoreFormat.default(), fast4).parse('4:3(5) 2:4 4:1 4:0').stats_info
+    assert stats_info.unit_one_sets_diff == 2
+    assert stats_info.unit_one_games_diff == 6
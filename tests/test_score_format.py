@@ -17,3 +17,11 @@ def test_create_with_invalid_set_separator():
 def test_create_with_invalid_game_separator():
     with pytest.raises(ValueError):
         sf = ScoreFormat(' ', '\\')
+
+
+def test_score_format_is_hashable_and_immutable():
+    assert ScoreFormat(' ', '-') == ScoreFormat(' ', '-')
+    assert ScoreFormat(' ', '-') != ScoreFormat.default()
+    assert len({ScoreFormat.default(), ScoreFormat(' ', ':')}) == 1
+    with pytest.raises(AttributeError):
+        ScoreFormat.default().game_sep = '-'
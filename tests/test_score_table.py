@@ -0,0 +1,186 @@
+from concurrent.futures import ProcessPoolExecutor
+import gc
+import os
+import random
+
+import pytest
+
+from tennis_match_lib.cache import CachedParser
+from tennis_match_lib.errors import ErrorCode, ScoreError
+from tennis_match_lib.parser import Parser
+from tennis_match_lib.rules import MatchRules
+from tennis_match_lib.score_format import ScoreFormat
+from tennis_match_lib.score_table import (
+    ScoreTable,
+    TableParser,
+    TableValidator,
+    build_table,
+    write_table,
+)
+from tennis_match_lib.validator import Validator
+
+
+RULES = MatchRules.club()
+SCORES = [
+    '6:4 6:2',
+    '6:0 6:7(8) 7:5',
+    '6:4 3:6 10:8',
+    '6:4 4:4',
+    '6:4 7:7',
+    '6:4 6:4 6:4',
+    '6:4 6:4 6:4 6:4',
+    '6:4',
+    '06:4 6:3',
+    '6:4 6:4 ret.',
+    'not a score',
+    None,
+]
+
+
+def _random_scores(rng, count):
+    scores = []
+    for _ in range(count):
+        sets = []
+        for _ in range(rng.randrange(1, 5)):
+            set_score = f'{rng.randrange(8)}:{rng.randrange(8)}'
+            if rng.random() < 0.2:
+                set_score += f'({rng.randrange(12)})'
+            sets.append(set_score)
+        scores.append(' '.join(sets))
+    return scores
+
+
+@pytest.fixture
+def table():
+    with ScoreTable(build_table(SCORES, ScoreFormat.default(), RULES)) as opened:
+        yield opened
+
+
+def test_lookup(table):
+    parser = Parser(ScoreFormat.default(), RULES)
+    validator = Validator(ScoreFormat.default(), RULES)
+    assert len(table) == 9
+    assert table.rules == RULES
+    for score in ['6:4 6:2', '6:0 6:7(8) 7:5', '6:4 3:6 10:8', '6:4 4:4', '6:4 6:3', '6:4']:
+        entry = table.lookup(score)
+        assert entry.record.to_parse_result() == parser.parse(score)
+        assert (entry.code, entry.set_index) == validator._check(score)
+    assert table.lookup('6:4 6:4 6:4 6:4').code == ErrorCode.TOO_MANY_SETS
+    assert table.lookup('6:4 7:7')[:2] == (ErrorCode.GAMES_EQUAL, 2)
+
+
+def test_lookup_misses(table):
+    assert table.lookup('6:1 6:1') is None
+    assert table.lookup('06:4 6:3') is None
+    assert table.lookup('6:4 6:4 ret.') is None
+    assert table.lookup('') is None
+
+
+def test_empty_table():
+    with ScoreTable(build_table([], ScoreFormat.default(), RULES)) as table:
+        assert len(table) == 0
+        assert table.lookup('6:4 6:2') is None
+
+
+def test_scores_of_other_format():
+    score_format = ScoreFormat(' ', '-')
+    with ScoreTable(build_table(['6-4 6-2', '6-4 4-4'], score_format, RULES)) as table:
+        assert table.lookup('6:4 6:2').code == ErrorCode.NONE
+        parser = TableParser(score_format, RULES, table)
+        assert parser.try_parse('6-4 6-2') == Parser(score_format, RULES).parse('6-4 6-2')
+        assert isinstance(parser.try_parse('6:4 6:2'), ScoreError)
+
+
+def test_invalid_buffer():
+    with pytest.raises(ValueError):
+        ScoreTable(b'TMA1\0\0\0\0')
+    table = build_table(SCORES, ScoreFormat.default(), RULES).replace(
+        b'"version": 3', b'"version": 9'
+    )
+    with pytest.raises(ValueError):
+        ScoreTable(table)
+
+
+def test_other_rules(table):
+    with pytest.raises(ValueError):
+        TableParser(ScoreFormat.default(), MatchRules.pro_tour(), table)
+    with pytest.raises(ValueError):
+        TableValidator(ScoreFormat.default(), MatchRules.pro_tour(), table)
+
+
+@pytest.mark.parametrize('score_format', [ScoreFormat(' ', ':'), ScoreFormat(' ', '/')])
+def test_agrees_with_parser_and_validator(score_format):
+    rng = random.Random(25)
+    scores = [s.replace(':', score_format.game_sep) for s in _random_scores(rng, 3000)]
+    # half of the scores and a few with default separators are in the table
+    scores += SCORES + ['6:4 6:2 6:1', '6:4 6:2']
+    table_scores = scores[::2]
+    with ScoreTable(build_table(table_scores, score_format, RULES)) as table:
+        parser = Parser(score_format, RULES)
+        validator = Validator(score_format, RULES)
+        table_parser = TableParser(score_format, RULES, table)
+        table_validator = TableValidator(score_format, RULES, table)
+        for score in scores:
+            expected = parser.try_parse(score)
+            result = table_parser.try_parse(score)
+            if isinstance(expected, ScoreError):
+                assert result == expected, score
+            else:
+                assert list(result.sets) == list(expected.sets), score
+                assert result[1:] == expected[1:], score
+            expected = validator.validate(score)
+            result = table_validator.validate(score)
+            assert result.is_valid() == expected.is_valid(), score
+            assert result.value == expected.value, score
+            assert table_validator.is_valid(score) == expected.is_valid(), score
+        assert table_validator.validate_many(scores) == validator.validate_many(scores)
+
+
+def test_write_table(tmp_path):
+    path = str(tmp_path / 'scores.tmt')
+    assert write_table(path, SCORES, ScoreFormat.default(), RULES) == 9
+    with ScoreTable.open(path) as table:
+        assert table.lookup('6:4 6:2').record.sets_diff == 2
+
+
+def _rss():
+    with open('/proc/self/statm') as statm:
+        return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+def _cached_parser_rss_growth(scores):
+    # every worker warms a cache of its own
+    parser = CachedParser(ScoreFormat.default(), RULES, maxsize=len(scores))
+    gc.collect()
+    before = _rss()
+    for score in scores:
+        parser.try_parse(score)
+    gc.collect()
+    return _rss() - before
+
+
+def _table_parser_rss_growth(path, scores):
+    table = ScoreTable.open(path)
+    parser = TableParser(ScoreFormat.default(), RULES, table)
+    gc.collect()
+    before = _rss()
+    for score in scores:
+        parser.try_parse(score)
+    gc.collect()
+    return _rss() - before
+
+
+@pytest.mark.skipif(not os.path.exists('/proc/self/statm'), reason='needs /proc/self/statm')
+def test_worker_rss_growth(tmp_path):
+    scores = list(dict.fromkeys(_random_scores(random.Random(1), 30000)))
+    path = str(tmp_path / 'scores.tmt')
+    write_table(path, scores, ScoreFormat.default(), RULES)
+    workers = 2
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        cached = [executor.submit(_cached_parser_rss_growth, scores) for _ in range(workers)]
+        cached = [future.result() for future in cached]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        shared = [executor.submit(_table_parser_rss_growth, path, scores) for _ in range(workers)]
+        shared = [future.result() for future in shared]
+    # pages of the table are counted in the RSS of every worker, but are shared
+    assert max(shared) * 4 < min(cached), (shared, cached)
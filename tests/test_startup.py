@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+# cumulative cold import time of the hot path modules, the best of the runs counts
+IMPORT_BUDGET_MS = 100
+RUNS = 3
+HOT_PATH = ('tennis_match_lib.validator', 'tennis_match_lib.parser')
+THIRD_PARTY = ('toolz', 'numpy')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_python(*args):
+    return subprocess.run(
+        [sys.executable, '-S', *args], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+
+
+def import_time_ms(module):
+    # -X importtime reports "import time: self [us] | cumulative | imported package"
+    stderr = run_python('-X', 'importtime', '-c', f'import {module}').stderr
+    for line in stderr.splitlines():
+        _, cumulative, name = line.split('|')
+        if name.strip() == module:
+            return int(cumulative) / 1000
+    raise AssertionError(f'{module} not found in -X importtime output')
+
+
+def test_package_import_is_lazy():
+    modules = run_python(
+        '-c', 'import sys, tennis_match_lib; print(*sorted(sys.modules), sep="\\n")'
+    ).stdout.split()
+    assert [m for m in modules if m.startswith('tennis_match_lib')] == ['tennis_match_lib']
+
+
+def test_hot_path_has_no_third_party_imports():
+    modules = run_python(
+        '-c', f'import sys, {", ".join(HOT_PATH)}; print(*sys.modules, sep="\\n")'
+    ).stdout.split()
+    assert [m for m in modules if m.split('.')[0] in THIRD_PARTY] == []
+
+
+@pytest.mark.parametrize("module", HOT_PATH)
+def test_import_time_budget(module):
+    best = min(import_time_ms(module) for _ in range(RUNS))
+    assert best < IMPORT_BUDGET_MS, f'{module} imports in {best:.1f} ms'
@@ -0,0 +1,44 @@
+import dataclasses
+import pickle
+
+import pytest
+
+from tennis_match_lib.structs import BasicMatchStatsInfo, PackedMatch, SetScore
+
+
+def test_set_score_is_slotted_and_frozen():
+    set_score = SetScore(unit_one_games=7, unit_two_games=6, tiebreak=5)
+    assert not hasattr(set_score, '__dict__')
+    assert set_score.duration is None
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        set_score.unit_one_games = 6
+    assert hash(set_score) == hash(SetScore(7, 6, 5))
+
+
+def test_structs_pickle_round_trip():
+    set_score = SetScore(6, 4)
+    stats_info = BasicMatchStatsInfo(1, -1, 3, -3)
+    assert pickle.loads(pickle.dumps(set_score)) == set_score
+    assert pickle.loads(pickle.dumps(stats_info)) == stats_info
+
+
+def test_packed_match_sequence_protocol():
+    sets = [SetScore(6, 7, 10), SetScore(7, 6, 120), SetScore(6, 3)]
+    packed = PackedMatch.from_sets(sets)
+    assert len(packed) == 3
+    assert list(packed) == sets
+    assert packed[0] == sets[0]
+    assert packed[-1] == sets[-1]
+    assert packed[:-1] == sets[:-1]
+    with pytest.raises(IndexError):
+        packed[3]
+
+
+def test_packed_match_bytes_round_trip():
+    packed = PackedMatch.from_sets([SetScore(6, 4), SetScore(6, 2)])
+    restored = PackedMatch(packed.tobytes())
+    assert restored == packed
+    assert hash(restored) == hash(packed)
+    assert len(packed.tobytes()) == 12
+    with pytest.raises(ValueError):
+        PackedMatch(b'\x00')
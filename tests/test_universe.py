@@ -0,0 +1,136 @@
+import itertools
+import random
+
+import pytest
+
+from tennis_match_lib import rules
+from tennis_match_lib.score_format import ScoreFormat
+from tennis_match_lib.universe import ScoreIndex, iter_legal_scores
+from tennis_match_lib.validator import Validator
+
+
+GAMES = (0, 4, 5, 6, 7, 8)
+TIEBREAK_SET_GAMES = (10, 12)
+
+ONE_TIEBREAK_SET = rules.MatchRules(
+    max_sets=rules.SetsCount.ONE,
+    games_count=rules.GamesCount.SIX,
+    last_set_rule=rules.LastSet.TIEBREAK_SET,
+)
+FOUR_GAMES = rules.MatchRules(
+    max_sets=rules.SetsCount.THREE,
+    games_count=rules.GamesCount.FOUR,
+    last_set_rule=rules.LastSet.TIEBREAK,
+)
+
+
+def _candidate_scores(match_rules):
+    for sets_count in range(1, match_rules.sets + 1):
+        for sets in itertools.product(
+            *[list(itertools.product(GAMES, repeat=2))] * (sets_count - 1),
+            list(itertools.product(GAMES + TIEBREAK_SET_GAMES, repeat=2)),
+        ):
+            yield ' '.join(f'{one}:{two}' for one, two in sets)
+
+
+@pytest.mark.parametrize(
+    "match_rules",
+    [
+        rules.MatchRules.pro_tour(),
+        rules.MatchRules.club(),
+        rules.MatchRules.club_short(),
+        ONE_TIEBREAK_SET,
+        FOUR_GAMES,
+    ],
+)
+def test_index_agrees_with_validator(match_rules):
+    validator = Validator(ScoreFormat.default(), match_rules)
+    index = ScoreIndex.build(match_rules)
+    scores = list(_candidate_scores(match_rules))
+    batch = validator.validate_many(scores)
+    for row, score in enumerate(scores):
+        assert index.contains(score) == batch.is_valid(row), score
+
+
+@pytest.mark.parametrize(
+    "match_rules",
+    [rules.MatchRules.pro_tour(), rules.MatchRules.club(), rules.MatchRules.club_short()],
+)
+def test_all_legal_scores_are_valid(match_rules):
+    validator = Validator(ScoreFormat.default(), match_rules)
+    scores = list(iter_legal_scores(match_rules))
+    assert len(scores) == len(set(scores)) == len(ScoreIndex.build(match_rules))
+    assert validator.validate_many(scores).valid_count == len(scores)
+
+
+def test_grand_slam_sample_agrees_with_validator():
+    match_rules = rules.MatchRules.grand_slam()
+    validator = Validator(ScoreFormat.default(), match_rules)
+    index = ScoreIndex.build(match_rules)
+    legal = list(itertools.islice(iter_legal_scores(match_rules), 0, 200000, 7))
+    assert validator.validate_many(legal).valid_count == len(legal)
+    rnd = random.Random(42)
+    scores = [
+        ' '.join(f'{rnd.choice(GAMES)}:{rnd.choice(GAMES)}' for _ in range(rnd.randint(1, 6)))
+        for _ in range(20000)
+    ]
+    batch = validator.validate_many(scores)
+    for row, score in enumerate(scores):
+        assert index.contains(score) == batch.is_valid(row), score
+
+
+@pytest.mark.parametrize(
+    "match_rules, score",
+    [
+        (rules.MatchRules.pro_tour(), '6:4 4:6'),
+        (rules.MatchRules.pro_tour(), '6:4 6:4 4:6'),
+        (rules.MatchRules.club(), '6:4 6:4 4:10'),
+        (rules.MatchRules.grand_slam(), '6:0 6:0 6:0 0:6 0:6'),
+        (rules.MatchRules.grand_slam(), '6:0 0:6 6:0 0:6'),
+    ],
+)
+def test_match_decided_by_last_set(match_rules, score):
+    assert not ScoreIndex.build(match_rules).contains(score)
+    assert not Validator(ScoreFormat.default(), match_rules).is_valid(score)
+
+
+@pytest.mark.parametrize("score", ['7:0 6:5 6:0', '6:5 6:0', '7:4 6:0', '6:0 7:6 6:0'])
+def test_incomplete_sets_are_rejected(score):
+    assert not ScoreIndex.build(rules.MatchRules.pro_tour()).contains(score)
+    assert not Validator(ScoreFormat.default(), rules.MatchRules.pro_tour()).is_valid(score)
+
+
+def test_accepting_states_have_no_transitions():
+    index = ScoreIndex.build(rules.MatchRules.grand_slam())
+    assert index._accepting
+    for state in index._accepting:
+        assert not index._transitions[state]
+
+
+def test_tiebreak_points_are_ignored():
+    index = ScoreIndex.build(rules.MatchRules.club())
+    assert index.contains('7:6(5) 3:6 12:10')
+    assert index.contains('6:7(12) 6:4 4:10')
+    assert not index.contains('6:3 3:6 6:4')
+    assert not index.contains('6:3 3:6 10:8(5)')
+    assert not index.contains('6:3 3:6 11:11')
+
+
+def test_non_default_score_format():
+    score_format = ScoreFormat(' ', '-')
+    index = ScoreIndex.build(rules.MatchRules.pro_tour())
+    assert index.contains('6-4 6-7(5) 7-5', score_format)
+    assert not index.contains('6:4 6:7(5) 7:5', score_format)
+    assert next(index.iter_scores(score_format)) == '0-6 0-6'
+
+
+def test_save_and_load(tmp_path):
+    match_rules = rules.MatchRules.club()
+    index = ScoreIndex.build(match_rules)
+    path = str(tmp_path / 'club.json')
+    index.save(path)
+    loaded = ScoreIndex.load(path, rules=match_rules)
+    assert loaded.rules == match_rules
+    assert list(loaded.iter_scores()) == list(index.iter_scores())
+    with pytest.raises(ValueError):
+        ScoreIndex.load(path, rules=rules.MatchRules.pro_tour())
@@ -1,7 +1,11 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
 from tennis_match_lib import rules
+from tennis_match_lib.errors import ErrorCode, ScoreError, error_message
 from tennis_match_lib.score_format import ScoreFormat
+from tennis_match_lib.structs import SetScore
 from tennis_match_lib import validation
 from tennis_match_lib.validator import Validator
 
@@ -21,6 +25,11 @@ def validator(score_format, match_rules):
     return Validator(score_format, match_rules)
 
 
+def _messages(result):
+    assert not result.is_valid()
+    return [error.message for error in result.value]
+
+
 def test_re_pattern_creation_single_set():
     _rules = rules.MatchRules(
         max_sets=rules.SetsCount.ONE,
@@ -29,7 +38,7 @@ def test_re_pattern_creation_single_set():
     )
     fmt = ScoreFormat.default()
     validator = Validator(score_format=fmt, rules=_rules)
-    assert validator.re_pattern_raw == r'[0-7]:[0-7](\(\d+\))?'
+    assert validator.re_pattern_raw == r'[0-7]:[0-7](\([0-9]+\))?'
 
 
 def test_re_pattern_creation_three_sets():
@@ -40,7 +49,7 @@ def test_re_pattern_creation_three_sets():
     )
     fmt = ScoreFormat.default()
     validator = Validator(score_format=fmt, rules=_rules)
-    expected = r'[0-7]:[0-7](\(\d+\))? [0-7]:[0-7](\(\d+\))?( [0-7]:[0-7](\(\d+\))?)?'
+    expected = r'[0-7]:[0-7](\([0-9]+\))? [0-7]:[0-7](\([0-9]+\))?( [0-7]:[0-7](\([0-9]+\))?)?'
     assert validator.re_pattern_raw == expected
 
 
@@ -53,8 +62,8 @@ def test_re_pattern_creation_five_sets():
     fmt = ScoreFormat.default()
     validator = Validator(score_format=fmt, rules=_rules)
     expected = (
-        r'[0-7]:[0-7](\(\d+\))? [0-7]:[0-7](\(\d+\))? [0-7]:[0-7](\(\d+\))?'
-        r'( [0-7]:[0-7](\(\d+\))?)?( [0-7]:[0-7](\(\d+\))?)?'
+        r'[0-7]:[0-7](\([0-9]+\))? [0-7]:[0-7](\([0-9]+\))? [0-7]:[0-7](\([0-9]+\))?'
+        r'( [0-7]:[0-7](\([0-9]+\))?)?( [0-7]:[0-7](\([0-9]+\))?)?'
     )
     assert validator.re_pattern_raw == expected
 
@@ -67,10 +76,29 @@ def test_re_pattern_creation_three_sets_last_tb_set():
     )
     fmt = ScoreFormat.default()
     validator = Validator(score_format=fmt, rules=_rules)
-    expected = r'[0-7]:[0-7](\(\d+\))? [0-7]:[0-7](\(\d+\))?( \d+:\d+)?'
+    expected = r'[0-7]:[0-7](\([0-9]+\))? [0-7]:[0-7](\([0-9]+\))?( [0-9]+:[0-9]+)?'
     assert validator.re_pattern_raw == expected
 
 
+def test_re_pattern_tiebreak_set_in_deciding_position_only():
+    _rules = rules.MatchRules(
+        max_sets=rules.SetsCount.FIVE,
+        games_count=rules.GamesCount.FOUR,
+        last_set_rule=rules.LastSet.TIEBREAK_SET,
+    )
+    validator = Validator(score_format=ScoreFormat.default(), rules=_rules)
+    assert validator.re_pattern.fullmatch('4:0 4:1 1:4 3:5 12:10')
+    assert not validator.re_pattern.fullmatch('4:0 1:4 1:4 12:10')
+    assert not validator.is_valid('4:0 1:4 1:4 12:10')
+
+
+def test_re_pattern_separators():
+    fmt = ScoreFormat(' ', '-')
+    validator = Validator(score_format=fmt, rules=rules.MatchRules.club())
+    assert validator.re_pattern.fullmatch('6-4 3-6 10-8')
+    assert not validator.re_pattern.fullmatch('6-4 3-6 10:8')
+
+
 @pytest.mark.parametrize(
     "score", ['6:4 6:2', '2:6 5:7', '6:0 6:7(8) 7:5', '6:7(0) 7:6(11) 6:7(100)']
 )
@@ -82,47 +110,56 @@ def test_valid_score(validator, score):
     "score", ['6:-1 6:2', 'just invalid', '6:0,6:0', '7:5 6:O', '8:3 6:2', '6:0']
 )
 def test_uno_invalid_score(validator, score):
-    assert validator.validate(score) == validation.Invalid(value=['Score has invalid format'])
+    assert _messages(validator.validate(score)) == ['Score has invalid format']
 
 
 def test_invalid_score_too_many_sets(validator):
     score = '6:0 6:0 6:2 5:7'
-    assert validator.validate(score) == validation.Invalid(value=['Number of sets is too large'])
+    assert _messages(validator.validate(score)) == ['Number of sets is too large']
 
 
 def test_invalid_score_too_many_won_sets_one(validator):
     score = '6:0 6:0 6:2'
-    assert validator.validate(score) == validation.Invalid(
-        value=['Number of won sets is too large']
-    )
+    assert _messages(validator.validate(score)) == ['Number of won sets is too large']
 
 
 def test_invalid_score_too_many_won_sets_two(validator):
     score = '4:6 3:6 4:6'
-    assert validator.validate(score) == validation.Invalid(
-        value=['Number of won sets is too large']
-    )
+    assert _messages(validator.validate(score)) == ['Number of won sets is too large']
+
+
+@pytest.mark.parametrize("score", ['6:4 6:4 4:6', '4:6 6:4 6:4 6:4'])
+def test_invalid_score_set_after_match_decided(validator, score):
+    assert _messages(validator.validate(score)) == ['Number of sets is too large']
+    assert not validator.is_valid(score)
+
+
+def test_invalid_score_match_not_decided(validator):
+    score = '6:4 4:6'
+    assert _messages(validator.validate(score)) == ['Number of sets is too small']
+    assert not validator.is_valid(score)
+    assert _messages(validator.validate_all(score)) == ['Number of sets is too small']
 
 
 def test_invalid_score_small_number_of_games_uno(validator):
     score = '4:5 6:7(8)'
-    assert validator.validate(score) == validation.Invalid(
-        value=['Set 1 has invalid number of games: value is too small']
-    )
+    assert _messages(validator.validate(score)) == [
+        'Set 1 has invalid number of games: value is too small'
+    ]
 
 
 def test_invalid_score_small_number_of_games_dos(validator):
     score = '3:6 0:1'
-    assert validator.validate(score) == validation.Invalid(
-        value=['Set 2 has invalid number of games: value is too small']
-    )
+    assert _messages(validator.validate(score)) == [
+        'Set 2 has invalid number of games: value is too small'
+    ]
 
 
 def test_invalid_score_small_number_of_games_tres(validator):
     score = '3:6 6:1 3:2'
-    assert validator.validate(score) == validation.Invalid(
-        value=['Set 3 has invalid number of games: value is too small']
-    )
+    assert _messages(validator.validate(score)) == [
+        'Set 3 has invalid number of games: value is too small'
+    ]
 
 
 def test_invalid_score_small_number_of_games_for_no_tb_set():
@@ -134,13 +171,263 @@ def test_invalid_score_small_number_of_games_for_no_tb_set():
     fmt = ScoreFormat.default()
     validator = Validator(score_format=fmt, rules=_rules)
     score = '3:6 6:1 4:6'
-    assert validator.validate(score) == validation.Invalid(
-        value=['Set 3 has invalid number of games: value is too small']
-    )
+    assert _messages(validator.validate(score)) == [
+        'Set 3 has invalid number of games: value is too small'
+    ]
 
 
 def test_invalid_score_equal_games(validator):
     score = '3:6 6:6 6:2'
-    assert validator.validate(score) == validation.Invalid(
-        value=['Set 2 has invalid number of games: games cannot be equal']
+    assert _messages(validator.validate(score)) == [
+        'Set 2 has invalid number of games: games cannot be equal'
+    ]
+
+
+def test_validate_many_columnar_result(validator):
+    scores = ['6:4 6:2', 'just invalid', '6:0 6:0 6:2 5:7', '3:6 6:6 6:2', '2:6 5:7']
+    batch = validator.validate_many(scores)
+    assert len(batch) == 5
+    assert list(batch.valid) == [1, 0, 0, 0, 1]
+    assert batch.valid_count == 2
+    assert list(batch.errors()) == [
+        (1, ErrorCode.INVALID_FORMAT, 0),
+        (2, ErrorCode.TOO_MANY_SETS, 0),
+        (3, ErrorCode.GAMES_EQUAL, 2),
+    ]
+    assert batch.messages()[3] == 'Set 2 has invalid number of games: games cannot be equal'
+
+
+@pytest.mark.parametrize(
+    "match_rules",
+    [rules.MatchRules.pro_tour(), rules.MatchRules.club(), rules.MatchRules.grand_slam()],
+)
+def test_validate_many_agrees_with_validate(validator):
+    scores = [
+        '6:4 6:2',
+        '6:0 6:7(8) 7:5',
+        '6:7(0) 7:6(11) 6:7(100)',
+        '6:3 1:6 10:2',
+        '6:3 1:6 4:6',
+        '6:0 6:0 6:2',
+        '4:5 6:7(8)',
+        '3:6 0:1',
+        '6:0 6:0 6:0 6:0',
+        '6:4 6:2xyz',
+        '6:0',
+        None,
+        '6:4 3:1 ret.',
+        '6:4 6:4 ret.',
+        'w/o',
+    ]
+    batch = validator.validate_many(scores)
+    messages = batch.messages()
+    for row, score in enumerate(scores):
+        expected = validator.validate(score)
+        assert batch.is_valid(row) == expected.is_valid()
+        if not expected.is_valid():
+            assert [messages[row]] == _messages(expected)
+
+
+def test_validate_many_non_default_game_separator(match_rules):
+    validator = Validator(ScoreFormat(' ', '-'), match_rules)
+    batch = validator.validate_many(['6-4 6-2', '6-4 3-6 7-6(5)'])
+    assert list(batch.valid) == [1, 1]
+    assert validator.validate('6-4 6-2') == validation.Valid('6-4 6-2')
+
+
+def test_validator_shared_between_threads(validator):
+    scores = ['6:4 6:2', '3:6 6:6 6:2', '6:0 6:7(8) 7:5', '4:5 6:7(8)', '3:6 0:1'] * 200
+    expected = [validator.validate(score) for score in scores]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        actual = list(executor.map(validator.validate, scores))
+    assert actual == expected
+
+
+@pytest.mark.parametrize("score", ['6:3 6:4', '6:3 3:6 10:8', '7:6(5) 3:6 5:10'])
+def test_valid_score_club_rules(score):
+    validator = Validator(ScoreFormat.default(), rules.MatchRules.club())
+    assert validator.validate(score) == validation.Valid(score)
+    assert validator.validate_many([score]).is_valid(0)
+
+
+@pytest.mark.parametrize("score", ['0:6 0:10', '6:0 6:1 6:10', '6:4 6:2xyz'])
+def test_invalid_score_trailing_characters(validator, score):
+    assert _messages(validator.validate(score)) == ['Score has invalid format']
+
+
+def test_valid_tiebreak_set_with_non_default_game_separator():
+    validator = Validator(ScoreFormat(' ', '/'), rules.MatchRules.club())
+    assert validator.validate('6/3 3/6 10/8') == validation.Valid('6/3 3/6 10/8')
+
+
+AGREEMENT_SCORES = [
+    '6:4 6:2',
+    '6:0 6:7(8) 7:5',
+    '6:7(0) 7:6(11) 6:7(100)',
+    '6:3 1:6 10:2',
+    '6:3 1:6 4:6',
+    '6:0 6:0 6:2',
+    '4:5 6:7(8)',
+    '3:6 0:1',
+    '6:0 6:0 6:0 6:0',
+    '6:4 6:2xyz',
+    '6:4 6:6',
+    '6:0',
+    '',
+    None,
+    '6:4 3:1 ret.',
+    '6:4 RET',
+    'w/o',
+    '6:4 w/o',
+    '6:4 6:4 ret.',
+    '6:4 4:4 def.',
+    '6:4 3:3 6:0 unf.',
+    '6:4 9:1 ret.',
+    '2:4 3:1 ret.',
+    '6:4 x ret.',
+]
+
+
+@pytest.mark.parametrize(
+    "match_rules",
+    [rules.MatchRules.pro_tour(), rules.MatchRules.club(), rules.MatchRules.grand_slam()],
+)
+def test_is_valid_agrees_with_validate(validator):
+    for score in AGREEMENT_SCORES * 3:
+        assert validator.is_valid(score) == validator.validate(score).is_valid(), score
+
+
+def test_is_valid_reorders_checks(score_format, match_rules, monkeypatch):
+    monkeypatch.setattr(Validator, 'FAIL_FAST_REORDER_INTERVAL', 10)
+    validator = Validator(score_format, match_rules)
+    assert validator.fail_fast_order() == (
+        'number_of_sets',
+        'format',
+        'games_equality',
+        'games_too_small',
+        'number_of_won_sets',
+        'set_complete',
+        'match_decided',
     )
+    for _ in range(20):
+        assert not validator.is_valid('6:4 6:4 6:4')
+        assert not validator.is_valid('6:4 xyz')
+    assert validator.fail_fast_order() == (
+        'format',
+        'number_of_sets',
+        'number_of_won_sets',
+        'games_equality',
+        'games_too_small',
+        'set_complete',
+        'match_decided',
+    )
+    assert validator.is_valid('6:4 6:4')
+
+
+def test_validate_all_collects_every_error(validator):
+    assert _messages(validator.validate_all('5:5 8:8')) == [
+        'Score has invalid format',
+        'Set 1 has invalid number of games: value is too small',
+        'Set 1 has invalid number of games: games cannot be equal',
+        'Set 2 has invalid number of games: value is too large',
+        'Set 2 has invalid number of games: games cannot be equal',
+    ]
+
+
+def test_validate_all_whole_score_errors(validator):
+    assert _messages(validator.validate_all('6:4 6:6 6:6 6:6')) == [
+        'Number of sets is too large',
+        'Number of won sets is too large',
+        'Set 2 has invalid number of games: games cannot be equal',
+        'Set 3 has invalid number of games: games cannot be equal',
+    ]
+    assert _messages(validator.validate_all(None)) == ['Score has invalid format']
+
+
+def test_validate_all_first_error_matches_validate(validator):
+    for score in AGREEMENT_SCORES:
+        expected = validator.validate(score)
+        actual = validator.validate_all(score)
+        assert actual.is_valid() == expected.is_valid()
+        if not expected.is_valid():
+            assert expected.value[0] in actual.value
+
+
+def test_collect():
+    assert validation.collect(1, validation.Valid(2), validation.Valid(3)) == validation.Valid(1)
+    assert validation.collect(
+        1, validation.Invalid(['a']), validation.Valid(3), validation.Invalid(['b', 'c'])
+    ) == validation.Invalid(['a', 'b', 'c'])
+
+
+@pytest.mark.parametrize(
+    "score, error",
+    [
+        ('6:4 3:1 ret.', None),
+        ('6:4 RET', None),
+        ('3:1 def.', None),
+        ('7:6(5) 6:6 ret.', None),
+        ('6:4 ret.', None),
+        ('w/o', None),
+        ('6:4 2:6 0:0 unf.', None),
+        ('6:4 w/o', ErrorCode.INVALID_FORMAT),
+        ('ret.', ErrorCode.TOO_FEW_SETS),
+        ('def.', ErrorCode.TOO_FEW_SETS),
+        ('6:4 6:4 ret.', ErrorCode.MATCH_ALREADY_DECIDED),
+        ('6:4 3:6 6:3 def.', ErrorCode.MATCH_ALREADY_DECIDED),
+        ('6:4 6:4 6:4 ret.', ErrorCode.TOO_MANY_WON_SETS),
+        ('6:4 9:1 ret.', ErrorCode.GAMES_TOO_LARGE),
+        ('6:4 3:9 ret.', ErrorCode.GAMES_TOO_LARGE),
+        ('2:4 3:1 ret.', ErrorCode.GAMES_TOO_SMALL),
+        ('4:4 3:1 ret.', ErrorCode.GAMES_TOO_SMALL),
+        ('6:4 6:4 6:4 6:4 ret.', ErrorCode.TOO_MANY_SETS),
+        ('6:4 x ret.', ErrorCode.INVALID_FORMAT),
+    ],
+)
+def test_outcome_markers(validator, score, error):
+    result = validator.validate(score)
+    batch = validator.validate_many([score])
+    if error is None:
+        assert result == validation.Valid(score)
+        assert list(batch.error_codes) == []
+    else:
+        assert isinstance(result, validation.Invalid)
+        assert list(batch.error_codes) == [error]
+    assert validator.is_valid(score) == (error is None)
+
+
+def test_outcome_errors_are_collected(validator):
+    result = validator.validate_all('4:4 9:1 ret.')
+    assert _messages(result) == [
+        error_message(ErrorCode.GAMES_TOO_SMALL, 1),
+        error_message(ErrorCode.GAMES_EQUAL, 1),
+        error_message(ErrorCode.GAMES_TOO_LARGE, 2),
+    ]
+
+
+def test_errors_are_structured(validator):
+    (error,) = validator.validate('6:4 5:5').value
+    assert error == ScoreError(ErrorCode.GAMES_TOO_SMALL, 2, SetScore(5, 5))
+    assert error.message == error_message(ErrorCode.GAMES_TOO_SMALL, 2)
+    assert str(error) == error.message
+    assert error != error.message
+    assert error != ScoreError(ErrorCode.GAMES_EQUAL, 2, SetScore(5, 5))
+    assert validator.validate('6:4 6:4 6:4 6:4').value == [
+        ScoreError(ErrorCode.TOO_MANY_SETS, 0, 4)
+    ]
+    assert validator.validate('6:4 6:4 6:4').value[0].value == (3, 0)
+    assert validator.validate('x').value == [ScoreError(ErrorCode.INVALID_FORMAT, 0, 'x')]
+    assert validator.validate_all('6:4 3:9 ret.').value == [
+        ScoreError(ErrorCode.GAMES_TOO_LARGE, 2, SetScore(3, 9))
+    ]
+
+
+def test_errors_hash_as_tuples():
+    error = ScoreError(ErrorCode.GAMES_EQUAL, 1, SetScore(6, 6))
+    assert {error: 1}[ScoreError(ErrorCode.GAMES_EQUAL, 1, SetScore(6, 6))] == 1
+    assert error.message not in {error: 1}
+    errors = {error, ScoreError(ErrorCode.GAMES_EQUAL, 1, SetScore(6, 6))}
+    assert errors | {ScoreError(ErrorCode.GAMES_EQUAL, 1, SetScore(5, 5))} == {
+        error,
+        ScoreError(ErrorCode.GAMES_EQUAL, 1, SetScore(5, 5)),
+    }
@@ -0,0 +1,75 @@
+import pytest
+
+from tennis_match_lib.errors import GameValueError
+from tennis_match_lib.parser import Parser
+from tennis_match_lib.rules import MatchRules
+from tennis_match_lib.score_format import ScoreFormat
+
+np = pytest.importorskip('numpy')
+vectorized = pytest.importorskip('tennis_match_lib.vectorized')
+
+
+SCORES = [
+    '6:4 6:2',
+    '5:7 0:6',
+    '6:0 7:6(5)',
+    '6:7(0) 7:6(10) 6:7(20)',
+    '6:7(5) 7:5 6:10',
+    '6:3 1:6 10:2',
+    '6:7(r) 2:6',
+    '6:F 2:6',
+    'justwrongscore',
+    '',
+    '6:4 6:4 6:4 6:4',
+    '6:4 6:2 ',
+]
+
+
+@pytest.mark.parametrize("rules", [MatchRules.pro_tour(), MatchRules.club()])
+def test_parse_scores_matches_parser(rules):
+    score_format = ScoreFormat.default()
+    parser = Parser(score_format=score_format, rules=rules)
+    parsed = vectorized.parse_scores(SCORES, score_format, rules)
+    stats_info = vectorized.calculate_stats_info(parsed, rules)
+    for row, score in enumerate(SCORES):
+        try:
+            expected = parser.parse(score)
+        except GameValueError:
+            expected = None
+        if expected is None or len(expected.sets) > rules.sets:
+            assert not parsed['valid'][row]
+            assert parsed['sets_count'][row] == 0
+            continue
+        assert parsed['valid'][row]
+        assert parsed['sets_count'][row] == len(expected.sets)
+        for i, s in enumerate(expected.sets):
+            assert tuple(parsed['games'][row, i]) == (s.unit_one_games, s.unit_two_games)
+            tiebreak = vectorized.NO_TIEBREAK if s.tiebreak is None else s.tiebreak
+            assert parsed['tiebreak'][row, i] == tiebreak
+        assert tuple(stats_info[row]) == (
+            expected.stats_info.unit_one_sets_diff,
+            expected.stats_info.unit_two_sets_diff,
+            expected.stats_info.unit_one_games_diff,
+            expected.stats_info.unit_two_games_diff,
+        )
+
+
+def test_parse_scores_non_default_game_separator():
+    rules = MatchRules.pro_tour()
+    parsed = vectorized.parse_scores(
+        np.array(['6/4 6/7(3) 7/6(12)', '6:4 6:2']), ScoreFormat(' ', '/'), rules
+    )
+    assert list(parsed['valid']) == [True, False]
+    assert parsed['games'][0].tolist() == [[6, 4], [6, 7], [7, 6]]
+    assert parsed['tiebreak'][0].tolist() == [-1, 3, 12]
+
+
+def test_parse_scores_empty_input():
+    parsed = vectorized.parse_scores([], ScoreFormat.default(), MatchRules.pro_tour())
+    assert len(parsed) == 0
+
+
+def test_parse_scores_games_out_of_range():
+    rules = MatchRules.pro_tour()
+    parsed = vectorized.parse_scores(['6:4 300:2'], ScoreFormat.default(), rules)
+    assert not parsed['valid'][0]
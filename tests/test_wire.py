@@ -0,0 +1,125 @@
+import pytest
+
+from tennis_match_lib.parser import Parser, ParseResult
+from tennis_match_lib.rules import MatchRules
+from tennis_match_lib.score_format import ScoreFormat
+from tennis_match_lib.structs import BasicMatchStatsInfo, MatchOutcome, SetScore
+from tennis_match_lib.universe import iter_legal_scores
+from tennis_match_lib.wire import MAX_SETS, WireReader, WireWriter, encode_many, encode_record
+
+
+SCORES = [
+    '6:4 6:2',
+    '6:0 6:7(8) 7:5',
+    '6:7(0) 7:6(10) 6:7(20)',
+    '7:6(100) 3:6 6:10',
+    '6:3 1:6 10:2',
+    '6:3 4:6 7:6(5) 3:6 7:5',
+    '6:4 3:1 ret.',
+    'w/o',
+    '6:3 2:6 1:1',
+    '0:6',
+]
+
+
+@pytest.fixture
+def parser():
+    return Parser(ScoreFormat.default(), MatchRules.club())
+
+
+def test_round_trip(parser):
+    parse_results = [parser.parse(score) for score in SCORES]
+    reader = WireReader(encode_many(parse_results))
+    assert len(reader) == len(SCORES)
+    for record, expected in zip(reader, parse_results):
+        assert record.to_parse_result() == expected
+        assert record.sets == expected.sets
+        assert record.stats_info == expected.stats_info
+
+
+def test_round_trip_legal_scores():
+    parser = Parser(ScoreFormat.default(), MatchRules.pro_tour())
+    parse_results = [
+        parser.parse(score)
+        for score in iter_legal_scores(MatchRules.pro_tour())
+        if score.count(' ') < 2
+    ]
+    reader = WireReader(encode_many(parse_results))
+    assert [record.to_parse_result() for record in reader] == parse_results
+
+
+def test_record_is_compact(parser):
+    assert len(encode_record(parser.parse('6:4 6:2'))) == 9
+    assert len(encode_record(parser.parse('6:0 6:7(8) 7:5'))) == 12
+
+
+def test_lazy_record_access(parser):
+    reader = WireReader(encode_many(parser.parse(score) for score in SCORES))
+    # the deciding set of club rules is a tiebreak set, which has no tiebreak
+    pro_tour_parser = Parser(ScoreFormat.default(), MatchRules.pro_tour())
+    record = WireReader(encode_many([pro_tour_parser.parse(SCORES[2])]))[0]
+    assert len(record) == 3
+    assert record.games(1) == (7, 6)
+    assert record.tiebreak(0) == 0
+    assert record.tiebreak(2) == 20
+    assert record.sets_diff == -1
+    assert record.has_tiebreak()
+    assert not reader[0].has_tiebreak()
+    assert reader[-1].games(0) == (0, 6)
+    assert reader[-1].tiebreak(0) is None
+    with pytest.raises(IndexError):
+        record.games(3)
+    with pytest.raises(IndexError):
+        reader[len(SCORES)]
+
+
+def test_iter_stats(parser):
+    parse_results = [parser.parse(score) for score in SCORES]
+    reader = WireReader(encode_many(parse_results))
+    assert list(reader.iter_stats()) == [
+        (r.stats_info.unit_one_sets_diff, r.stats_info.unit_one_games_diff) for r in parse_results
+    ]
+
+
+def test_mmap_file(tmp_path, parser):
+    path = tmp_path / 'matches.wire'
+    with open(path, 'wb') as wire_file, WireWriter(wire_file) as writer:
+        for score in SCORES * 100:
+            writer.write(parser.parse(score))
+    with WireReader.open(str(path)) as reader:
+        assert len(reader) == len(SCORES) * 100
+        assert reader[351].to_parse_result() == parser.parse(SCORES[1])
+
+
+def test_empty_stream():
+    reader = WireReader(encode_many([]))
+    assert len(reader) == 0
+    assert list(reader) == []
+
+
+def test_invalid_buffer(parser):
+    data = encode_many([parser.parse('6:4 6:2')])
+    with pytest.raises(ValueError):
+        WireReader(b'not a wire stream at all, no')
+    with pytest.raises(ValueError):
+        WireReader(data[:4] + data[5:])
+    with pytest.raises(ValueError):
+        WireReader(b'')
+
+
+def test_values_out_of_range():
+    stats_info = BasicMatchStatsInfo(0, 0, 0, 0)
+    with pytest.raises(ValueError):
+        encode_record(ParseResult([SetScore(256, 0)], stats_info))
+    with pytest.raises(ValueError):
+        encode_record(ParseResult([SetScore(6, 0)] * (MAX_SETS + 1), stats_info))
+
+
+def test_outcome_round_trip(parser):
+    reader = WireReader(encode_many(parser.parse(score) for score in SCORES))
+    assert [record.outcome for record in reader] == [
+        parser.parse(score).outcome for score in SCORES
+    ]
+    assert reader[-4].outcome == MatchOutcome.RETIRED
+    assert len(reader[-4]) == 2
+    assert len(reader[-3]) == 0